@@ -0,0 +1,62 @@
+from resources import surface_cache
+
+
+class AnimationClip:
+    """ Sequência de quadros de um sprite
+    Todos os quadros são carregados (e escalados) uma única vez, na criação do clipe. Durante o jogo,
+    trocar de quadro apenas troca a referência da superfície, sem acessar o disco
+    """
+
+    def __init__(self, frames, size=None, frame_time=None, loop=True):
+        """ AnimationClip construtor
+        :param frames: nomes dos arquivos de cada quadro, em ordem
+        :type frames: list
+        :param size: tamanho desejado dos quadros. Default None (tamanho original)
+        :type size: tuple
+        :param frame_time: duração de cada quadro em ms. Default None (quadros trocados manualmente)
+        :type frame_time: float
+        :param loop: define se o clipe recomeça ao chegar no último quadro
+        :type loop: boolean. Default True
+        """
+        self.frames = [surface_cache.get(frame, size) for frame in frames]
+        self.frame_time = frame_time
+        self.loop = loop
+        self.reset()
+
+    def reset(self):
+        """ Volta o clipe para o primeiro quadro
+        """
+        self.index = 0
+        self.elapsed = 0
+        self.image = self.frames[0]
+
+    def set_frame(self, index):
+        """ Escolhe diretamente o quadro atual
+        :param index: índice do quadro
+        :type index: int
+        """
+        self.index = index
+        self.elapsed = 0
+        self.image = self.frames[index]
+
+    def update(self, dt):
+        """ Avança o clipe de acordo com o tempo decorrido e retorna se o quadro mudou
+        :param dt: variação do tempo em ms
+        :type dt: int
+        """
+        if not self.frame_time:
+            return False
+        self.elapsed += dt
+        changed = False
+        while self.elapsed >= self.frame_time:
+            self.elapsed -= self.frame_time
+            if self.index + 1 < len(self.frames):
+                self.index += 1
+            elif self.loop:
+                self.index = 0
+            else:
+                self.elapsed = 0
+                break
+            changed = True
+        self.image = self.frames[self.index]
+        return changed
@@ -0,0 +1,127 @@
+import pygame
+import os
+import json
+
+# Etapa de build: empacota os sprites pequenos do jogo em um único atlas de textura.
+# Uso (a partir da pasta coronashooter): python atlas.py
+
+ATLAS_PREFIXES = ("inimigo", "boss", "tiroinimigo", "tironave",
+                  "laser", "powerup", "nave", "escudo")  # grupos de imagens empacotados
+MAX_ATLAS_WIDTH = 2048  # largura máxima do atlas, em pixels
+
+
+def pack(sizes, width):
+    """ Empacota retângulos com o algoritmo skyline (bottom-left)
+    Retorna a posição de cada retângulo e a altura total ocupada
+    :param sizes: dicionário nome -> (largura, altura)
+    :type sizes: dict
+    :param width: largura do atlas
+    :type width: int
+    """
+    skyline = [[0, 0, width]]  # segmentos (x, y, largura) do contorno superior já ocupado
+    positions = {}
+    # os retângulos mais altos primeiro deixam menos buracos
+    for name in sorted(sizes, key=lambda name: (sizes[name][1], sizes[name][0]), reverse=True):
+        w, h = sizes[name]
+        if w > width:
+            raise ValueError(f"{name} é mais largo que o atlas")
+        best = None
+        for i, (x, _, _) in enumerate(skyline):
+            if x + w > width:
+                break
+            # altura em que o retângulo apoia sobre os segmentos que ele cobre
+            y, covered, j = 0, 0, i
+            while covered < w:
+                y = max(y, skyline[j][1])
+                covered += skyline[j][2]
+                j += 1
+            # escolhe a posição em que o topo do retângulo fica mais baixo
+            if best is None or (y + h, x) < best[:2]:
+                best = (y + h, x, y)
+        _, x, y = best
+        positions[name] = (x, y, w, h)
+        # atualiza o contorno: o novo segmento substitui o trecho coberto
+        new_skyline = []
+        for sx, sy, sw in skyline:
+            if sx + sw <= x or sx >= x + w:
+                new_skyline.append([sx, sy, sw])
+                continue
+            if sx < x:
+                new_skyline.append([sx, sy, x - sx])
+            if sx + sw > x + w:
+                new_skyline.append([x + w, sy, sx + sw - x - w])
+        new_skyline.append([x, y + h, w])
+        new_skyline.sort()
+        # junta segmentos vizinhos de mesma altura
+        skyline = [new_skyline[0]]
+        for segment in new_skyline[1:]:
+            if segment[1] == skyline[-1][1]:
+                skyline[-1][2] += segment[2]
+            else:
+                skyline.append(segment)
+    height = max((y + h for x, y, w, h in positions.values()), default=0)
+    return positions, height
+
+
+def best_width(sizes, max_width=MAX_ATLAS_WIDTH, step=32):
+    """ Testa larguras possíveis e retorna a que resulta no atlas de menor área
+    :param sizes: dicionário nome -> (largura, altura)
+    :type sizes: dict
+    :param max_width: largura máxima testada
+    :type max_width: int
+    :param step: intervalo entre as larguras testadas
+    :type step: int
+    """
+    widest = max(w for w, h in sizes.values())
+    widths = range(widest, max(widest, max_width) + 1, step)
+    return min(widths, key=lambda width: width * pack(sizes, width)[1])
+
+
+def build(folder='images', output='atlas', prefixes=ATLAS_PREFIXES, width=None):
+    """ Gera o atlas (output.png) e seu índice (output.json) na pasta de imagens
+    Retorna um dicionário com o uso de memória antes e depois do empacotamento
+    :param folder: pasta das imagens
+    :type folder: string
+    :param output: nome base dos arquivos gerados
+    :type output: string
+    :param prefixes: prefixos das imagens a empacotar
+    :type prefixes: tuple
+    :param width: largura do atlas. Default None (escolhe a largura de menor área)
+    :type width: int
+    """
+    names = sorted(name for name in os.listdir(folder)
+                   if name.endswith('.png') and name.startswith(prefixes) and not name.startswith(output))
+    images = {name: pygame.image.load(os.path.join(folder, name)) for name in names}
+    sizes = {name: image.get_size() for name, image in images.items()}
+    if not width:
+        width = best_width(sizes)
+    positions, height = pack(sizes, width)
+
+    atlas = pygame.Surface((width, height), pygame.SRCALPHA, 32)
+    for name, (x, y, w, h) in positions.items():
+        atlas.blit(images[name], (x, y))
+    pygame.image.save(atlas, os.path.join(folder, output + '.png'))
+    index = {"image": output + '.png', "size": [width, height],
+             "regions": {name: list(positions[name]) for name in names}}
+    with open(os.path.join(folder, output + '.json'), 'w') as file:
+        json.dump(index, file, indent=1)
+
+    # depois de convert_alpha() cada superfície usa 4 bytes por pixel
+    separate = sum(w * h * 4 for x, y, w, h in positions.values())
+    packed = width * height * 4
+    return {"images": len(names), "separate_bytes": separate, "atlas_bytes": packed,
+            "saved_bytes": separate - packed, "fill": separate / packed, "size": (width, height)}
+
+
+if __name__ == '__main__':
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    result = build()
+    print(f"{result['images']} imagens empacotadas em 1 atlas de {result['size'][0]}x{result['size'][1]} "
+          f"({result['fill']:.0%} de ocupação)")
+    print(f"superfícies separadas: {result['separate_bytes'] / 1024:.1f} KB")
+    print(f"atlas: {result['atlas_bytes'] / 1024:.1f} KB")
+    if result['saved_bytes'] >= 0:
+        print(f"economia: {result['saved_bytes'] / 1024:.1f} KB")
+    else:
+        print(f"custo extra: {-result['saved_bytes'] / 1024:.1f} KB")
@@ -0,0 +1,113 @@
+import pygame
+from resources import get_sound
+
+# canais reservados para cada categoria de efeito sonoro; os canais de uma categoria nunca são usados por outra,
+# de modo que uma rajada de tiros inimigos não corta os tiros do jogador
+CATEGORIES = {"player": 2, "enemy": 4, "effects": 2}
+SOUND_CATEGORIES = {"PlayerShoot.ogg": "player", "Enemy Shoot.OGG": "enemy"}  # categoria de cada efeito
+DEFAULT_CATEGORY = "effects"
+MAX_VOICES = 2  # quantidade máxima de cópias do mesmo efeito tocando ao mesmo tempo
+
+
+class VoicePool:
+    """ Toca os efeitos sonoros do jogo em um conjunto fixo de canais por categoria
+    play() apenas registra o pedido; os pedidos são tocados em flush(), uma vez por passo. Pedidos repetidos do
+    mesmo efeito no mesmo passo viram um só (merged) e pedidos que passariam de MAX_VOICES cópias simultâneas do
+    efeito, ou que não encontram canal livre na categoria, são descartados (dropped)
+    """
+
+    def __init__(self, categories=CATEGORIES, max_voices=MAX_VOICES):
+        """ VoicePool construtor
+        :param categories: quantidade de canais reservados por categoria
+        :type categories: dict
+        :param max_voices: cópias simultâneas permitidas de cada efeito
+        :type max_voices: int
+        """
+        self.categories = dict(categories)
+        self.max_voices = max_voices
+        self.channels = None  # canais de cada categoria, criados quando o mixer estiver pronto
+        self._pending = []  # efeitos pedidos neste passo, na ordem do primeiro pedido
+        self.played = 0  # efeitos tocados
+        self.merged = 0  # pedidos repetidos no mesmo passo
+        self.dropped = 0  # pedidos descartados pelo limite de vozes ou por falta de canal
+
+    def _reserve(self):
+        """ Reserva os canais das categorias. Os canais reservados não são usados por Sound.play(), então os
+        efeitos tocados fora do VoicePool nunca ocupam os canais das categorias
+        """
+        total = sum(self.categories.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        self.channels = {}
+        first = 0
+        for category, count in self.categories.items():
+            self.channels[category] = [pygame.mixer.Channel(i) for i in range(first, first + count)]
+            first += count
+
+    def get_channels(self, category):
+        """ Retorna os canais reservados de uma categoria
+        :param category: categoria (chave de CATEGORIES)
+        :type category: string
+        """
+        if self.channels is None:
+            self._reserve()
+        return self.channels[category]
+
+    def play(self, path):
+        """ Pede que um efeito seja tocado no fim do passo atual
+        :param path: nome do arquivo do efeito sonoro, na pasta /songs
+        :type path: string
+        """
+        if path in self._pending:
+            self.merged += 1
+        else:
+            self._pending.append(path)
+
+    def flush(self):
+        """ Toca os efeitos pedidos no passo, respeitando o limite de vozes de cada efeito e os canais de cada
+        categoria
+        """
+        if not self._pending:
+            return
+        if not pygame.mixer.get_init():  # sem áudio (modo headless sem mixer): os pedidos são descartados
+            self.dropped += len(self._pending)
+            self._pending.clear()
+            return
+        for path in self._pending:
+            sound = get_sound(path)
+            channels = self.get_channels(SOUND_CATEGORIES.get(path, DEFAULT_CATEGORY))
+            voices = 0
+            free = None
+            for channel in channels:
+                if not channel.get_busy():
+                    free = free or channel
+                elif channel.get_sound() is sound:
+                    voices += 1
+            if voices >= self.max_voices or free is None:
+                self.dropped += 1
+                continue
+            free.play(sound)
+            self.played += 1
+        self._pending.clear()
+
+    def stats(self):
+        """ Retorna os contadores de efeitos tocados, agrupados e descartados
+        """
+        return {"played": self.played, "merged": self.merged, "dropped": self.dropped}
+
+    def report(self):
+        """ Retorna os contadores em uma linha de texto
+        """
+        return "audio: {played} tocados, {merged} agrupados, {dropped} descartados".format(**self.stats())
+
+
+voices = VoicePool()  # conjunto de vozes compartilhado por main.py e elements.py
+
+
+def play_sound(path):
+    """ Pede que um efeito sonoro seja tocado no fim do passo atual (ver VoicePool)
+    :param path: nome do arquivo do efeito sonoro, na pasta /songs
+    :type path: string
+    """
+    voices.play(path)
@@ -1,12 +1,25 @@
 import pygame
-import os
-from math import ceil
+from resources import surface_cache, manager, surface_bytes
 
 # Módulo utilizado integralmente do Curso Pygame original
 
 
+def get_background(image):
+    """ Retorna o fundo da imagem dada, construindo-o apenas na primeira vez (os fundos ficam no ResourceManager)
+    :param image: a imagem do fundo
+    :type image: string
+    """
+    background = manager.get(("background", image))
+    if background is None:
+        background = Background(image)
+        manager.put(("background", image), background, surface_bytes(background.image))
+    return background
+
+
 class Background:
     """ Cria o background do jogo
+    O fundo guarda uma única cópia da imagem e, a cada quadro, a repete quantas vezes forem necessárias para
+    cobrir a tela a partir da posição de rolagem
     """
 
     def __init__(self, image="space.png"):
@@ -15,44 +28,57 @@ class Background:
         :type image: string
         """
 
-        # faz upload da imagem
-        image = os.path.join('images', image)
-        # .convert() é relacionado à performance do Pygame
-        image = pygame.image.load(image).convert()
+        # busca a imagem no cache (já carregada pelo Preloader, se ele tiver terminado)
+        image = surface_cache.get(image)
+        # o fundo é opaco: sem o canal alfa, os blits são mais rápidos
+        self.image = image.convert() if pygame.display.get_surface() else image
 
         # crimos as variáveis iniciais
         self.imagesize = image.get_size()
         self.pos = [0, -1 * self.imagesize[1]]
-        screen = pygame.display.get_surface()
-        screen_size = screen.get_size()
-
-        # setamos w = largura(width) e h = altura(height)
-        w = (ceil(float(screen_size[0]) / self.imagesize[0]) + 1) * \
-            self.imagesize[0]
-        h = (ceil(float(screen_size[1]) / self.imagesize[1]) + 1) * \
-            self.imagesize[1]
-        back = pygame.Surface((w, h))
-
-        # blit de várias cópias do background para preencher a tela
-        for i in range((back.get_size()[0] // self.imagesize[0])):
-            for j in range((back.get_size()[1] // self.imagesize[1])):
-                back.blit(
-                    image, (i * self.imagesize[0], j * self.imagesize[1]))
-
-        self.image = back
+        self.prev_pos = list(self.pos)
+        self.offset = tuple(self.pos)  # posição em que o fundo é desenhado
+        self.speed = 1 / 16  # velocidade de rolagem, em pixels por ms
 
     def update(self, dt):
         """ Move o background
         :param dt: variação do tempo
         :type dt: int
         """
-        self.pos[1] += 1
+        self.prev_pos = list(self.pos)
+        self.pos[1] += self.speed * dt
         if self.pos[1] > 0:
             self.pos[1] -= self.imagesize[1]
+            self.prev_pos[1] -= self.imagesize[1]
+
+    def interpolate(self, alpha):
+        """ Define a posição de desenho entre o passo de simulação anterior e o atual
+        :param alpha: fração do passo já decorrida
+        :type alpha: float
+        """
+        y = self.prev_pos[1] + (self.pos[1] - self.prev_pos[1]) * alpha
+        self.offset = (self.pos[0], round(y))
 
     def draw(self, screen):
         """ Desenha a imagem na tela definida
         :param screen: tela em que será colocada a imagem
         :type screen: pygame.screen
         """
-        screen.blit(self.image, self.pos)
+        self.draw_area(screen, screen.get_rect())
+
+    def draw_area(self, screen, rect):
+        """ Redesenha apenas uma região do fundo na tela definida
+        :param screen: tela em que será colocada a imagem
+        :type screen: pygame.screen
+        :param rect: região da tela a ser redesenhada
+        :type rect: pygame.Rect
+        """
+        rect = pygame.Rect(rect).clip(screen.get_rect())
+        w, h = self.imagesize
+        # cópias da imagem que cobrem a região, a partir da posição de rolagem
+        x0 = self.offset[0] + (rect.left - self.offset[0]) // w * w
+        y0 = self.offset[1] + (rect.top - self.offset[1]) // h * h
+        # área de cada cópia dentro da região; o SDL recorta a área e ajusta o destino nas bordas da imagem
+        blits = [(self.image, rect.topleft, rect.move(-x, -y))
+                 for y in range(y0, rect.bottom, h) for x in range(x0, rect.right, w)]
+        screen.blits(blits, False)
@@ -0,0 +1,212 @@
+import os
+import csv
+import json
+import time
+import argparse
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+# Simulação em lote para balancear as ondas de inimigos. Cada sessão roda no jogo sem janela, controlada
+# por um robô roteirizado, e os resultados são agregados por configuração de ondas. Uso (a partir da pasta
+# coronashooter):
+#   python balance.py --sessions 2000 --output balanceamento.csv
+#   python balance.py --configs ondas.json
+# O arquivo de configurações é um objeto JSON {nome: ondas}, onde as ondas são uma lista com, para cada
+# nível, o peso de cada tipo de inimigo, no formato de "waves" em levels.json.
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from pygame.locals import K_LEFT, K_RIGHT, K_LCTRL, K_SPACE
+from inputs import InputSnapshot
+from main import Game
+
+MAX_MINUTES = 5  # duração máxima de uma sessão, em minutos de jogo
+BOSSES = 5  # bosses medidos (bosscounter de 0 a 4)
+COUNTED = ("enemies", "enemy_shoots", "shoots", "explosions", "power_ups")  # contêineres do Game medidos
+
+
+class Bot:
+    """ Política roteirizada do jogador
+    Segue, na horizontal, o inimigo mais próximo do chão, desvia dos tiros inimigos que estão caindo sobre a
+    nave, atira a cada fire_interval passos e solta uma bomba quando há inimigos demais na tela
+    """
+
+    def __init__(self, fire_interval=8, bomb_threshold=6, dodge_distance=120):
+        """ Bot construtor
+        :param fire_interval: passos entre dois tiros
+        :type fire_interval: int
+        :param bomb_threshold: quantidade de inimigos na tela a partir da qual o robô solta uma bomba
+        :type bomb_threshold: int
+        :param dodge_distance: distância vertical, em pixels, a partir da qual um tiro inimigo é evitado
+        :type dodge_distance: int
+        """
+        self.fire_interval = fire_interval
+        self.bomb_threshold = bomb_threshold
+        self.dodge_distance = dodge_distance
+
+    def inputs(self, game):
+        """ Retorna as entradas do próximo passo
+        :param game: jogo controlado
+        :type game: main.Game
+        """
+        x, y = game.player.rect.center
+        target = None
+        # desvia do tiro inimigo mais próximo que está caindo sobre a nave
+        shots = game.enemy_shoots
+        threats = [(y - shots.y[i], shots.x[i]) for i in range(shots.count)
+                   if shots.alive[i] and abs(shots.x[i] - x) < 30 and 0 < y - shots.y[i] < self.dodge_distance]
+        if threats:
+            shot_x = min(threats)[1]
+            target = x + (60 if shot_x <= x else -60)
+        else:
+            enemies = list(game.enemies)
+            if enemies:
+                target = max(enemies, key=lambda enemy: enemy.rect.bottom).rect.centerx
+        held = frozenset()
+        if target is not None and abs(target - x) > 8:
+            held = frozenset((K_RIGHT,) if target > x else (K_LEFT,))
+        pressed = set()
+        if game.ticks % self.fire_interval == 0:
+            pressed.add(K_LCTRL)
+        if len(game.enemies) >= self.bomb_threshold:
+            pressed.add(K_SPACE)
+        return InputSnapshot(game.ticks, held, frozenset(pressed))
+
+
+_game = None  # Game de cada processo do pool, criado por init_worker()
+
+
+def init_worker():
+    """ Cria e carrega o Game do processo (executado uma vez em cada processo do pool)
+    Cada sessão recomeça esse mesmo Game com Game.reset(), sem esperar de novo pelo carregamento dos recursos
+    """
+    global _game
+    _game = Game(headless=True)
+    _game.update_preloader(block=True)
+
+
+def simulate(job):
+    """ Roda uma sessão e retorna suas medições (executado nos processos do pool)
+    :param job: (configuração, ondas, semente, nível inicial, duração máxima em minutos)
+    :type job: tuple
+    """
+    name, waves, seed, level, minutes = job
+    if _game is None:
+        init_worker()
+    game = _game
+    game.reset(seed)
+    max_ticks = minutes * 60000 / game.dt
+    if waves is not None:
+        for definition, wave in zip(game.levels["levels"], waves):
+            definition["waves"] = wave
+    game.start_game(level)
+    bot = Bot()
+    bosses = [None] * BOSSES  # passo em que cada boss apareceu
+    peaks = dict.fromkeys(COUNTED, 0)
+    while game.running and game.start and game.ticks < max_ticks:
+        boss_image = game.boss_image
+        game.tick(bot.inputs(game))
+        if game.boss_image is not None and game.boss_image != boss_image and game.bosscounter < BOSSES:
+            bosses[game.bosscounter] = game.ticks
+        for counted in COUNTED:
+            peaks[counted] = max(peaks[counted], len(getattr(game, counted)))
+    died = not game.start
+    return {"config": name, "seed": seed, "died": died,
+            "survival_s": game.ticks * game.dt / 1000,
+            "score": game.last_score if died else game.player.get_score(),
+            "bosses_s": [None if tick is None else tick * game.dt / 1000 for tick in bosses],
+            "peaks": peaks}
+
+
+def run_batch(configs, sessions, level=0, minutes=MAX_MINUTES, workers=None, seed=0):
+    """ Roda as sessões de todas as configurações em um pool de processos e retorna as medições
+    As configurações usam as mesmas sementes, então cada uma é jogada nas mesmas condições
+    :param configs: ondas de cada configuração, por nome (None usa as ondas de levels.json)
+    :type configs: dict
+    :param sessions: sessões por configuração
+    :type sessions: int
+    :param level: nível inicial das sessões
+    :type level: int
+    :param minutes: duração máxima de cada sessão, em minutos de jogo
+    :type minutes: float
+    :param workers: quantidade de processos. Default None (um por núcleo)
+    :type workers: int
+    :param seed: semente da primeira sessão
+    :type seed: int
+    """
+    workers = workers or os.cpu_count()
+    jobs = [(name, waves, seed + i, level, minutes) for name, waves in configs.items() for i in range(sessions)]
+    # blocos grandes reduzem a comunicação entre processos; vários blocos por processo equilibram a carga
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        return list(executor.map(simulate, jobs, chunksize=chunksize))
+
+
+def aggregate(results):
+    """ Agrega as medições das sessões por configuração
+    :param results: medições retornadas por simulate()
+    :type results: list
+    """
+    by_config = {}
+    for result in results:
+        by_config.setdefault(result["config"], []).append(result)
+    table = []
+    for name, runs in by_config.items():
+        survival = [run["survival_s"] for run in runs]
+        scores = [run["score"] for run in runs]
+        row = {"config": name, "sessions": len(runs),
+               "died_pct": 100 * sum(run["died"] for run in runs) / len(runs),
+               "survival_mean_s": statistics.mean(survival), "survival_median_s": statistics.median(survival),
+               "score_mean": statistics.mean(scores), "score_max": max(scores)}
+        for boss in range(BOSSES):
+            times = [run["bosses_s"][boss] for run in runs if run["bosses_s"][boss] is not None]
+            row[f"boss{boss}_pct"] = 100 * len(times) / len(runs)
+            row[f"boss{boss}_mean_s"] = statistics.mean(times) if times else None
+        for counted in COUNTED:
+            peaks = [run["peaks"][counted] for run in runs]
+            row[f"peak_{counted}_mean"] = statistics.mean(peaks)
+            row[f"peak_{counted}_max"] = max(peaks)
+        table.append(row)
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulação em lote do TroPHY.exe para balancear as ondas")
+    parser.add_argument("--configs", help="arquivo JSON com as ondas de cada configuração. Default: ondas originais")
+    parser.add_argument("--sessions", type=int, default=100, help="sessões por configuração")
+    parser.add_argument("--level", type=int, default=0, help="nível inicial das sessões")
+    parser.add_argument("--minutes", type=float, default=MAX_MINUTES, help="duração máxima de cada sessão")
+    parser.add_argument("--workers", type=int, default=None, help="quantidade de processos. Default: um por núcleo")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="arquivo CSV em que a tabela de resultados é gravada")
+    args = parser.parse_args(argv)
+
+    configs = {"original": None}
+    if args.configs:
+        with open(args.configs) as file:
+            configs = json.load(file)
+    start = time.perf_counter()
+    results = run_batch(configs, args.sessions, args.level, args.minutes, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+    table = aggregate(results)
+    print(f"{len(results)} sessões em {elapsed:.1f} s ({len(results) / elapsed:.1f} sessões/s, "
+          f"{args.workers or os.cpu_count()} processos)")
+    print(f"{'configuração':<16}{'mortes':>8}{'sobrev. (s)':>13}{'placar':>9}"
+          + "".join(f"{f'boss {boss} (s)':>13}" for boss in range(BOSSES)) + f"{'pico inim.':>12}")
+    for row in table:
+        bosses = "".join(f"{row[f'boss{boss}_mean_s']:>13.1f}" if row[f'boss{boss}_mean_s'] is not None
+                         else f"{'-':>13}" for boss in range(BOSSES))
+        print(f"{row['config']:<16}{row['died_pct']:>7.0f}%{row['survival_mean_s']:>13.1f}"
+              f"{row['score_mean']:>9.1f}{bosses}{row['peak_enemies_max']:>12}")
+    if args.output:
+        with open(args.output, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(table[0]))
+            writer.writeheader()
+            for row in table:
+                writer.writerow({key: f"{value:.2f}" if isinstance(value, float) else value
+                                 for key, value in row.items()})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,338 @@
+import os
+import time
+import json
+import random
+import argparse
+import itertools
+import subprocess
+
+# Benchmarks de desempenho do jogo. Uso (a partir da pasta coronashooter):
+#   python benchmark.py render
+#   python benchmark.py collision
+#   python benchmark.py projectiles
+#   python benchmark.py hud
+#   python benchmark.py scenarios --output resultados.json
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from elements import Laser, Spider, Trojan
+from render import RenderLayers
+from projectiles import ProjectileStore
+from profiler import PhaseProfiler, PHASES
+from main import Game
+from hud import HudText
+from resources import get_font
+
+
+def _time_frames(draw, frames):
+    """ Retorna o tempo médio, em ms, de uma chamada de draw
+    """
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def bench_render(counts=(50, 500, 5000), frames=100):
+    """ Compara o tempo de desenho por quadro de N projéteis na tela:
+    um RenderPlain por entidade (como antes) contra as camadas de RenderLayers
+    :param counts: quantidades de projéteis testadas
+    :type counts: tuple
+    :param frames: quadros medidos em cada caso
+    :type frames: int
+    """
+    screen = pygame.display.get_surface()
+    rng = random.Random(0)
+    results = []
+    for n in counts:
+        shoots = [Laser((rng.randint(0, 640), rng.randint(0, 640)),
+                        image=rng.choice(("tironave1.png", "tiroinimigoG.png")))
+                  for _ in range(n)]
+        groups = [pygame.sprite.RenderPlain(shoot) for shoot in shoots]
+
+        def draw_groups():
+            for group in groups:
+                group.draw(screen)
+
+        layers = RenderLayers(("shoots", shoots))
+        before = _time_frames(draw_groups, frames)
+        after = _time_frames(lambda: layers.draw(screen), frames)
+        results.append({"projectiles": n, "before_ms": before, "after_ms": after})
+    return results
+
+
+def bench_collision(counts=(50, 500, 5000), enemies=20, frames=20):
+    """ Compara o teste de cada inimigo contra todos os tiros do ProjectileStore com o teste contra a faixa de
+    tiros ordenada por sweep(), como em Game.handle_enemy_collision
+    :param counts: quantidades de tiros do jogador testadas
+    :type counts: tuple
+    :param enemies: quantidade de inimigos na tela
+    :type enemies: int
+    :param frames: quadros medidos em cada caso
+    :type frames: int
+    """
+    rng = random.Random(0)
+    targets = [Spider((rng.randint(0, 640), rng.randint(0, 640))) for _ in range(enemies)]
+    results = []
+    for n in counts:
+        store = ProjectileStore()
+        for _ in range(n):
+            store.spawn((rng.randint(0, 640), rng.randint(0, 640)), (0, -.6), "tironave1.png")
+        stats = {"tested": 0, "hits": 0}
+
+        def brute_force():
+            for enemy in targets:
+                store.colliding(enemy.rect)
+
+        def sweep():
+            bounds = store.sweep()
+            stats["hits"] = sum(len(store.colliding(enemy.rect, bounds)) for enemy in targets)
+            stats["tested"] = store.tested
+
+        before = _time_frames(brute_force, frames)
+        after = _time_frames(sweep, frames)
+        results.append({"projectiles": n, "pairs_before": n * enemies, "pairs_after": stats["tested"],
+                        "hits": stats["hits"], "before_ms": before, "after_ms": after})
+    return results
+
+
+def bench_projectiles(counts=(50, 500, 5000), frames=100, dt=16):
+    """ Compara o update por quadro de N tiros: um objeto Laser por tiro (update + check_borders)
+    contra os arrays de ProjectileStore
+    :param counts: quantidades de tiros testadas
+    :type counts: tuple
+    :param frames: quadros medidos em cada caso
+    :type frames: int
+    :param dt: variação do tempo por quadro
+    :type dt: int
+    """
+    area = pygame.display.get_surface().get_rect()
+    rng = random.Random(0)
+    results = []
+    for n in counts:
+        # velocidades pequenas para que os tiros continuem na tela durante a medição
+        starts = [((rng.randint(0, 640), rng.randint(0, 640)), (rng.choice((-1, 0, 1)), rng.choice((-1, 1))))
+                  for _ in range(n)]
+        lasers = [Laser(position, speed=.001, direction=direction) for position, direction in starts]
+        store = ProjectileStore()
+        for position, (dx, dy) in starts:
+            store.spawn(position, (dx * .001, dy * .001), "tironave1.png")
+
+        def update_lasers():
+            for laser in lasers:
+                laser.update(dt)
+                laser.check_borders()
+
+        before = _time_frames(update_lasers, frames)
+        after = _time_frames(lambda: store.update(dt, area), frames)
+        results.append({"projectiles": n, "before_ms": before, "after_ms": after})
+    return results
+
+
+def bench_hud(frames=600, score_every=30):
+    """ Compara o custo por quadro de desenhar o HUD (placar, bombas e vidas): rasterizando os três textos a
+    cada quadro, como antes, contra os textos em cache de HudText
+    :param frames: quadros medidos
+    :type frames: int
+    :param score_every: o placar muda a cada score_every quadros
+    :type score_every: int
+    """
+    screen = pygame.display.get_surface()
+    font = get_font('Pixels.ttf', 72)
+    font_love = get_font('pixel-love.ttf', 48)
+    black = (0, 0, 0)
+
+    def hud_lines(frame):
+        # (fonte, texto, cor, posição) de cada texto do HUD em um quadro
+        return ((font, "Score = " + str(frame // score_every), black, (15, 570)),
+                (font, "2", black, (500, 570)),
+                (font_love, "@@@", black, (10, 540)))
+
+    frames_before = itertools.count()
+
+    def draw_before():
+        for text_font, text, color, position in hud_lines(next(frames_before)):
+            screen.blit(text_font.render(text, 1, color), position)
+
+    cached = [HudText(font), HudText(font), HudText(font_love)]
+    frames_after = itertools.count()
+
+    def draw_after():
+        for hud_text, (text_font, text, color, position) in zip(cached, hud_lines(next(frames_after))):
+            screen.blit(hud_text.render(text, color), position)
+
+    before = _time_frames(draw_before, frames)
+    after = _time_frames(draw_after, frames)
+    return {"before_ms": before, "after_ms": after,
+            "renders_before": 3 * frames, "renders_after": sum(text.renders for text in cached)}
+
+
+ZEN_WARMUP_MINUTES = 10  # tempo de jogo simulado antes de medir o modo zen
+STRESS_PROJECTILES = 2000  # tiros mantidos na tela no cenário de estresse
+
+
+def _patrol(frame):
+    """ Entradas roteirizadas do jogador: anda de um lado para o outro e atira a cada 8 quadros
+    """
+    events = []
+    if frame % 240 == 0:
+        events += [pygame.event.Event(pygame.KEYUP, key=pygame.K_RIGHT),
+                   pygame.event.Event(pygame.KEYDOWN, key=pygame.K_LEFT)]
+    elif frame % 240 == 120:
+        events += [pygame.event.Event(pygame.KEYUP, key=pygame.K_LEFT),
+                   pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RIGHT)]
+    if frame % 8 == 0:
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_LCTRL))
+    return events
+
+
+def _idle(frame):
+    return []
+
+
+def setup_menu(game):
+    pass
+
+
+def setup_level_1(game):
+    game.start_game(0)
+
+
+def setup_boss_shooter(game):
+    game.start_game(1)
+    game.summon_boss()
+
+
+def setup_trojan(game):
+    game.start_game(4)
+    game.summon_boss()
+    for enemy in game.enemies:
+        if isinstance(enemy, Trojan):
+            enemy.set_lives(40)  # abaixo de 50 vidas o Trojan atira 4x mais rápido
+
+
+def setup_zen(game):
+    game.start_game(5)
+    for frame in range(int(ZEN_WARMUP_MINUTES * 60000 / game.dt)):
+        game.step(_patrol(frame))
+        game.player.set_lives(3)
+
+
+def setup_stress(game):
+    game.start_game(0)
+
+
+def fill_projectiles(game):
+    """ Repõe os tiros do jogador até STRESS_PROJECTILES, espalhados pela tela e quase parados
+    """
+    rng = random.Random(len(game.shoots))
+    for _ in range(STRESS_PROJECTILES - len(game.shoots)):
+        game.shoots.spawn((rng.randint(0, 640), rng.randint(0, 640)), (0, -.05), "tironave1.png")
+
+
+# cenário -> (preparação, entradas por quadro, ação extra antes de cada quadro)
+SCENARIOS = {
+    "menu_idle": (setup_menu, _idle, None),
+    "level_1": (setup_level_1, _patrol, None),
+    "boss_shooter": (setup_boss_shooter, _idle, None),
+    "trojan_low_health": (setup_trojan, _idle, None),
+    "zen_10min": (setup_zen, _patrol, None),
+    "stress_2000": (setup_stress, _idle, fill_projectiles),
+}
+
+
+def bench_scenarios(names=tuple(SCENARIOS), frames=600, seed=0):
+    """ Roda cada cenário no jogo sem janela e mede o tempo por quadro de cada fase do Game
+    O jogador é mantido vivo, para que nenhum cenário volte ao menu durante a medição
+    :param names: cenários medidos
+    :type names: tuple
+    :param frames: quadros medidos em cada cenário
+    :type frames: int
+    :param seed: semente do gerador aleatório de cada sessão
+    :type seed: int
+    """
+    results = {}
+    for name in names:
+        setup, inputs, before_frame = SCENARIOS[name]
+        game = Game(headless=True, seed=seed)
+        setup(game)
+        profiler = PhaseProfiler()
+        profiler.attach(game)
+        frame_times = []
+        for frame in range(frames):
+            if before_frame:
+                before_frame(game)
+            start = time.perf_counter()
+            game.step(inputs(frame))
+            game.render()
+            frame_times.append((time.perf_counter() - start) * 1000)
+            profiler.end_frame()
+            game.player.set_lives(3)
+        profiler.detach()
+        frame_times.sort()
+        results[name] = dict(profiler.summary(),
+                             frame={"mean_ms": sum(frame_times) / frames,
+                                    "p99_ms": frame_times[min(frames - 1, int(frames * .99))]})
+    return results
+
+
+def _commit():
+    """ Retorna o commit atual do repositório, se houver
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do TroPHY.exe")
+    parser.add_argument("suite", choices=["render", "collision", "projectiles", "hud", "scenarios"])
+    parser.add_argument("--frames", type=int, default=None)
+    parser.add_argument("--output", help="arquivo JSON em que os resultados dos cenários são gravados")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="cenário medido (pode ser repetido). Default: todos")
+    args = parser.parse_args(argv)
+    frames = args.frames or 100
+
+    pygame.init()
+    pygame.display.set_mode((640, 640))
+    if args.suite == "render":
+        print(f"{'projéteis':>10} {'antes (ms)':>12} {'depois (ms)':>12}")
+        for row in bench_render(frames=frames):
+            print(f"{row['projectiles']:>10} {row['before_ms']:>12.3f} {row['after_ms']:>12.3f}")
+    elif args.suite == "projectiles":
+        print(f"{'projéteis':>10} {'antes (ms)':>12} {'depois (ms)':>12}")
+        for row in bench_projectiles(frames=frames):
+            print(f"{row['projectiles']:>10} {row['before_ms']:>12.3f} {row['after_ms']:>12.3f}")
+    elif args.suite == "collision":
+        print(f"{'projéteis':>10} {'pares antes':>12} {'pares depois':>12} {'colisões':>9} "
+              f"{'antes (ms)':>12} {'depois (ms)':>12}")
+        for row in bench_collision(frames=frames):
+            print(f"{row['projectiles']:>10} {row['pairs_before']:>12} {row['pairs_after']:>12} "
+                  f"{row['hits']:>9} {row['before_ms']:>12.3f} {row['after_ms']:>12.3f}")
+    elif args.suite == "hud":
+        row = bench_hud(frames=args.frames or 600)
+        print(f"{'':>12} {'antes':>10} {'depois':>10}")
+        print(f"{'ms/quadro':>12} {row['before_ms']:>10.4f} {row['after_ms']:>10.4f}")
+        print(f"{'rasterizações':>12} {row['renders_before']:>10} {row['renders_after']:>10}")
+    elif args.suite == "scenarios":
+        results = bench_scenarios(args.scenario or tuple(SCENARIOS), frames=args.frames or 600)
+        columns = PHASES + ("frame",)
+        print(f"{'cenário':<18}" + "".join(f"{phase:>22}" for phase in columns))
+        print(f"{'':<18}" + "".join(f"{'média / p99 (ms)':>22}" for phase in columns))
+        for name, phases in results.items():
+            print(f"{name:<18}" + "".join(
+                f"{phases[phase]['mean_ms']:>12.3f} / {phases[phase]['p99_ms']:<7.3f}" for phase in columns))
+        if args.output:
+            with open(args.output, 'w') as file:
+                json.dump({"commit": _commit(), "frames": args.frames or 600, "scenarios": results},
+                          file, indent=1)
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
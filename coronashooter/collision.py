@@ -0,0 +1,88 @@
+from resources import surface_cache
+
+
+class MaskCollider:
+    """ Teste fino de colisão por máscara de pixels, usado depois do teste de rects
+    Com o modo preciso desligado, todo par que passa no teste de rects é uma colisão, como antes. Ligado, o par
+    só colide se os pixels não transparentes das duas imagens se sobrepõem; as máscaras vêm do SurfaceCache,
+    que as cria junto com cada variante das imagens, e nunca são criadas aqui
+    """
+
+    def __init__(self, enabled=False, cache=surface_cache):
+        """ MaskCollider construtor
+        :param enabled: liga o modo preciso
+        :type enabled: boolean. Default False
+        :param cache: cache de onde vêm as máscaras
+        :type cache: resources.SurfaceCache
+        """
+        self.enabled = enabled
+        self.cache = cache
+        if enabled:
+            cache.enable_masks()
+        self.tested = 0  # pares que passaram no teste de rects e foram testados por máscara
+        self.rejected = 0  # pares que passaram no teste de rects mas não se tocam nos pixels
+
+    def warm(self, variants):
+        """ Cria as variantes de uma cena, e suas máscaras, para que nenhuma máscara seja criada durante a partida
+        As variantes só são criadas quando o elemento aparece pela primeira vez; com o modo preciso ligado, elas
+        são criadas aqui, logo que os arquivos da cena são carregados
+        :param variants: pares (imagem, tamanho), como os retornados por ElementSprite.variants()
+        :type variants: list
+        """
+        if not self.enabled:
+            return
+        for image, size in variants:
+            self.cache.get(image, size)
+
+    def overlap(self, image, rect, other_image, other_rect):
+        """ Retorna se duas imagens, cujos rects já se tocam, se sobrepõem nos pixels
+        Imagens sem máscara (criadas fora do cache) são consideradas colisões, como no teste de rects
+        :param image: imagem do primeiro elemento
+        :type image: pygame.Surface
+        :param rect: rect do primeiro elemento
+        :type rect: pygame.Rect
+        :param other_image: imagem do segundo elemento
+        :type other_image: pygame.Surface
+        :param other_rect: rect do segundo elemento
+        :type other_rect: pygame.Rect
+        """
+        if not self.enabled:
+            return True
+        mask = self.cache.get_mask(image)
+        other_mask = self.cache.get_mask(other_image)
+        if mask is None or other_mask is None:
+            return True
+        self.tested += 1
+        if mask.overlap(other_mask, (other_rect.x - rect.x, other_rect.y - rect.y)) is None:
+            self.rejected += 1
+            return False
+        return True
+
+    def collide(self, sprite, other):
+        """ Teste completo entre dois sprites: rects e, no modo preciso, máscaras
+        :param sprite: primeiro sprite
+        :type sprite: pygame.sprite.Sprite
+        :param other: segundo sprite
+        :type other: pygame.sprite.Sprite
+        """
+        return sprite.rect.colliderect(other.rect) and self.overlap(sprite.image, sprite.rect, other.image, other.rect)
+
+    def colliding_shots(self, sprite, store, bounds=None):
+        """ Retorna, em ordem, os índices dos tiros de um ProjectileStore que colidem com um sprite
+        :param sprite: sprite testado
+        :type sprite: pygame.sprite.Sprite
+        :param store: tiros
+        :type store: projectiles.ProjectileStore
+        :param bounds: rects dos tiros no passo, como retornados por store.sweep(). Default None
+        :type bounds: projectiles.ShotBounds
+        """
+        hits = store.colliding(sprite.rect, bounds)
+        if not self.enabled or not len(hits):
+            return hits
+        return [index for index in hits
+                if self.overlap(sprite.image, sprite.rect, store.image(index), store.rect(index))]
+
+    def stats(self):
+        """ Retorna os pares testados por máscara e os rejeitados
+        """
+        return {"mask_tested": self.tested, "mask_rejected": self.rejected}
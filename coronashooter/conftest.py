@@ -0,0 +1,24 @@
+import os
+import pytest
+
+# os testes rodam sem janela e sem som
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+@pytest.fixture(autouse=True)
+def game_dir(monkeypatch):
+    """ Os recursos são carregados com caminhos relativos à pasta do jogo
+    """
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def display():
+    """ Abre uma tela (falsa) para os testes que precisam converter superfícies
+    """
+    import pygame
+    pygame.display.init()
+    screen = pygame.display.set_mode((640, 480))
+    yield screen
+    pygame.display.quit()
@@ -1,28 +1,20 @@
 import pygame
 import os
 import random
-
-_sound_library = {}  # Mesmo método de biblioteca de efeitos sonoros que main.py
-
-
-def play_sound(path):
-    """Função que toca efeitos sonoros presentes na pasta /songs
-    param path: nome do arquivo do efeito sonoro
-    type path: string
-    """
-    global _sound_library
-    sound = _sound_library.get(path)
-    if sound == None:
-        correctpath = os.path.join('songs', path)
-        sound = pygame.mixer.Sound(correctpath)
-        _sound_library[path] = sound
-    sound.play()
+from resources import surface_cache
+from audio import play_sound
+from animation import AnimationClip
+from pool import acquire
 
 
 class ElementSprite(pygame.sprite.Sprite):
     """ Classe básica de todos os elementos do jogo
     Tem herança de pygame.sprite.Sprite para que o pygame possa fazer tudo que faz com sprites
     """
+    pool = None  # pool de origem do elemento, quando ele foi criado por pool.acquire()
+    generation = 0  # quantas vezes o elemento foi entregue por um pool: distingue as reutilizações do objeto
+    IMAGE = None  # imagem padrão da classe; {color} é trocado pela cor do elemento
+    SIZE = None  # tamanho padrão da imagem (None para o tamanho original)
 
     def __init__(self, image, position, speed=None, new_size=None, direction=(0, 1)):
         """ ElementSprite constructor
@@ -39,14 +31,13 @@ class ElementSprite(pygame.sprite.Sprite):
         """
         pygame.sprite.Sprite.__init__(self)
 
-        # Tenta fazer upload da imagem
+        # Busca a imagem, já na escala desejada, no cache compartilhado
         if isinstance(image, str):
-            self.image = pygame.image.load(os.path.join('images', image))
+            self.image_name = image
+            self.image_size = tuple(new_size) if new_size else None
+            self.image = surface_cache.get(image, self.image_size)
         else:
             raise TypeError("image must be of type str")
-        # Checa se a imagem precia ter escala modificada. Caso sim, refaz a escala.
-        if new_size:
-            self.scale(new_size)
 
         self.rect = self.image.get_rect()  # extrai um objeto pygame.Rect da imagem
         screen = pygame.display.get_surface()
@@ -54,17 +45,38 @@ class ElementSprite(pygame.sprite.Sprite):
         self.area = screen.get_rect()
         self.speed = speed  # define a speed. Se for None, a speed será setada na classe
         self.set_pos(position)  # define a posição do sprite
+        self.killed = False  # marca elementos mortos, que ainda precisam sair das listas do jogo
+
+    @classmethod
+    def variants(cls, color):
+        """ Retorna as variantes (imagem, tamanho) que os elementos da classe podem desenhar
+        Usado para fixar no ResourceManager os recursos de uma fase antes que ela comece
+        :param color: cor dos elementos
+        :type color: string
+        """
+        if cls.IMAGE is None:
+            return []
+        return [(cls.IMAGE.format(color=color), cls.SIZE)]
 
     def update(self, dt):
         """ Faz o update da posição do elemento
         :param dt: variação do tempo
         :type dt: int
         """
-        pos_y = self.rect.center[1] + self.direction[1] * self.speed*dt
-        self.rect.center = (self.rect.center[0], pos_y)
+        pos_y = self.pos[1] + self.direction[1] * self.speed*dt
+        self.move_to((self.pos[0], pos_y))
         # chama a função check_borders para matar detectar o que estiver fora da tela
         self.check_borders()
 
+    def kill(self):
+        """ Marca o elemento como morto, para que seja retirado das listas do jogo, e o remove dos grupos do pygame
+        Elementos vindos de um pool voltam para ele
+        """
+        if self.pool and not self.killed:
+            self.pool.release(self)
+        self.killed = True
+        pygame.sprite.Sprite.kill(self)
+
     def check_borders(self):
         """ Checa se o eleemnto está fora das bordas da tela, e o elimina se estiver
         """
@@ -101,7 +113,18 @@ class ElementSprite(pygame.sprite.Sprite):
         :param pos: Posição
         :type pos: list
         """
-        self.rect.center = (pos[0], pos[1])
+        self.move_to(pos)
+        self.prev_pos = self.rect.topleft  # um reposicionamento não é interpolado na renderização
+
+    def move_to(self, pos):
+        """ Move o centro do elemento. A posição é guardada em self.pos sem arredondamento, e o rect (inteiro) é
+        derivado dela: assim os deslocamentos menores que um pixel se acumulam, e o movimento não depende da
+        duração do passo
+        :param pos: Posição
+        :type pos: tuple
+        """
+        self.pos = (pos[0], pos[1])
+        self.rect.center = self.pos
 
     def get_size(self):
         """Retorna o tamanho do objeto pygame.Rect
@@ -113,7 +136,8 @@ class ElementSprite(pygame.sprite.Sprite):
         :param new_size: tamanho desejado
         :type new_size: tuple
         """
-        self.image = pygame.transform.scale(self.image, new_size)
+        self.image_size = tuple(new_size)
+        self.image = surface_cache.get(self.image_name, self.image_size)
 
     def set_image(self, image, scale):
         """ Define a imagem do elemento
@@ -122,16 +146,19 @@ class ElementSprite(pygame.sprite.Sprite):
         :param scale: Escala da imagem
         :type scale: float
         """
-        self.image = pygame.image.load(os.path.join('images', image))
+        self.image_name = image
         self.scale(scale)
 
     def rot_center(self, angle):
-        """Rotaciona a imagem mantendo seu centro
+        """Rotaciona a imagem mantendo seu centro, usando a tabela de rotações pré-calculada
         :param angle: Ângulo do elemento
         :type angle: float
         """
-        self.image = pygame.transform.rotate(self.image, angle)
-        self.rect = self.image.get_rect(center=self.rect.center)
+        self.image, offset = surface_cache.get_rotated(
+            self.image_name, self.image_size, angle)
+        center = self.rect.center
+        self.rect = pygame.Rect(
+            (center[0] + offset[0], center[1] + offset[1]), self.image.get_size())
 
 
 class Block(ElementSprite):
@@ -164,8 +191,10 @@ class Block(ElementSprite):
 class ShieldPowerUp(ElementSprite):
     """ Classe do power up de escudo. Tem herança de ElementSprite
     """
+    IMAGE = "escudo.png"
+    SIZE = (27, 36)
 
-    def __init__(self, position, speed=.6, image=None, direction=(0, -1), player=None, size=(27, 36)):
+    def __init__(self, position, speed=.6, image=None, direction=(0, -1), player=None, size=SIZE):
         """ ShieldPowerUp constructor
         :param position: posição inicial do escudo
         :type position: list
@@ -181,7 +210,7 @@ class ShieldPowerUp(ElementSprite):
 
         # define a imagem padrão
         if not image:
-            image = "escudo.png"
+            image = self.IMAGE
 
         # chama ElementSprite.__init__()
         super().__init__(image, position, speed, direction=direction, new_size=size)
@@ -192,9 +221,9 @@ class ShieldPowerUp(ElementSprite):
         :param dt: variação de tempo
         :type dt: int
         """
-        pos_x = self.player.rect.center[0]
-        pos_y = self.player.rect.center[1]
-        self.rect.center = (pos_x, pos_y)
+        pos_x = self.player.pos[0]
+        pos_y = self.player.pos[1]
+        self.move_to((pos_x, pos_y))
 
 
 class Spaceship(ElementSprite):
@@ -275,9 +304,9 @@ class Laser(ElementSprite):
         """
 
         # posição
-        pos_x = self.rect.center[0] + self.direction[0] * self.speed*dt
-        pos_y = self.rect.center[1] + self.direction[1] * self.speed*dt
-        self.rect.center = (pos_x, pos_y)
+        pos_x = self.pos[0] + self.direction[0] * self.speed*dt
+        pos_y = self.pos[1] + self.direction[1] * self.speed*dt
+        self.move_to((pos_x, pos_y))
 
         # mata o elemento se ele estiver fora dos limites da tela
         self.check_borders()
@@ -287,8 +316,9 @@ class Explosion(ElementSprite):
     """ Classe do elemento Explosion (sprite de explosão).
     Herda de ElementSprite.
     """
+    IMAGE = "laser{type}{color}.png"
 
-    def __init__(self, position, speed=0, image=None, direction=(0, 0), angle=None, type=1, color='G', hits=[]):
+    def __init__(self, position, speed=0, image=None, direction=(0, 0), angle=None, type=1, color='G', hits=None):
         """ Explosion constructor
         :param position: a posição inicial do elemento
         :type position: list
@@ -302,29 +332,53 @@ class Explosion(ElementSprite):
         :type angle: float
         :param color: cor do sprite, utilizado para escolher a imagem
         :type color: string
+        :param hits: elementos que a explosão não atinge (quem a criou). Default None
+        :type hits: list
         """
         # define a imagem padrão
         if not image:
-            self.image = f"laser{type}{color}.png"
+            self.image = self.IMAGE.format(type=type, color=color)
         self.position = position
         self.speed = speed
         self.direction = direction
         # chama ElementSprite.__init__() e define valores iniciais de objetos lógicos
-        self.count = 0
-        self.hits = hits
-        self.duration = 50
+        self.count = 0  # tempo de vida, em ms
+        # elementos já atingidos, com a geração de cada um: um inimigo reaproveitado pelo pool enquanto a
+        # explosão ainda está na tela é outro inimigo, e pode ser atingido
+        self.hits = [(element, element.generation) for element in hits or ()]
+        self.duration = 800  # duração da explosão, em ms
         super().__init__(self.image, self.position, self.speed, direction=self.direction)
 
         # define ângulação
         if angle:
             self.rot_center(angle)
 
+    @classmethod
+    def variants(cls, color):
+        """ Retorna as imagens dos dois tipos de explosão (horizontal e vertical) da cor dada
+        """
+        return [(cls.IMAGE.format(type=type, color=color), None) for type in (1, 2)]
+
+    def has_hit(self, element):
+        """ Retorna se a explosão já atingiu o elemento
+        :param element: elemento
+        :type element: ElementSprite
+        """
+        return (element, element.generation) in self.hits
+
+    def add_hit(self, element):
+        """ Registra que a explosão atingiu o elemento, que não é atingido de novo por ela
+        :param element: elemento
+        :type element: ElementSprite
+        """
+        self.hits.append((element, element.generation))
+
     def update(self, dt):
         """ Atualiza a posição do elemento.
         :param dt: variação do tempo
         :type dt: int
         """
-        self.count += 1
+        self.count += dt
         # if self.count == 1:
         if self.count > self.duration:
             self.kill()
@@ -334,8 +388,10 @@ class PowerUp(ElementSprite):
     """ Classe do elemento PowerUp
     Herda de ElementSprite.
     """
+    IMAGE = "powerup{power}.png"
+    SIZE = (40, 40)
 
-    def __init__(self, position, speed=.4, image=None, direction=(0, 1), kind='speed', power=None, size=(40, 40)):
+    def __init__(self, position, speed=.4, image=None, direction=(0, 1), kind='speed', power=None, size=SIZE):
         """ PowerUp constructor
         :param position: a posição inicial do elemento
         :type position: list
@@ -371,7 +427,7 @@ class PowerUp(ElementSprite):
 
         # define a imagem padrão
         if not image:
-            image = f"powerup{self.power}.png"
+            image = self.IMAGE.format(power=self.power)
 
         # chama ElementSprite.__init__()
         super().__init__(image, position, speed, direction=direction, new_size=size)
@@ -381,13 +437,21 @@ class PowerUp(ElementSprite):
         """
         return self.power
 
+    @classmethod
+    def variants(cls, color):
+        """ Retorna as imagens dos quatro tipos de power up (a cor não muda a imagem)
+        """
+        return [(cls.IMAGE.format(power=power), cls.SIZE) for power in range(1, 5)]
+
 
 class Enemy(Spaceship):
     """ Classe de todos os inimigos do jogo
     Herda de Spaceship.
     """
+    IMAGE = "inimigo1{color}.png"
+    SIZE = (75, 50)
 
-    def __init__(self, position, lives=0, speed=.35, image=None, size=(75, 50), color='G'):
+    def __init__(self, position, lives=0, speed=.35, image=None, size=SIZE, color='G'):
         """Enemy construtor. Basicamente o mesmo que Spaceship.__init__(), sendo a única diferença o valor padrão para a imagem
         :param position: a posição inicial do inimigo.
         :type position: list
@@ -406,7 +470,7 @@ class Enemy(Spaceship):
         self.id = "enemy"
 
         # define a imagem padrão
-        image = f"inimigo1{color}.png" if not image else image
+        image = self.IMAGE.format(color=color) if not image else image
 
         # chama ElementSprite.__init__() e define valores iniciais de objetos lógicos
         super().__init__(position, lives, speed, image, size)
@@ -440,8 +504,10 @@ class Spider(Enemy):
     """Classe do inimigo Spider
     Herda de Enemy
     """
+    IMAGE = "inimigo1{color}.png"
+    SIZE = (75, 50)
 
-    def __init__(self, position, lives=0, speed=.35, image=None, size=(75, 50), color='G'):
+    def __init__(self, position, lives=0, speed=.35, image=None, size=SIZE, color='G'):
         """Spider construtor
         :param position: a posição inicial do elemento.
         :type position: list
@@ -458,7 +524,7 @@ class Spider(Enemy):
         """
 
         # define a imagem padrão
-        image = f"inimigo1{color}.png" if not image else image
+        image = self.IMAGE.format(color=color) if not image else image
 
         # chama ElementSprite.__init__()
         super().__init__(position, lives, speed, image, size)
@@ -469,19 +535,19 @@ class Spider(Enemy):
         :type dt: int
         :param playerposx: posição do jogador
         :type playerposx: int
-        :param enemies: lista dos inimigos vivos
-        :type enemies: list
+        :param enemies: registro dos inimigos vivos
+        :type enemies: registry.EntityRegistry
         :param lst: não usada no spider
         :type lst: list
         """
 
         # posição e movimento, perseguindo o player
-        pos_y = self.rect.center[1] + self.direction[1] * self.speed*dt
-        if playerposx - self.rect.center[0] > 0:
-            pos_x = self.rect.center[0] + 1 * self.speed*dt/4
+        pos_y = self.pos[1] + self.direction[1] * self.speed*dt
+        if playerposx - self.pos[0] > 0:
+            pos_x = self.pos[0] + 1 * self.speed*dt/4
         else:
-            pos_x = self.rect.center[0] - 1 * self.speed*dt/4
-        self.rect.center = (pos_x, pos_y)
+            pos_x = self.pos[0] - 1 * self.speed*dt/4
+        self.move_to((pos_x, pos_y))
 
         # mata o elemento se ele estiver fora dos limites da tela
         self.check_borders()
@@ -491,8 +557,10 @@ class Shooter(Enemy):
     """ Classe do inimigo Shooter
     Herda de Enemy.
     """
+    IMAGE = "inimigo2{color}.png"
+    SIZE = (60, 45)
 
-    def __init__(self, position, lives=2, speed=.35, image=None, size=(60, 45), color='G'):
+    def __init__(self, position, lives=2, speed=.35, image=None, size=SIZE, color='G'):
         """Shooter construtor
         :param position: a posição inicial do elemento.
         :type position: list
@@ -509,7 +577,7 @@ class Shooter(Enemy):
         """
 
         # define a imagem padrão
-        image = f"inimigo2{color}.png" if not image else image
+        image = self.IMAGE.format(color=color) if not image else image
 
         # chama ElementSprite.__init__()
         super().__init__(position, lives, speed, image, size)
@@ -523,15 +591,15 @@ class Shooter(Enemy):
         :type dt: int
         :param playerposx: posição do jogador
         :type playerposx: int
-        :param enemies: lista dos inimigos vivos
-        :type enemies: list
-        :param lst: lista de todos os tiros do shooter
-        :type lst: list
+        :param enemies: registro dos inimigos vivos
+        :type enemies: registry.EntityRegistry
+        :param lst: tiros dos inimigos
+        :type lst: projectiles.ProjectileStore
         """
 
         # posição e movimento, fixando em y=50 definindo sua movimentação de um lado para o outro da tela
-        pos_x = self.rect.center[0]
-        pos_y = self.rect.center[1]
+        pos_x = self.pos[0]
+        pos_y = self.pos[1]
         if pos_y < 50:
             pos_y += self.speed*dt
         if pos_x >= 580:
@@ -539,37 +607,44 @@ class Shooter(Enemy):
         elif pos_x <= 40:
             self.direction = (1, 0)
         pos_x += self.direction[0]*self.speed*dt/4
-        self.rect.center = (pos_x, pos_y)
+        self.move_to((pos_x, pos_y))
 
         # definindo frequência de tiros do shooter
-        if self.shtcounter > 60:
+        if self.shtcounter > 960:  # um tiro a cada 960 ms
             self.shoot(lst)
             self.shtcounter = 0
-        self.shtcounter += 1
+        self.shtcounter += dt
 
         # mata o elemento se ele estiver fora dos limites da tela
         self.check_borders()
 
     def shoot(self, shoots):
         """Define os efeitos do tiro do shooter
-        :param shoots: tiros do shooter
-        :type shoots: list
+        :param shoots: tiros dos inimigos
+        :type shoots: projectiles.ProjectileStore
         """
         # som do tiro
         play_sound("Enemy Shoot.OGG")
 
-        # cria o tiro (laser), mudando a imagem padrão da classe Laser e o adiciona à lista de tiros
-        laser = Laser((self.rect.center[0], self.rect.top),
-                      image=f'tiroinimigo{self.color}.png', direction=(0, 1))
-        shoots.append([laser, pygame.sprite.RenderPlain(laser)])
+        # cria o tiro no conjunto de tiros dos inimigos, com a velocidade padrão de Laser
+        shoots.spawn((self.rect.center[0], self.rect.top),
+                     (0, .6), f'tiroinimigo{self.color}.png')
+
+    @classmethod
+    def variants(cls, color):
+        """ Retorna a imagem do Shooter e a do seu tiro
+        """
+        return super().variants(color) + [(f"tiroinimigo{color}.png", None)]
 
 
 class Bomb(Enemy):
     """ Classe do inimigo Bomb
     Herda de Enemy.
     """
+    IMAGE = "inimigo3{color}.png"
+    SIZE = (55, 60)
 
-    def __init__(self, position, lives=3, speed=.15, image=None, size=(55, 60), color='G'):
+    def __init__(self, position, lives=3, speed=.15, image=None, size=SIZE, color='G'):
         """Bomb construtor
         :param position: a posição inicial do elemento.
         :type position: list
@@ -586,7 +661,7 @@ class Bomb(Enemy):
         """
 
         # define a imagem padrão
-        image = f"inimigo3{color}.png" if not image else image
+        image = self.IMAGE.format(color=color) if not image else image
 
         # chama ElementSprite.__init__()
         super().__init__(position, lives, speed, image, size)
@@ -599,15 +674,15 @@ class Bomb(Enemy):
         :type dt: int
         :param playerposx: posição do jogador
         :type playerposx: int
-        :param enemies: lista dos inimigos vivos
-        :type enemies: list
+        :param enemies: registro dos inimigos vivos
+        :type enemies: registry.EntityRegistry
         :param lst: lista de todos os elementos ativos: inimigos, tiros do player e tiros dos inimigos
         :type lst: list
         """
 
         # posição
-        pos_y = self.rect.center[1] + self.direction[1] * self.speed*dt
-        self.rect.center = (self.rect.center[0], pos_y)
+        pos_y = self.pos[1] + self.direction[1] * self.speed*dt
+        self.move_to((self.pos[0], pos_y))
 
         # mata o elemento se ele estiver fora dos limites da tela
         self.check_borders()
@@ -617,8 +692,10 @@ class Shield(Enemy):
     """ Classe do inimigo Shield
     Herda de Enemy.
     """
+    IMAGE = "inimigo4{color}.png"
+    SIZE = (50, 50)
 
-    def __init__(self, position, lives=4, speed=.35, image=None, size=(50, 50), color='G'):
+    def __init__(self, position, lives=4, speed=.35, image=None, size=SIZE, color='G', rng=None):
         """Shield construtor
         :param position: a posição inicial do elemento.
         :type position: list
@@ -632,10 +709,12 @@ class Shield(Enemy):
         :type size: tuple
         :param color: cor do spider, utilizado para escolher a imagem
         :type color: string
+        :param rng: gerador aleatório da sessão. Default None (módulo random)
+        :type rng: random.Random
         """
 
         # define a imagem padrão
-        image = f"inimigo4{color}.png" if not image else image
+        image = self.IMAGE.format(color=color) if not image else image
 
         # chama ElementSprite.__init__() e define valores iniciais de objetos lógicos
         super().__init__(position, lives, speed, image, size)
@@ -643,15 +722,16 @@ class Shield(Enemy):
         self.enemyposx = 0
         self.enemyposy = 0
         self.shield = True
+        self.rng = rng or random
 
     def choose_rand_enemy(self, enemylist):
         """ Escolhe um inimigo aleatório na lista de inimigos vivos, confere se sua posição está acima do Shield e se o inimigo já não está sendo protegido por outro escudo
-        :param enemylist: lista de inimigos ativos
-        :type enemylist: list
+        :param enemylist: registro dos inimigos ativos
+        :type enemylist: registry.EntityRegistry
         """
 
         if len(enemylist) > 0:
-            enemy = random.choice(enemylist)[0]
+            enemy = self.rng.choice(enemylist)
             if not enemy.shield and self.rect.center[1] > enemy.rect.center[1]:
                 self.enemy = enemy
                 self.enemy.shield = True
@@ -664,8 +744,8 @@ class Shield(Enemy):
         :type dt: int
         :param playerposx: posição do jogador
         :type playerposx: int
-        :param enemylist: lista dos inimigos vivos
-        :type enemylist: list
+        :param enemylist: registro dos inimigos vivos
+        :type enemylist: registry.EntityRegistry
         :param lst: lista de todos os elementos ativos: inimigos, tiros do player e tiros dos inimigos
         :type lst: list
         """
@@ -674,34 +754,34 @@ class Shield(Enemy):
         # se já houver inimigo selecionado, pega sua posição
         if not self.enemy:
             self.choose_rand_enemy(enemylist)
-            self.enemyposx = self.rect.center[0]
+            self.enemyposx = self.pos[0]
             self.enemyposy = 640
         else:
-            if self.enemy.get_state():
+            if self.enemy.get_state() or self.enemy.killed:
                 self.enemy = None
             else:
                 self.enemyposx = self.enemy.get_pos_enemy()[0]
                 self.enemyposy = self.enemy.get_pos_enemy()[1]
 
         # Define a posição e movimentação do Shield, posicionando-o abaixo do inimigo aleatório selecionado
-        pos_y = self.rect.center[1]
+        pos_y = self.pos[1]
 
-        if self.enemyposx - self.rect.center[0] > 5:
-            pos_x = self.rect.center[0] + 1 * self.speed*dt
-        elif self.enemyposx - self.rect.center[0] < -5:
-            pos_x = self.rect.center[0] - 1 * self.speed*dt
+        if self.enemyposx - self.pos[0] > 5:
+            pos_x = self.pos[0] + 1 * self.speed*dt
+        elif self.enemyposx - self.pos[0] < -5:
+            pos_x = self.pos[0] - 1 * self.speed*dt
         else:
             pos_x = self.enemyposx
-        if (self.rect.center[1] - self.enemyposy) < 50:
+        if (self.pos[1] - self.enemyposy) < 50:
             pos_y += self.direction[1] * self.speed * \
                 dt
-        elif (self.rect.center[1] - self.enemyposy) > 200:
+        elif (self.pos[1] - self.enemyposy) > 200:
             pos_y -= self.direction[1] * self.speed * \
                 dt
-        elif (self.rect.center[1] - self.enemyposy) > 50:
+        elif (self.pos[1] - self.enemyposy) > 50:
             pos_y -= self.direction[1] * self.speed * \
                 dt
-        self.rect.center = (pos_x, pos_y)
+        self.move_to((pos_x, pos_y))
 
         # mata o elemento se ele estiver fora dos limites da tela
         self.check_borders()
@@ -710,8 +790,10 @@ class Shield(Enemy):
 class BossSpider(Enemy):
     """ Classe do Boss Spider.
     Herda de Enemy"""
+    IMAGE = "boss1G.png"
+    SIZE = (160, 160)
 
-    def __init__(self, position, lives=30, speed=.35, image=None, size=(160, 160), color=None):
+    def __init__(self, position, lives=30, speed=.35, image=None, size=SIZE, color=None):
         """BossSpider construtor
         :param position: a posição inicial do elemento.
         :type position: list
@@ -728,7 +810,7 @@ class BossSpider(Enemy):
         """
 
         # define a imagem padrão
-        image = "boss1G.png" if not image else image
+        image = self.IMAGE if not image else image
 
         # chama ElementSprite.__init__()
         super().__init__(position, lives, speed, image, size)
@@ -741,11 +823,11 @@ class BossSpider(Enemy):
         """
 
         # define movimento do Boss Spider, tornando seu movimento cíclico, ou seja, ao sair na tela embaixo, ele retorna em cima
-        pos_y = self.rect.center[1] + self.direction[1] * self.speed*dt
-        if playerposx - self.rect.center[0] > 0:
-            pos_x = self.rect.center[0] + 1 * self.speed*dt/2
+        pos_y = self.pos[1] + self.direction[1] * self.speed*dt
+        if playerposx - self.pos[0] > 0:
+            pos_x = self.pos[0] + 1 * self.speed*dt/2
         else:
-            pos_x = self.rect.center[0] - 1 * self.speed*dt/2
+            pos_x = self.pos[0] - 1 * self.speed*dt/2
         if pos_x < 0:
             pos_x = 640
         elif pos_x > 640:
@@ -754,15 +836,17 @@ class BossSpider(Enemy):
             pos_y = 640
         elif pos_y > 640:
             pos_y = 0
-        self.rect.center = (pos_x, pos_y)
+        self.move_to((pos_x, pos_y))
 
 
 class BossShooter(Enemy):
     """ Classe do Boss Shooter
     Herda de Enemy.
     """
+    IMAGE = "boss2Y.png"
+    SIZE = (145, 140)
 
-    def __init__(self, position, lives=40, speed=.35, image=None, size=(145, 140), color=None):
+    def __init__(self, position, lives=40, speed=.35, image=None, size=SIZE, color=None):
         """BossShooter construtor
         :param position: a posição inicial do elemento.
         :type position: list
@@ -779,7 +863,7 @@ class BossShooter(Enemy):
         """
 
         # define a imagem padrão
-        image = "boss2Y.png" if not image else image
+        image = self.IMAGE if not image else image
 
         # chama ElementSprite.__init__() e define valores iniciais de objetos lógicos
         super().__init__(position, lives, speed, image, size)
@@ -795,8 +879,8 @@ class BossShooter(Enemy):
         """
 
         # posição e movimento, fixando em y=200 definindo sua movimentação de um lado para o outro da tela
-        pos_x = self.rect.center[0]
-        pos_y = self.rect.center[1]
+        pos_x = self.pos[0]
+        pos_y = self.pos[1]
         if pos_y < 200:
             pos_y += self.speed*dt
         if pos_x >= 580:
@@ -806,43 +890,45 @@ class BossShooter(Enemy):
             self.direction = (1, 0)
             self.speed *= 1.2
         pos_x += self.direction[0]*self.speed*dt/4
-        self.rect.center = (pos_x, pos_y)
+        self.move_to((pos_x, pos_y))
 
         # definindo frequência de tiros do Boss Shooter
-        if self.shtcounter > 60:
+        if self.shtcounter > 960:  # um tiro a cada 960 ms
             self.shoot(lst)
             self.shtcounter = 0
-        self.shtcounter += 1
+        self.shtcounter += dt
 
         # mata o elemento se ele estiver fora dos limites da tela
         self.check_borders()
 
     def shoot(self, shoots):
         """Define os efeitos do tiro do Boss Shooter
-        :param shoots: tiros do Boss Shooter
-        :type shoots: list
+        :param shoots: tiros dos inimigos
+        :type shoots: projectiles.ProjectileStore
         """
         # som do tiro
         play_sound("Enemy Shoot.OGG")
-        # cria os tiros (laser), mudando a imagem padrão da classe Laser e o adiciona à lista de tiros
-        laser1 = Laser((self.rect.center[0], self.rect.top),
-                       image=f'tiroinimigoY.png', direction=(0, 1))
-        laser2 = Laser((self.rect.center[0], self.rect.top),
-                       image=f'tiroinimigoY.png', direction=(1, 1), angle=45)
-        laser3 = Laser((self.rect.center[0], self.rect.top),
-                       image=f'tiroinimigoY.png', direction=(-1, 1), angle=-45)
-        lst = [[laser1, pygame.sprite.RenderPlain(laser1)], [laser2, pygame.sprite.RenderPlain(
-            laser2)], [laser3, pygame.sprite.RenderPlain(laser3)]]
-        for laser in lst:
-            shoots.append(laser)
+        # cria os três tiros no conjunto de tiros dos inimigos, com a velocidade padrão de Laser
+        position = (self.rect.center[0], self.rect.top)
+        shoots.spawn(position, (0, .6), 'tiroinimigoY.png')
+        shoots.spawn(position, (.6, .6), 'tiroinimigoY.png', angle=45)
+        shoots.spawn(position, (-.6, .6), 'tiroinimigoY.png', angle=-45)
+
+    @classmethod
+    def variants(cls, color):
+        """ Retorna a imagem do boss e a dos seus tiros
+        """
+        return super().variants(color) + [("tiroinimigoY.png", None)]
 
 
 class BossBomb(Enemy):
     """ Classe do Boss Bomb
     Herda de Enemy.
     """
+    IMAGE = "boss3R.png"
+    SIZE = (150, 140)
 
-    def __init__(self, position, lives=50, speed=.35, image=None, size=(150, 140), color=None):
+    def __init__(self, position, lives=50, speed=.35, image=None, size=SIZE, color=None):
         """BossBomb construtor
         :param position: a posição inicial do elemento.
         :type position: list
@@ -859,7 +945,7 @@ class BossBomb(Enemy):
         """
 
         # define a imagem padrão
-        image = "Boss3R.png" if not image else image
+        image = self.IMAGE if not image else image
 
         # chama ElementSprite.__init__() e define valores iniciais de objetos lógicos
         super().__init__(position, lives, speed, image, size)
@@ -874,15 +960,16 @@ class BossBomb(Enemy):
         :type dt: int
         :param playerposx: posição do jogador
         :type playerposx: int
-        :param enemies: lista dos inimigos vivos
-        :type enemies: list
+        :param enemies: registro dos inimigos vivos
+        :type enemies: registry.EntityRegistry
         :param lst: lista de todos os tiros do shooter. Default None
         :type lst: list
         """
 
         # posição e movimento, fixando em y=50 definindo sua movimentação de um lado para o outro da tela
-        pos_x = self.rect.center[0]
-        pos_y = self.rect.center[1]
+        pos_x = self.pos[0]
+        pos_y = self.pos[1]
+        prev_x, prev_y = self.pos
         if (pos_x <= 60) and (pos_y >= 580):
             self.direction = (0, -0.71)
         elif (pos_x <= 60) and (pos_y <= 60):
@@ -893,29 +980,35 @@ class BossBomb(Enemy):
             self.direction = (0, 1)
         pos_x += self.direction[0]*self.speed*dt/2
         pos_y += self.direction[1]*self.speed*dt/2
-        self.rect.center = (pos_x, pos_y)
+        self.move_to((pos_x, pos_y))
 
-        if (pos_x > 318 and pos_x < 322) or (pos_y > 318 and pos_y < 322):
-            #print("in range")
+        # explode ao cruzar o meio da tela: uma vez por travessia, qualquer que seja a duração do passo
+        if (prev_x < 320) != (pos_x < 320) or (prev_y < 320) != (pos_y < 320):
             self.explode(lst2)
 
     def explode(self, explosions):
-        explosion1 = Explosion(
+        explosion1 = acquire(Explosion,
             (320, self.rect.center[1]), type='1', color='R', hits=[self])
-        explosion2 = Explosion(
+        explosion2 = acquire(Explosion,
             (self.rect.center[0], 320), type='2', color='R', hits=[self])
-        explosions.append(
-            [explosion1, pygame.sprite.RenderPlain(explosion1)])
-        explosions.append(
-            [explosion2, pygame.sprite.RenderPlain(explosion2)])
+        explosions.add(explosion1)
+        explosions.add(explosion2)
+
+    @classmethod
+    def variants(cls, color):
+        """ Retorna a imagem do boss e as das suas explosões
+        """
+        return super().variants(color) + Explosion.variants('R')
 
 
 class BossShield(Enemy):
     """ Classe do Boss Shield
     Herda de Enemy.
     """
+    IMAGE = "boss4B.png"
+    SIZE = (145, 140)
 
-    def __init__(self, position, lives=50, speed=.35, image=None, size=(145, 140), color=None):
+    def __init__(self, position, lives=50, speed=.35, image=None, size=SIZE, color=None):
         """Boss Shield construtor
         :param position: a posição inicial do elemento.
         :type position: list
@@ -932,7 +1025,7 @@ class BossShield(Enemy):
         """
 
         # define a imagem padrão
-        image = "boss4B.png" if not image else image
+        image = self.IMAGE if not image else image
 
         # chama ElementSprite.__init__() e define valores iniciais de objetos lógicos
         super().__init__(position, lives, speed, image, size)
@@ -947,36 +1040,38 @@ class BossShield(Enemy):
         :type dt: int
         :param playerposx: posição do jogador
         :type playerposx: int
-        :param enemies: lista dos inimigos vivos
-        :type enemies: list
+        :param enemies: registro dos inimigos vivos
+        :type enemies: registry.EntityRegistry
         :param lst: lista de todos os tiros do shooter. Default None
         :type lst: list
         """
 
         # posições do Boss Shield
-        pos_x = self.rect.center[0]
-        pos_y = self.rect.center[1]
+        pos_x = self.pos[0]
+        pos_y = self.pos[1]
 
         # movimentação do Boss Shield seguindo o jogador
         if pos_y < 200:
             pos_y += self.speed*dt
-        if playerposx - self.rect.center[0] > 0:
-            pos_x = self.rect.center[0] + 1 * self.speed*dt/4
+        if playerposx - self.pos[0] > 0:
+            pos_x = self.pos[0] + 1 * self.speed*dt/4
         else:
-            pos_x = self.rect.center[0] - 1 * self.speed*dt/4
+            pos_x = self.pos[0] - 1 * self.speed*dt/4
         if pos_x < 0:
             pos_x = 640
         elif pos_x > 640:
             pos_x = 0
-        self.rect.center = (pos_x, pos_y)
+        self.move_to((pos_x, pos_y))
 
 
 class Trojan(Enemy):
     """ Classe Trojan
     Herda de Enemy
     """
+    IMAGE = "troia1.png"
+    SIZE = (640, 160)
 
-    def __init__(self, position, lives=200, speed=.35, image=None, size=(640, 160), color=None):
+    def __init__(self, position, lives=200, speed=.35, image=None, size=SIZE, color=None, rng=None):
         """ Trojan construtor.
         :param position: a posição inicial do elemento.
         :type position: lista
@@ -988,21 +1083,26 @@ class Trojan(Enemy):
         :type image: string
         :param new_size: o tamanho desejado do sprite. Veja ElementSprite.scale()
         :type new_size: lista
+        :param rng: gerador aleatório da sessão. Default None (módulo random)
+        :type rng: random.Random
         """
 
         # define a imagem padrão
-        image = "troia1.png" if not image else image
+        image = self.IMAGE if not image else image
 
         # chama ElementSprite.__init__() e define valores iniciais de objetos lógicos
         super().__init__(position, lives, speed, image, size)
         self.direction = (1, 0)
         self.shtcounter = 0
         self.color = color
+        self.rng = rng or random
         self.shield = True
         self.id = "boss"
-        self.sprite = 1
-        self.spr_counter = 0
         self.size = size
+        # clipes das duas fases do Trojan, carregados uma única vez
+        self.clips = [AnimationClip(["troia1.png", "troia2.png"], size, frame_time=176),
+                      AnimationClip(["troia3.png", "troia4.png"], size, frame_time=176)]
+        self.clip = self.clips[0]
 
     def update(self, dt, playerposx, enemies, lst=None, lst2=None):
         """ Atualia a posição do Trojan
@@ -1011,54 +1111,52 @@ class Trojan(Enemy):
         """
 
         pos_x = 320
-        pos_y = self.rect.center[1]
+        pos_y = self.pos[1]
         if pos_y < 80:  # 640x160
             pos_y += self.speed*dt  # po
-        self.rect.center = (pos_x, pos_y)
+        self.move_to((pos_x, pos_y))
 
         # definindo frequência de tiros do Trojan
             
-        if self.shtcounter > 20:
+        if self.shtcounter > 320:  # intervalo base de 320 ms, encurtado conforme o Trojan perde vidas
             self.shoot(lst)
             self.shtcounter = 0
         if self.lives > 150:
-            self.shtcounter += 1
+            self.shtcounter += dt
         elif self.lives > 100:
-            self.shtcounter += 2
+            self.shtcounter += 2 * dt
         elif self.lives > 50:
-            self.shtcounter += 3
+            self.shtcounter += 3 * dt
         else:
-            self.shtcounter += 4
-        self.animate()
+            self.shtcounter += 4 * dt
+        self.animate(dt)
 
     def shoot(self, shoots):
         """Define os efeitos do tiro do Trojan
-        :param shoots: tiros do Trojan
-        :type shoots: list
+        :param shoots: tiros dos inimigos
+        :type shoots: projectiles.ProjectileStore
         """
         # som do tiro
         play_sound("Enemy Shoot.OGG")
-        # cria o tiro (laser), mudando a imagem padrão da classe Laser e o adiciona à lista de tiros
-        laser = Laser((random.randint(0, 640), self.rect.top),
-                      image=f'tiroinimigo{self.color}.png', direction=(0, 1))
-        shoots.append([laser, pygame.sprite.RenderPlain(laser)])
-
-    def animate(self):
-        if self.lives > 100:
-            if self.spr_counter < 10:
-                self.spr_counter += 1
-            else:
-                self.set_image(f'troia{self.sprite}.png', self.size)
-                self.sprite += 1
-                if self.sprite > 2:
-                    self.sprite = 1
-                self.spr_counter = 0
-        else:
-            if self.spr_counter < 10:
-                self.spr_counter += 1
-            else:
-                self.set_image(f'troia{self.sprite}.png', self.size)
-                self.sprite += 1
-                if self.sprite > 4:
-                    self.sprite = 3
-                self.spr_counter = 0
+        # cria o tiro no conjunto de tiros dos inimigos, com a velocidade padrão de Laser
+        shoots.spawn((self.rng.randint(0, 640), self.rect.top),
+                     (0, .6), f'tiroinimigo{self.color}.png')
+
+    def animate(self, dt):
+        """ Avança a animação do Trojan, trocando de clipe quando ele perde metade das vidas
+        :param dt: variação do tempo
+        :type dt: int
+        """
+        clip = self.clips[0] if self.lives > 100 else self.clips[1]
+        if clip is not self.clip:
+            self.clip = clip
+            clip.reset()
+        clip.update(dt)
+        self.image = clip.image
+
+    @classmethod
+    def variants(cls, color):
+        """ Retorna os quadros das animações do Trojan e a imagem do seu tiro
+        """
+        frames = [(f"troia{frame}.png", cls.SIZE) for frame in range(1, 5)]
+        return frames + [(f"tiroinimigo{color}.png", None)]
@@ -0,0 +1,33 @@
+class HudText:
+    """ Texto do HUD que só é rasterizado de novo quando muda
+    Font.render é uma das chamadas mais caras do quadro, e os textos do HUD (placar, bombas, vidas) mudam
+    poucas vezes por segundo. Cada HudText guarda a última superfície gerada e a reaproveita enquanto o texto
+    e a cor forem os mesmos
+    """
+
+    def __init__(self, font, antialias=True):
+        """ HudText construtor
+        :param font: fonte do texto
+        :type font: pygame.font.Font
+        :param antialias: define se o texto é suavizado
+        :type antialias: boolean. Default True
+        """
+        self.font = font
+        self.antialias = antialias
+        self.surface = None
+        self._key = None  # (texto, cor) da superfície atual
+        self.renders = 0  # quantidade de vezes que o texto foi rasterizado
+
+    def render(self, text, color):
+        """ Retorna a superfície do texto, rasterizando-o apenas se o texto ou a cor mudaram
+        :param text: texto
+        :type text: string
+        :param color: cor do texto
+        :type color: tuple
+        """
+        key = (text, color)
+        if key != self._key:
+            self.surface = self.font.render(text, self.antialias, color)
+            self._key = key
+            self.renders += 1
+        return self.surface
@@ -0,0 +1,106 @@
+from typing import NamedTuple
+from collections import Counter
+import pygame
+from pygame.locals import (KEYDOWN, KEYUP, QUIT, K_LEFT, K_RIGHT, K_UP, K_DOWN,
+                           K_LCTRL, K_SPACE, K_ESCAPE, K_F2, K_F3)
+
+HELD_KEYS = (K_LEFT, K_RIGHT, K_UP, K_DOWN)  # teclas lidas enquanto estão seguradas
+PRESSED_KEYS = (K_LCTRL, K_SPACE, K_ESCAPE, K_F2, K_F3)  # teclas da simulação lidas no momento em que são apertadas
+
+
+class InputSnapshot(NamedTuple):
+    """ Entradas de um passo de simulação, imutáveis
+    Reúne todos os eventos do passo: as teclas seguradas ao fim do passo e as teclas apertadas e soltas
+    durante ele. Uma tecla apertada duas vezes no mesmo passo conta uma vez só
+    """
+    tick: int  # passo em que as entradas foram lidas
+    held: frozenset = frozenset()  # teclas seguradas
+    pressed: frozenset = frozenset()  # teclas apertadas no passo
+    released: frozenset = frozenset()  # teclas soltas no passo
+    quit: bool = False  # pedido de fechar a janela
+
+    def is_held(self, key):
+        """ Retorna se a tecla está segurada
+        :param key: constante da tecla
+        :type key: int
+        """
+        return key in self.held
+
+    def was_pressed(self, key):
+        """ Retorna se a tecla foi apertada no passo
+        :param key: constante da tecla
+        :type key: int
+        """
+        return key in self.pressed
+
+
+class InputLayer:
+    """ Lê as entradas do jogo a cada passo
+    poll() esvazia a fila de eventos do pygame inteira e a resume em um InputSnapshot, de modo que nenhuma tecla
+    apertada espera passos na fila. Também mede quantos eventos chegam por passo e a latência, em passos, entre o
+    passo em que uma tecla foi lida da fila e o passo em que a ação que ela pediu aconteceu (ver acted())
+    """
+
+    def __init__(self):
+        """ InputLayer construtor
+        """
+        self.held = set()  # teclas seguradas, acompanhadas pelos eventos recebidos
+        self.events = 0  # eventos lidos
+        self.max_events = 0  # maior quantidade de eventos lidos em um único passo
+        self.stamps = {}  # tecla -> passo em que o último aperto foi lido da fila
+        self.latency = Counter()  # latência, em passos -> quantidade de ações
+
+    def poll(self, tick):
+        """ Esvazia a fila de eventos e retorna as entradas do passo
+        As teclas seguradas vêm do estado real do teclado
+        :param tick: passo atual
+        :type tick: int
+        """
+        snapshot = self.feed(tick, pygame.event.get())
+        pressed = pygame.key.get_pressed()
+        self.held = {key for key in HELD_KEYS if pressed[key]}
+        return snapshot._replace(held=frozenset(self.held))
+
+    def feed(self, tick, events):
+        """ Resume uma lista de eventos nas entradas do passo
+        As teclas seguradas são acompanhadas pelos próprios eventos (KEYDOWN e KEYUP)
+        :param tick: passo atual
+        :type tick: int
+        :param events: eventos recebidos no passo
+        :type events: list
+        """
+        pressed, released, quit = set(), set(), False
+        for event in events:
+            if event.type == KEYDOWN:
+                pressed.add(event.key)
+                self.stamps[event.key] = tick
+                if event.key in HELD_KEYS:
+                    self.held.add(event.key)
+            elif event.type == KEYUP:
+                released.add(event.key)
+                self.held.discard(event.key)
+            elif event.type == QUIT:
+                quit = True
+        self.events += len(events)
+        self.max_events = max(self.max_events, len(events))
+        return InputSnapshot(tick, frozenset(self.held), frozenset(pressed), frozenset(released), quit)
+
+    def acted(self, key, tick):
+        """ Registra uma ação que acabou de acontecer, medida a partir do passo em que a tecla que a pediu foi
+        lida. Deve ser chamado onde a ação de fato acontece (um tiro disparado, uma bomba usada), e não a cada
+        tecla apertada. Cada aperto é medido uma vez só
+        :param key: tecla que pediu a ação
+        :type key: int
+        :param tick: passo em que a ação aconteceu
+        :type tick: int
+        """
+        if key in self.stamps:
+            self.latency[tick - self.stamps.pop(key)] += 1
+
+    def stats(self):
+        """ Retorna os eventos lidos e a latência das ações
+        """
+        actions = sum(self.latency.values())
+        return {"events": self.events, "max_events_per_tick": self.max_events, "actions": actions,
+                "mean_latency_ticks": sum(ticks * n for ticks, n in self.latency.items()) / actions if actions else 0,
+                "max_latency_ticks": max(self.latency, default=0)}
@@ -0,0 +1,118 @@
+import json
+from typing import NamedTuple
+from elements import (Spider, Shooter, Bomb, Shield, PowerUp, Explosion,
+                      BossSpider, BossShooter, BossBomb, BossShield, Trojan)
+
+# Definição das fases. Os dados ficam em levels.json; cada fase é compilada, no início, em uma linha do tempo
+# ordenada com todos os inimigos e power ups que vão aparecer, e o spawn só avança um cursor por ela.
+ENEMIES = {"spider": Spider, "shooter": Shooter, "bomb": Bomb, "shield": Shield}  # tipo no arquivo -> classe
+BOSSES = (BossSpider, BossShooter, BossBomb, BossShield, Trojan)  # boss de cada fase; as demais não têm boss
+
+
+class SpawnEntry(NamedTuple):
+    """ Elemento da linha do tempo de uma fase
+    """
+    time: float  # instante, em ms desde o início da fase, em que o elemento aparece
+    kind: type  # classe do elemento
+    x: int
+    y: int
+    color: str = None  # cor dos inimigos
+    power: int = None  # tipo dos power ups
+
+
+def load_levels(path='levels.json'):
+    """ Lê o arquivo de definição das fases
+    Retorna um dicionário novo a cada chamada, que pode ser alterado (pelo balanceamento, por exemplo)
+    :param path: caminho do arquivo
+    :type path: string
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+def compile_level(levels, level, color, rng):
+    """ Compila uma fase em sua linha do tempo, ordenada pelo instante de cada elemento
+    :param levels: definição das fases, como retornada por load_levels()
+    :type levels: dict
+    :param level: índice da fase
+    :type level: int
+    :param color: cor dos inimigos da fase
+    :type color: string
+    :param rng: gerador aleatório da sessão
+    :type rng: random.Random
+    """
+    definition = levels["levels"][level]
+    spawn_y = levels["spawn_y"]
+    duration = levels["duration"]
+    # cada tipo aparece na onda tantas vezes quanto o seu peso
+    wave = [name for name, weight in definition["waves"].items() for _ in range(weight)]
+    entries = []
+    time = definition["first_enemy"]
+    while time < duration:
+        name = rng.choice(wave)
+        entries.append(SpawnEntry(time, ENEMIES[name], rng.randint(0, 640), spawn_y[name], color=color))
+        time += definition["enemy_interval"]
+    time = levels["power_up_interval"]
+    while time < duration:
+        entries.append(SpawnEntry(time, PowerUp, rng.randint(0, 640), spawn_y["power_up"], power=rng.randint(1, 4)))
+        time += levels["power_up_interval"]
+    entries.sort(key=lambda entry: entry.time)
+    return SpawnTimeline(entries, duration)
+
+
+def level_variants(levels, level, color):
+    """ Retorna as variantes (imagem, tamanho) que os elementos de uma fase podem desenhar: os inimigos das
+    ondas, o boss, os power ups e as explosões das bombas
+    :param levels: definição das fases, como retornada por load_levels()
+    :type levels: dict
+    :param level: índice da fase
+    :type level: int
+    :param color: cor dos inimigos da fase
+    :type color: string
+    """
+    kinds = [ENEMIES[name] for name, weight in levels["levels"][level]["waves"].items() if weight]
+    kinds += [PowerUp, Explosion] + list(BOSSES[level:level + 1])
+    return [variant for kind in kinds for variant in kind.variants(color)]
+
+
+class SpawnTimeline:
+    """ Linha do tempo compilada de uma fase
+    advance() avança o relógio da fase e retorna os elementos que apareceram no intervalo. Ao fim da linha do
+    tempo, ela recomeça do início (as fases só terminam quando o boss é derrotado)
+    """
+
+    def __init__(self, entries, duration):
+        """ SpawnTimeline construtor
+        :param entries: elementos da fase, ordenados pelo instante
+        :type entries: list
+        :param duration: duração da linha do tempo, em ms
+        :type duration: float
+        """
+        self.entries = entries
+        self.times = [entry.time for entry in entries]
+        self.duration = duration
+        self.time = 0  # relógio da fase, em ms, dentro da linha do tempo
+        self.cursor = 0  # próximo elemento a aparecer
+        self.loops = 0  # voltas completas na linha do tempo
+
+    def __len__(self):
+        return len(self.entries)
+
+    def advance(self, dt):
+        """ Avança o relógio da fase e retorna os elementos que aparecem até o novo instante
+        :param dt: variação do tempo, em ms
+        :type dt: float
+        """
+        self.time += dt
+        due = []
+        while self.time >= self.duration:
+            due += self.entries[self.cursor:]
+            self.time -= self.duration
+            self.cursor = 0
+            self.loops += 1
+        # normalmente só uma comparação por passo: o próximo elemento ainda não chegou
+        times = self.times
+        while self.cursor < len(times) and times[self.cursor] <= self.time:
+            due.append(self.entries[self.cursor])
+            self.cursor += 1
+        return due
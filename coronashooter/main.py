@@ -6,71 +6,95 @@ from pygame.locals import (DOUBLEBUF,
                            K_LEFT,
                            K_RIGHT,
                            QUIT,
-                           K_ESCAPE, K_UP, K_DOWN, K_RCTRL, K_LCTRL, K_SPACE
+                           K_ESCAPE, K_UP, K_DOWN, K_RCTRL, K_LCTRL, K_SPACE,
+                           K_F2, K_F3, K_F4, K_F5
                            )
-from background import Background
+from background import get_background
 from elements import *
+from resources import surface_cache, get_font, manager, MEMORY_BUDGET
+from audio import play_sound, voices
+from music import MusicController
+from animation import AnimationClip
+from preloader import Preloader
+from render import RenderLayers, DirtyRects, interpolate, snapshot
+from spatial import SpatialHash
+from collision import MaskCollider
+from projectiles import ProjectileStore
+from pool import acquire, recycle
+from registry import EntityRegistry
+from replay import InputRecording
+from inputs import InputLayer, HELD_KEYS
+from overlay import ProfilerOverlay
+from hud import HudText
+from levels import load_levels, compile_level, level_variants
 import random
 import time
 import os
-import math
 
-_sound_library = {}  # biblioteca de efeitos sonoros
-
-
-def play_sound(path):  # função que toca os efeitos sonoros
-    """Função que toca efeitos sonoros presentes na pasta /songs
-        param path: nome do arquivo do efeito sonoro
-        type path: string
-    """
-    global _sound_library
-    sound = _sound_library.get(path)
-    if sound == None:
-        # Corrige path para qualquer OS
-        correctpath = os.path.join('songs', path)
-        sound = pygame.mixer.Sound(correctpath)
-        _sound_library[path] = sound
-    sound.play()
+TICK_RATE = 62.5  # passos de simulação por segundo (16 ms por passo, o ritmo original do jogo)
+MAX_FPS = 144  # limite de quadros desenhados por segundo
+MAX_FRAME_TIME = 250  # tempo máximo, em ms, simulado por quadro (evita a espiral da morte após travamentos)
+# imagens do menu e dos créditos, fixadas no ResourceManager durante todo o jogo
+MENU_IMAGES = ["menu.png", "nomes.png", "fase1.png", "fase2.png", "fase3.png", "fase4.png", "fase5.png",
+               "zen.png", "creditos.png", "sair.png", "voltar.png"]
 
 
 class Game:
-    def __init__(self, size=(640, 640), fullscreen=False):
+    def __init__(self, size=(640, 640), fullscreen=False, dirty_rects=False, tick_rate=TICK_RATE, max_fps=MAX_FPS,
+                 headless=False, seed=None, record=None, memory_budget=MEMORY_BUDGET, precise_collision=False):
         """ Cria o objeto que irá controlar o jogo
 
         :param size: tamanho desejado da tela do jogo
         :type size: tuple
         :param fullscreen: define se o jogo terá tela cheia ou não
         :type fullscreen: boolean. Default False
+        :param dirty_rects: define se o jogo começa no modo de renderização por regiões alteradas (F2 alterna)
+        :type dirty_rects: boolean. Default False
+        :param tick_rate: passos de simulação por segundo, independentes da taxa de quadros
+        :type tick_rate: float. Default TICK_RATE
+        :param max_fps: limite de quadros desenhados por segundo (0 para não limitar)
+        :type max_fps: int. Default MAX_FPS
+        :param headless: define se o jogo roda sem janela e sem som (drivers dummy do SDL), sem entrar no loop
+            principal. A simulação é então controlada por step() e run()
+        :type headless: boolean. Default False
+        :param seed: semente do gerador aleatório da sessão. Default None (sorteada)
+        :type seed: int
+        :param record: caminho do arquivo em que as entradas da sessão são gravadas ao sair (ver replay.py)
+        :type record: string
+        :param memory_budget: memória, em bytes, que os recursos carregados podem ocupar (ver ResourceManager)
+        :type memory_budget: int
+        :param precise_collision: define se as colisões que passam no teste de rects são confirmadas pelas
+            máscaras de pixels das imagens (ver MaskCollider)
+        :type precise_collision: boolean. Default False
         """
+        self.record = record
         self.elements = {}  # cria o dicionário com todas os elementos do jogo
-        self.enemies = []  # cria a lista de todos os inimigos
-        self.shoots = []  # cria a lista com os projécteis do jogador
+        self.enemies = EntityRegistry()  # cria o registro de todos os inimigos
+        self.shoots = ProjectileStore()  # cria o conjunto com os projécteis do jogador
         self.blocks = []
-        self.enemy_shoots = []  # cria a lista com todos os projécteis inimigos
-        self.power_ups = []  # cria a lista de power-ups
-        self.explosions = []  # cria a lista de explosões
-        self.enemy_counter = 45  # contador usado para a lógica de spawn de inimigos
-        self.power_up_counter = 0  # contador usado para a lógica de spawn de power-ups
-        # timer de colisão para que o jogador não tome dano várias vezes de uma mesma colisão
-        self.colcounter = 0
-        self.start = False
-        self.incredits = False
-        self.color = 'G'  # define a cor dos elementos da primeira fase
-        # lista ordenada de cores de cada fase
-        self.color_list = ['G', 'Y', 'R', 'B', 'P']
-        self.color_list.append(random.choice(self.color_list))
-        self.level = 0  # define a fase inicial
-        self.last_score = 0
-        # lista de dicionários para definir a presença dos inimigos nas fases
-        self.waves = [{"spider": 1, "shooter": 0, "bomb": 0, "shield": 0}, {"spider": 2, "shooter": 1, "bomb": 0, "shield": 0}, {
-            "spider": 2, "shooter": 2, "bomb": 1, "shield": 0}, {"spider": 4, "shooter": 3, "bomb": 1, "shield": 2}, {
-            "spider": 3, "shooter": 4, "bomb": 2, "shield": 2}, {"spider": 2, "shooter": 4, "bomb": 2, "shield": 2}, {
-            "spider": 2, "shooter": 4, "bomb": 2, "shield": 3}]
-        self.set_current_wave()
-        self.scoreboss = 0
-        self.bosscounter = 0
-        self.true_score = 0
-        self.temp_score = 0
+        self.enemy_shoots = ProjectileStore()  # cria o conjunto com todos os projécteis inimigos
+        self.power_ups = EntityRegistry()  # cria o registro de power-ups
+        self.explosions = EntityRegistry()  # cria o registro de explosões
+        # camadas de renderização, na ordem em que são desenhadas
+        self.layers = RenderLayers(("explosions", self.explosions), ("enemies", self.enemies),
+                                   ("shoots", self.shoots), ("enemy_shoots", self.enemy_shoots),
+                                   ("power_ups", self.power_ups), ("blocks", self.blocks))
+        self.dirty = DirtyRects(dirty_rects)  # controle do modo de renderização por regiões
+        self.show_frame_time = False  # mostra o tempo de cada quadro (F3 alterna)
+        self.frame_times = []  # tempos, em ms, dos últimos quadros
+        self.tick_rate = tick_rate
+        self.dt = 1000 / tick_rate  # duração, em ms, de cada passo de simulação
+        self.max_fps = max_fps
+        self.enemy_grid = SpatialHash()  # grade dos inimigos, usada na detecção de colisões
+        # teste fino por máscaras; as máscaras são criadas aqui e junto com as imagens, nunca durante as colisões
+        self.collider = MaskCollider(precise_collision)
+        self.collision_stats = {"tested": 0, "hits": 0}  # pares testados e colisões do último quadro
+        self.headless = headless
+        self.input = InputLayer()  # lê a fila de eventos inteira a cada passo
+        if headless:
+            # os drivers precisam ser escolhidos antes de pygame.init()
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
         pygame.init()  # inicia o módulo pygame
 
         # seta as flags de renderização
@@ -79,18 +103,86 @@ class Game:
         # cria o display
         self.screen = pygame.display.set_mode(size, flags)
 
+        # memória que os recursos carregados podem ocupar
+        manager.budget = memory_budget
+        manager.evict()
+
         # cria o plano de fundo
-        self.background = Background(f'menu.png')
+        self.set_background(f'menu.png')
 
         # seta o título da janela
         pygame.display.set_caption('TroPHY.exe')
         pygame.mouse.set_visible(0)  # deixa o cursor do mouse invisível
-        self.font = pygame.font.Font(os.path.join("fonts", 'Pixels.ttf'), 72)
-        self.font_love = pygame.font.Font(
-            os.path.join("fonts", 'pixel-love.ttf'), 48)  # configura a fonte para displays
-        self.run = True
+        # inicia o carregamento em segundo plano dos recursos do manifesto
+        self.preloader = Preloader()
+        self.preloader.start()
+        # o menu, o Player, as fontes e os efeitos sonoros podem ser usados a qualquer momento e nunca são
+        # descartados; os arquivos de cada fase são fixados por set_scene(), e a música tocando pelo
+        # MusicController
+        for name in MENU_IMAGES + [image for image, size in Player.variants(None)]:
+            manager.acquire(name)
+        for kind, name, arg in self.preloader.jobs:
+            if kind in ("font", "sound"):
+                manager.acquire(name)
+        self.scene = set()  # arquivos fixados para a cena atual
+        self.scene_variants = []  # variantes (imagem, tamanho) que a cena atual pode desenhar
+        self.font = get_font('Pixels.ttf', 72)
+        self.font_love = get_font('pixel-love.ttf', 48)  # configura a fonte para displays
+        self.font_small = get_font('Pixels.ttf', 32)
+        # textos do HUD, rasterizados só quando mudam
+        self.hud = {"score": HudText(self.font), "bombs": HudText(self.font),
+                    "lives": HudText(self.font_love), "last_score": HudText(self.font)}
+        self.overlay = ProfilerOverlay(self)  # tempo de cada fase do quadro (F4 alterna, F5 exporta CSV)
+        # músicas em streaming, com transição suave; o jogo sem janela (simulações, replays) não toca música
+        self.music = MusicController(enabled=not headless)
+        self.reset(seed)  # inicia o jogo
+        if not headless:
+            self.loop()  # roda o jogo
+
+    def reset(self, seed=None):
+        """ Começa uma nova sessão, no menu, sem recriar o display nem carregar de novo os recursos
+        As simulações em lote (balance.py) jogam assim várias sessões com o mesmo Game
+        :param seed: semente do gerador aleatório da sessão. Default None (sorteada)
+        :type seed: int
+        """
+        # toda a aleatoriedade da sessão vem deste gerador; com a mesma semente e as mesmas entradas
+        # (ver replay.py), a sessão se repete exatamente
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.recording = InputRecording(self.seed, self.tick_rate)
+        # tempo, em ms, de invulnerabilidade para que o jogador não tome dano várias vezes de uma mesma colisão
+        self.colcounter = 0
+        self.start = False
+        self.incredits = False
+        self.color = 'G'  # define a cor dos elementos da primeira fase
+        # lista ordenada de cores de cada fase
+        self.color_list = ['G', 'Y', 'R', 'B', 'P']
+        self.color_list.append(self.rng.choice(self.color_list))
+        self.level = 0  # define a fase inicial
+        self.last_score = 0
+        # definição das fases (ondas de inimigos e ritmo de spawn), lida de levels.json
+        self.levels = load_levels()
+        self.timeline = None  # linha do tempo de spawn da fase, compilada em start_game()
+        self.scoreboss = 0
+        self.bosscounter = 0
+        self.true_score = 0
+        self.temp_score = 0
+        self.boss_image = None  # imagem do boss em jogo
+        self.ticks = 0  # passos de simulação executados
+        self.running = True
+        # esvazia os elementos da sessão anterior
+        self.discard(self.enemies)
+        self.discard(self.explosions)
+        self.power_ups.clear()
+        self.shoots.clear()
+        self.enemy_shoots.clear()
+        self.blocks.clear()
 
-        self.loop()  # roda o jogo
+        self.player = Player([305, 536], 3)  # posição inicial do player
+        self.elements['player'] = pygame.sprite.RenderPlain(
+            self.player)  # prepara o sprite do Player
+        self.overlay.refresh()  # o overlay passa a medir o novo Player
+        self.menu()
 
     def update_elements(self, dt):
         """ Atualiza diversos aspectos do jogo
@@ -101,104 +193,173 @@ class Game:
 
         self.background.update(dt)
         for enemy in self.enemies:  # atualiza inimigos pela lista de inimigos vivos
-            enemy[0].update(dt, self.player.rect.center[0],
-                            self.enemies, lst=self.enemy_shoots, lst2=self.explosions)
-        for shoot in self.shoots:  # atualiza tiros do player pela lista desses
-            shoot[0].update(dt)
-        for shoot in self.enemy_shoots:  # atualiza tiros dos inimigos pela lista desses
-            shoot[0].update(dt)
+            enemy.update(dt, self.player.rect.center[0],
+                         self.enemies, lst=self.enemy_shoots, lst2=self.explosions)
+        # move todos os tiros de uma vez, eliminando os que saíram da tela
+        self.shoots.update(dt, self.screen.get_rect())
+        self.enemy_shoots.update(dt, self.screen.get_rect())
         for power_up in self.power_ups:  # atualiza power ups pela lista desses
-            power_up[0].update(dt)
+            power_up.update(dt)
         for explosion in self.explosions:  # atualiza explosoes pela lista dessas
-            explosion[0].update(dt)
+            explosion.update(dt)
 
-    def draw_elements(self):
+    def draw_elements(self, alpha=1):
         """ Desenha elementos na tela
+        :param alpha: fração do passo de simulação já decorrida, usada para interpolar as posições
+        :type alpha: float. Default 1
         """
-        self.background.draw(self.screen)
-        for explosion in self.explosions:  # desenha explosoes
-            explosion[1].draw(self.screen)
-        for enemy in self.enemies:  # desenha inimigos
-            enemy[1].draw(self.screen)
-        for shoot in self.shoots:  # desenha tiros do player
-            shoot[1].draw(self.screen)
-        for shoot in self.enemy_shoots:  # desenha tiros dos inimigos
-            shoot[1].draw(self.screen)
-        for power_up in self.power_ups:  # desenha power ups
-            power_up[1].draw(self.screen)
-        for block in self.blocks:  # desenha power ups
-            block[1].draw(self.screen)
+        self.background.interpolate(alpha)
+        self.dirty.begin(self.screen, self.background)
+        # desenha cada categoria de entidades de uma vez
+        self.dirty.extend(self.layers.draw(self.screen, self.dirty.enabled, alpha))
         for element in self.elements.values():
-            element.draw(self.screen)
+            for sprite in element:
+                self.dirty.add(self.screen.blit(sprite.image, interpolate(sprite, alpha)))
         if self.player.shield:  # desenha shield se houver
-            self.player.shield[1].draw(self.screen)
+            self.dirty.add(self.screen.blit(
+                self.player.shield.image, interpolate(self.player.shield, alpha)))
+
+    def draw_frame_time(self):
+        """ Desenha o tempo médio dos últimos quadros e o modo de renderização
+        """
+        if not self.frame_times:
+            return
+        mean = sum(self.frame_times) / len(self.frame_times)
+        mode = "dirty" if self.dirty.enabled else "flip"
+        text = self.font_small.render(f"{mean:.2f} ms {mode}", 1, (255, 255, 255), (0, 0, 0))
+        self.dirty.add(self.screen.blit(
+            text, (self.screen.get_width() - text.get_width() - 5, 5)))
+
+    def set_background(self, image):
+        """ Troca o fundo do jogo
+        :param image: a imagem do fundo
+        :type image: string
+        """
+        self.background = get_background(image)
+
+    def set_scene(self, variants):
+        """ Fixa no ResourceManager os arquivos que a cena pode desenhar, no lugar dos da cena anterior, e pede ao
+        Preloader os que já foram descartados. Assim nenhuma imagem (nem máscara) é criada durante a partida
+        :param variants: pares (imagem, tamanho) que a cena pode desenhar
+        :type variants: list
+        """
+        images = {image for image, size in variants}
+        for image in images:
+            manager.acquire(image)
+        for image in self.scene:
+            manager.release(image)
+        self.scene = images
+        self.scene_variants = list(variants)
+        self.preloader.request(images)
+        if self.preloader.is_done():
+            self.warm_scene()
+
+    def level_scene(self, level):
+        """ Retorna as variantes (imagem, tamanho) que uma fase pode desenhar: as dos seus elementos e o fundo
+        :param level: índice da fase
+        :type level: int
+        """
+        color = self.color_list[level]
+        return level_variants(self.levels, level, color) + [(f"fundo{color}.png", None)]
+
+    def warm_scene(self):
+        """ Cria as variantes da cena, com suas máscaras, quando os seus arquivos estão carregados
+        """
+        # pré-calcula as rotações dos tiros, para que tiros diagonais custem o mesmo que tiros retos
+        surface_cache.rotation_table("tironave1.png")
+        for color in set(self.color_list):
+            surface_cache.rotation_table(f"tiroinimigo{color}.png")
+        self.collider.warm(Player.variants(self.color) + self.scene_variants)
+
+    def release_boss(self):
+        """ Esquece a imagem do boss que saiu de jogo
+        """
+        self.boss_image = None
 
     def summon_boss(self):
         if self.bosscounter == 0:
             enemy = BossSpider((320, 10), color=self.color)
-            self.enemies.append([enemy, pygame.sprite.RenderPlain(enemy)])
+            self.enemies.add(enemy)
         elif self.bosscounter == 1:
             enemy = BossShooter((320, 10), color=self.color)
-            self.enemies.append([enemy, pygame.sprite.RenderPlain(enemy)])
+            self.enemies.add(enemy)
         elif self.bosscounter == 2:
             enemy = BossBomb((320, 60), color=self.color)
-            self.enemies.append([enemy, pygame.sprite.RenderPlain(enemy)])
+            self.enemies.add(enemy)
         elif self.bosscounter == 3:
             enemy = BossShield((320, 10), color=self.color)
-            self.enemies.append([enemy, pygame.sprite.RenderPlain(enemy)])
+            self.enemies.add(enemy)
         elif self.bosscounter == 4:
-            enemy = Trojan((320, 10), color=self.color)
-            self.enemies.append([enemy, pygame.sprite.RenderPlain(enemy)])
-
-    def handle_events(self, event, dt=1000):
-        """ Lida com os eventos na fila de eventos
+            enemy = Trojan((320, 10), color=self.color, rng=self.rng)
+            self.enemies.add(enemy)
+        else:
+            return
+        self.boss_image = enemy.image_name
+        # a próxima fase começa quando o boss morre: seus arquivos são carregados enquanto ele vive
+        if self.level + 1 < len(self.levels["levels"]):
+            self.set_scene(self.level_scene(self.level) + self.level_scene(self.level + 1))
+
+    def handle_events(self, inputs, dt=1000):
+        """ Lida com as entradas do passo
         Na prática, diz respeito ao controle do Player pelo usuário e pelo quit no jogo
+        :param inputs: entradas do passo
+        :type inputs: inputs.InputSnapshot
+        """
+        # lida com a janela de quit ("x" no canto superior direito) e com a saída pelo "esc" do teclado
+        if inputs.quit or inputs.was_pressed(K_ESCAPE):
+            self.running = False
+        if inputs.was_pressed(K_F2):  # alterna o modo de renderização por regiões alteradas
+            self.dirty.toggle()
+        if inputs.was_pressed(K_F3):  # mostra ou esconde o tempo de cada quadro
+            self.show_frame_time = not self.show_frame_time
+            self.dirty.full = True
+        if inputs.was_pressed(K_F4):  # mostra ou esconde o overlay de fases do quadro
+            self.overlay.toggle()
+            self.dirty.full = True
+        if inputs.was_pressed(K_F5) and self.overlay.enabled:  # exporta as medições do overlay
+            self.overlay.export_csv()
+
+    def check_progress(self):
+        """ Chama o boss e passa de nível conforme a pontuação
         """
-        # lida com a janela de quit ("x" no canto superior direito)
-        if event.type == pygame.QUIT:
-            self.run = False
-        # lida com inputs do teclado com funções do Pygame
-        if event.type in (KEYDOWN,):
-            key = event.key
-            if key == K_ESCAPE:  # lida com a saída do jogo pelo "esc" do teclado
-                self.run = False
-
-        #
         if self.true_score >= self.level*100 + 20:
             self.temp_score = self.true_score
             self.summon_boss()
             self.true_score = 0
 
         if self.scoreboss == 1:
+            self.release_boss()
             self.level_changer()
             self.scoreboss = 0
             self.bosscounter += 1
             self.true_score = self.temp_score + 70
 
-    def set_current_wave(self):
-        """ Define a presença de cada inimigo nas fases, de acordo com a lista de dicionários definida
+    def update_preloader(self, block=False):
+        """ Acompanha o carregamento dos recursos em segundo plano
+        :param block: define se deve esperar o fim do carregamento
+        :type block: boolean. Default False
         """
-        new_current_wave = []
-        for enemy in self.waves[self.level]:
-            for i in range(self.waves[self.level][enemy]):
-                new_current_wave.append(enemy)
-        self.current_wave = new_current_wave
+        if self.preloader.is_done():
+            return
+        if block:
+            self.preloader.wait()
+        else:
+            self.preloader.poll()
+        if self.preloader.is_done():
+            self.warm_scene()
 
-    def start_music(self, music):
-        """ Inicia a música por comandos próprios do Pygame
+    def draw_loading(self):
+        """ Desenha a barra de progresso do carregamento dos recursos
         """
-        pygame.mixer.init()
-        song = os.path.join('songs', music)
-        pygame.mixer.music.load(song)
-        pygame.mixer.music.play(-1)
+        width = self.screen.get_width()
+        self.dirty.add(pygame.draw.rect(self.screen, (0, 0, 0), (0, 0, width, 6)))
+        pygame.draw.rect(self.screen, (255, 255, 255),
+                         (0, 0, int(width * self.preloader.progress()), 6))
 
-    def change_music(self, music):
-        """ Muda a música por comandos próprios do Pygame
+    def compile_timeline(self):
+        """ Compila a linha do tempo de spawn da fase atual, a partir da definição das fases
         """
-        pygame.mixer.music.stop()
-        song = os.path.join('songs', music)
-        pygame.mixer.music.load(song)
-        pygame.mixer.music.play(-1)
+        self.timeline = compile_level(self.levels, self.level, self.color, self.rng)
 
     def update_interface(self):
         """ Faz o update da interface do jogo
@@ -209,66 +370,41 @@ class Game:
         else:
             heart_color = (0, 0, 0)
 
-        scoretext = self.font.render(
-            "Score = "+str(self.player.get_score()), 1, (0, 0, 0))
-        self.screen.blit(scoretext, (15, 570))
+        scoretext = self.hud["score"].render(
+            "Score = "+str(self.player.get_score()), (0, 0, 0))
+        self.dirty.add(self.screen.blit(scoretext, (15, 570)))
 
-        bombtext = self.font.render(
-            str(self.player.get_bombs()), 1, (0, 0, 0))
-        self.screen.blit(bombtext, (500, 570))
+        bombtext = self.hud["bombs"].render(
+            str(self.player.get_bombs()), (0, 0, 0))
+        self.dirty.add(self.screen.blit(bombtext, (500, 570)))
 
         # atualiza o display de vidas
-        lifestext = self.font_love.render(
-            "@"*self.player.get_lives(), 1, heart_color)
-        self.screen.blit(lifestext, (10, 540))
-
-    def spawn(self):
-        """ Define a geração dos elementos
-        """
-
-        # Geração de inimigos
-        if self.enemy_counter > 75:  # tempo para spawn
-            pos_x = random.randint(0, 640)  # aleatoriza a posição x do inimigo
-            enemy_n = random.randint(0, len(self.current_wave)-1)
-            # aleatoriza qual inimigo será gerado de acordo com os possíveis para o nível
-            enemy_type = self.current_wave[enemy_n]
-            # definição da posições e cor de cada inimigo gerado
-            if enemy_type == "spider":
-                enemy = Spider([pos_x, -25], color=self.color)
-            elif enemy_type == "shooter":
-                enemy = Shooter([pos_x, -25], color=self.color)
-            elif enemy_type == "bomb":
-                enemy = Bomb([pos_x, -25], color=self.color)
-            elif enemy_type == "shield":
-                enemy = Shield([pos_x, 0], color=self.color)
-            # adiciona o inimigo gerado à lista de inimigos
-            self.enemies.append([enemy, pygame.sprite.RenderPlain(enemy)])
-            self.enemy_counter = 0
-        else:
-            mult = 1
-            if self.bosscounter >= 6:
-                mult = math.log(self.truescore + self.bosscounter*100)/8
-
-            self.enemy_counter += 1 * ((self.level/2)+1) * mult
-
-        # Geração de power ups
-        if self.power_up_counter > 180:  # tempo para spawn
-            pos_x = random.randint(0, 640)  # aleatoriza a posição x do inimigo
-            # aleatoriza qual powerup será gerado
-            pwup_type = random.randint(1, 4)
-            # define posições, tipo do powerup
-            power_up = PowerUp([pos_x, -25], power=pwup_type)
-            # adiciona o inimigo gerado à lista de inimigos
-            self.power_ups.append(
-                [power_up, pygame.sprite.RenderPlain(power_up)])
-            self.power_up_counter = 0
-        else:
-            self.power_up_counter += 1
+        lifestext = self.hud["lives"].render(
+            "@"*self.player.get_lives(), heart_color)
+        self.dirty.add(self.screen.blit(lifestext, (10, 540)))
 
-    def handle_collision(self):
+    def spawn(self, dt):
+        """ Gera os inimigos e power ups da linha do tempo da fase que chegaram ao seu instante
+        :param dt: variação de tempo
+        :type dt: float
+        """
+        for entry in self.timeline.advance(dt):
+            position = [entry.x, entry.y]
+            if entry.kind is PowerUp:
+                self.power_ups.add(PowerUp(position, power=entry.power))
+            elif entry.kind is Shield:
+                self.enemies.add(acquire(Shield, position, color=entry.color, rng=self.rng))
+            else:
+                self.enemies.add(acquire(entry.kind, position, color=entry.color))
+
+    def handle_collision(self, dt):
         """ Lida com as colisões em geral
+        :param dt: variação de tempo
+        :type dt: float
         """
 
+        # zera os contadores de pares testados e de colisões do quadro
+        self.collision_stats = {"tested": 0, "hits": 0}
         # lida com as colisões dos inimigos contra as explosões, o jogador e os tiros do jogador
         self.handle_enemy_collision()
         # lida com as colisões dos tiros dos inimigos contra o jogador
@@ -277,143 +413,167 @@ class Game:
         self.handle_power_up_collision()
 
         for block in self.blocks:
-            plyr_collision = self.player.rect.colliderect(block[0].rect)
+            plyr_collision = self.player.rect.colliderect(block.rect)
             if plyr_collision:
-                self.start_game(block[0].value)
+                self.start_game(block.value)
 
         # diminui o contador de colisão do jogador
         if self.colcounter > 0:
-            self.colcounter -= 1
+            self.colcounter -= dt
 
     def handle_enemy_collision(self):
         """ Lida com as colisões do player com inimigos
+        Os tiros do jogador são testados contra cada inimigo de uma vez, de forma vetorizada. Os inimigos são
+        distribuídos em uma grade espacial, de modo que cada inimigo só é testado contra as explosões que
+        estão nas suas células
         """
+        self.enemy_grid.build(self.enemies)
+        near_explosions = self.enemy_grid.candidates(self.explosions)
+        shots = self.shoots.sweep()  # rects dos tiros do jogador, calculados uma vez para todos os inimigos
         for enemy in self.enemies:  # roda o bloco de código abaixo para todos o inimigos vivos
             # checa se o jogador colidiu com o inimigo em questão
-            plyr_collision = self.player.rect.colliderect(enemy[0].rect)
+            plyr_collision = self.collider.collide(self.player, enemy)
             if plyr_collision and self.colcounter <= 0:
                 #print('ui')
                 self.player.got_hit()
-                enemy[0].got_hit()
+                enemy.got_hit()
                 # remove o inimigo caso ele houver colisão
-                if enemy[0].get_lives() <= 0:
+                if enemy.get_lives() <= 0:
                     if enemy in self.enemies:
-                        self.enemies.remove(enemy)
+                        self.enemies.destroy(enemy)
                         self.player.add_score()
                         self.true_score += 1
                         # tratamento especial para a bomba, que explode caso haja colisão
-                        if enemy[0].get_id() == "boss":
+                        if enemy.get_id() == "boss":
                             self.scoreboss = 1  # define o scoreboss em 1 para possibilitar a passagem de nível
                             self.player.set_score(self.player.get_score() + 70)
                             self.true_score += 70
-                        if enemy[0].get_id() == "bomb":
+                        if enemy.get_id() == "bomb":
                             self.true_score += 1
                             self.handle_bomb_death(enemy)
-                self.colcounter = 60
-            for shoot in self.shoots:
-                # checa se os tiros do jogador colidiram com o inimigo em questão
-                enemy_collision = enemy[0].rect.colliderect(shoot[0].rect)
-                if enemy_collision:
-                    enemy[0].got_hit()
-                    # caso as vidas cheguem a 0, chama funções de morte de cada inimigo e os remove da lista de inimigos ativos
-                    if enemy[0].get_lives() <= 0:
+                self.colcounter = 960
+            # tiros do jogador que colidem com o inimigo
+            for shoot in self.collider.colliding_shots(enemy, self.shoots, shots):
+                self.collision_stats["hits"] += 1
+                enemy.got_hit()
+                # caso as vidas cheguem a 0, chama funções de morte de cada inimigo e os remove da lista de inimigos ativos
+                if enemy.get_lives() <= 0:
+                    self.true_score += 1
+                    self.player.add_score()
+                    if enemy.get_id() == "boss":
+                        self.scoreboss = 1  # define o scoreboss em 1 para possibilitar a passagem de nível
+                        self.player.set_score(self.player.get_score() + 70)
+                    if enemy.get_id() == "bomb":
                         self.true_score += 1
-                        self.player.add_score()
-                        if enemy[0].get_id() == "boss":
-                            self.scoreboss = 1  # define o scoreboss em 1 para possibilitar a passagem de nível
-                            self.player.set_score(self.player.get_score() + 70)
-                        if enemy[0].get_id() == "bomb":
-                            self.true_score += 1
-                            self.handle_bomb_death(enemy)
-                        if enemy in self.enemies:
-                            self.enemies.remove(enemy)
-                    # remove o tiro da lista de tiros
-                    self.shoots.remove(shoot)
-            # explosões:
-            for explosion in self.explosions:
+                        self.handle_bomb_death(enemy)
+                    self.enemies.destroy(enemy)
+                # remove o tiro do conjunto de tiros
+                self.shoots.kill(shoot)
+            # explosões próximas ao inimigo, segundo a grade
+            for explosion in near_explosions.get(enemy, ()):
                 # colisão com o inimigo
-                enemy_collision = enemy[0].rect.colliderect(
-                    explosion[0].rect)
-                if enemy_collision and enemy[0] not in explosion[0].hits:
-                    enemy[0].got_hit()
-                    if enemy[0].get_lives() <= 0:
+                self.collision_stats["tested"] += 1
+                enemy_collision = self.collider.collide(enemy, explosion)
+                if enemy_collision and not explosion.has_hit(enemy):
+                    self.collision_stats["hits"] += 1
+                    enemy.got_hit()
+                    if enemy.get_lives() <= 0:
                         self.player.add_score()
-                        if enemy[0].get_id() == "bomb":
+                        if enemy.get_id() == "bomb":
                             self.handle_bomb_death(enemy)
-                        if enemy in self.enemies:
-                            self.enemies.remove(enemy)
-                    explosion[0].hits.append(enemy[0])
-                # colisão com o player
-                plyr_collision = self.player.rect.colliderect(
-                    explosion[0].rect)
-                if plyr_collision and self.colcounter <= 0 and self.player not in explosion[0].hits:
-                    self.player.got_hit()
-                    # remove a explosão após o tempo
-                    self.colcounter = 60
-                if explosion[0].count > explosion[0].duration:
-                    self.explosions.remove(explosion)
+                        self.enemies.destroy(enemy)
+                    explosion.add_hit(enemy)
+        self.collision_stats["tested"] += self.shoots.tested
+        for explosion in self.explosions:
+            # colisão com o player
+            plyr_collision = self.collider.collide(self.player, explosion)
+            if plyr_collision and self.colcounter <= 0 and not explosion.has_hit(self.player):
+                self.player.got_hit()
+                self.colcounter = 960
+            # remove a explosão após o tempo
+            if explosion.count > explosion.duration:
+                self.explosions.destroy(explosion)
 
     def handle_enemy_shot_collision(self):
         """ Lida com a colisão do player com os tiros inimigos
         """
-        for shoot in self.enemy_shoots:
-            plyr_collision = self.player.rect.colliderect(shoot[0].rect)
-            if plyr_collision and self.colcounter <= 0:
+        if self.colcounter <= 0:
+            hits = self.collider.colliding_shots(self.player, self.enemy_shoots)
+            if len(hits):
                 self.player.got_hit()
-                self.enemy_shoots.remove(shoot)
-                self.colcounter = 60
+                self.enemy_shoots.kill(hits[0])
+                self.colcounter = 960
 
     def handle_power_up_collision(self):
         """ Lida com a colisão do player com os power ups e implementa o poder
         """
         # define a colisão
         for power_up in self.power_ups:
-            plyr_collision = self.player.rect.colliderect(power_up[0].rect)
+            plyr_collision = self.player.rect.colliderect(power_up.rect)
             if plyr_collision:  # se ocorrer, implementa o power up
-                #print(power_up[0].get_power())
-                self.player.set_power_up(power_up[0].get_power())
-                power_up[0].kill()
-                self.power_ups.remove(power_up)
+                #print(power_up.get_power())
+                self.player.set_power_up(power_up.get_power())
+                power_up.kill()
+                self.power_ups.destroy(power_up)
 
     def handle_bomb_death(self, enemy):
         """ Lida com a colisão do player com os power ups e implementa o poder
         """
 
-        explosion1 = Explosion(  # centraliza a explosão horizontal
-            (320, enemy[0].rect.center[1]), type='1', color=self.color)
-        explosion2 = Explosion(  # centraliza a explosão vertical
-            (enemy[0].rect.center[0], 320), type='2', color=self.color)
-        self.explosions.append([explosion1, pygame.sprite.RenderPlain(
-            explosion1)])
-        self.explosions.append([explosion2, pygame.sprite.RenderPlain(
-            explosion2)])
+        explosion1 = acquire(Explosion,  # centraliza a explosão horizontal
+            (320, enemy.rect.center[1]), type='1', color=self.color)
+        explosion2 = acquire(Explosion,  # centraliza a explosão vertical
+            (enemy.rect.center[0], 320), type='2', color=self.color)
+        self.explosions.add(explosion1)
+        self.explosions.add(explosion2)
 
     def garbage_collector(self):
-        """ Remove da lista de inimigos vivos os que saíram da tela do jogo
+        """ Remove das listas do jogo os elementos mortos e os que saíram da tela do jogo
         """
-        for lst in (self.enemies, self.shoots, self.enemy_shoots):
-            for entity in lst:
-                if entity[0].check_borders():
-                    lst.remove(entity)
+        for entity in self.enemies:
+            if entity.check_borders():
+                self.enemies.destroy(entity)
+        # os tiros que saíram da tela já foram eliminados no update; aqui saem os atingidos
+        self.shoots.compact()
+        self.enemy_shoots.compact()
+        # os registros são também as camadas de renderização: elementos mortos não podem continuar neles
+        for registry in (self.enemies, self.power_ups, self.explosions):
+            for entity in registry:
+                if entity.killed:
+                    registry.destroy(entity)
+            registry.flush()
+        # os inimigos e explosões mortos no quadro anterior voltam a ficar disponíveis nos pools
+        recycle()
+
+    def discard(self, registry):
+        """ Mata e remove todos os elementos de um registro, devolvendo aos pools os que vieram deles
+        :param registry: registro de elementos
+        :type registry: registry.EntityRegistry
+        """
+        for entity in registry:
+            entity.kill()
+        registry.clear()
 
     def level_changer(self):
         """ Define a mudança de nível
         """
         self.level += 1
         self.color = self.color_list[self.level]  # muda a cor padrão
-        self.set_current_wave()  # chama a lista de inimigos do nível
-        self.background = Background(
-            f'fundo{self.color}.png')  # define o background
-        self.enemies.clear()  # limpa a lista de inimigos vivos
+        self.compile_timeline()  # inimigos e power ups do nível
+        self.set_scene(self.level_scene(self.level))
+        self.update_preloader(block=True)  # em geral já carregados desde o aparecimento do boss
+        self.set_background(f'fundo{self.color}.png')  # define o background
+        self.discard(self.enemies)  # limpa a lista de inimigos vivos
         self.enemy_shoots.clear()  # limpa a lista de inimigos vivos
 
     def menu(self):
         """ Define a função de acesso às fases através dos sprites do menu interativo
         """
         # define os sprites das fases, suas imagens de fundo e valor para índice
-        self.start_music("MenuTheme.ogg")
+        self.music.play("MenuTheme.ogg")
         self.player.set_pos([305, 536])
-        self.background = Background(f'menu.png')
+        self.set_scene(())
+        self.set_background(f'menu.png')
         level_1 = Block((79, 78), image="fase1.png", value=0)
         level_2 = Block((79, 196), image="fase2.png", value=1)
         level_3 = Block((79, 315), image="fase3.png", value=2)
@@ -424,32 +584,23 @@ class Game:
                         value='credits', size=(82, 102))
         quit = Block((590, 45), image="sair.png", value='quit',
                      size=(72, 72))  # sprite para sair do jogo
-        self.blocks.append([level_1, pygame.sprite.RenderPlain(
-            level_1)])
-        self.blocks.append([level_2, pygame.sprite.RenderPlain(
-            level_2)])
-        self.blocks.append([level_3, pygame.sprite.RenderPlain(
-            level_3)])
-        self.blocks.append([level_4, pygame.sprite.RenderPlain(
-            level_4)])
-        self.blocks.append([level_5, pygame.sprite.RenderPlain(
-            level_5)])
-        self.blocks.append([zen, pygame.sprite.RenderPlain(
-            zen)])
-        self.blocks.append([quit, pygame.sprite.RenderPlain(
-            quit)])
-        self.blocks.append([credits, pygame.sprite.RenderPlain(
-            credits)])
+        self.blocks.append(level_1)
+        self.blocks.append(level_2)
+        self.blocks.append(level_3)
+        self.blocks.append(level_4)
+        self.blocks.append(level_5)
+        self.blocks.append(zen)
+        self.blocks.append(quit)
+        self.blocks.append(credits)
 
     def credits(self):
         self.incredits = True
         self.player.set_pos([305, 536])
         self.blocks.clear()
-        self.background = Background('nomes.png')
+        self.set_background('nomes.png')
         return_b = Block((575, 552), image="voltar.png",
                          value="menu", size=(89, 99))
-        self.blocks.append([return_b, pygame.sprite.RenderPlain(
-            return_b)])
+        self.blocks.append(return_b)
 
     def start_game(self, value):
         """ Inicia o jogo
@@ -457,7 +608,7 @@ class Game:
         self.blocks.clear()
         self.player.set_pos([305, 536])
         if value == 'quit':
-            self.run = False
+            self.running = False
             return 0
         if value == 'credits':
             self.credits()
@@ -468,74 +619,146 @@ class Game:
             self.player.set_pos([305, 536])
             self.menu()
             return 0
+        # garante que nenhum recurso será carregado do disco durante a fase
+        self.set_scene(self.level_scene(value))
+        self.update_preloader(block=True)
         self.level = value
         self.color = self.color_list[self.level]  # muda a cor padrão
         scores = [0, 90, 190, 290, 390, 500]
         bosscounters = [0, 1, 2, 3, 4, 5]
         self.bosscounter = bosscounters[self.level]
         self.true_score = scores[self.level]
-        self.set_current_wave()  # chama a lista de inimigos do nível
-        self.background = Background(
-            f'fundo{self.color}.png')  # define o background
-        self.change_music("LevelTheme.ogg")
-        self.enemies.clear()  # limpa a lista de inimigos vivos
+        self.compile_timeline()  # inimigos e power ups do nível
+        self.set_background(f'fundo{self.color}.png')  # define o background
+        self.music.play("LevelTheme.ogg")
+        self.discard(self.enemies)  # limpa a lista de inimigos vivos
         self.enemy_shoots.clear()  # limpa a lista de disparos de inimigos vivos
         self.start = True
 
     def loop(self):
         """ Loop principal do jogo
+        A simulação avança em passos fixos de self.dt ms, acumulando o tempo real de cada quadro. O desenho
+        acontece uma vez por quadro, interpolando as posições entre os dois últimos passos
         """
         clock = pygame.time.Clock()  # cria o relógio do jogo
-        dt = 16  # define a efetiva velocidade do jogo
-        self.player = Player([305, 536], 3)  # posição inicial do player
-        self.elements['player'] = pygame.sprite.RenderPlain(
-            self.player)  # prepara o sprite do Player
-        self.start_music("MenuTheme.ogg")  # escolhe a música inicial
-        self.menu()  # inicia o jogo
-        while self.run:
-            clock.tick(1000 / dt)
-            event = pygame.event.poll()
-
-            # funções de todos os eventos do jogo.
-            self.player.update(dt)  # update do player
-            self.handle_events(event, dt)  # eventos
-            self.handle_collision()  # colisões
-            if self.start:
-                self.player.shoot(event, self.shoots)
-                self.player.explode(event, self.explosions)
-                self.spawn()
-                # Update dos elementos
-                self.update_elements(dt)
-            self.draw_elements()  # desenha os elementos
-            self.garbage_collector()
-            if not self.start and not self.incredits:
-                scoretext = self.font.render(
-                    "Score = "+str(self.last_score), 1, (255, 255, 255))
-                self.screen.blit(scoretext, (160, 19))
-            if self.start:
-                self.update_interface()  # chama atualizações de interface
-            if self.player.isdead:
-                self.start = False
-                self.last_score = self.player.get_score()
-                self.player = Player([305, 536], 3)
-                self.elements['player'] = pygame.sprite.RenderPlain(
-                    self.player)
-                self.enemies.clear()  # limpa a lista de inimigos vivos
-                self.enemy_shoots.clear()
-                self.explosions.clear()
-                self.power_ups.clear()
-                self.shoots.clear()
-                self.menu()
-            pygame.display.flip()
+        accumulator = 0
+        while self.running:
+            accumulator += min(clock.tick(self.max_fps), MAX_FRAME_TIME)
+            frame_start = time.perf_counter()
+            while accumulator >= self.dt and self.running:
+                self.tick(self.input.poll(self.ticks))
+                accumulator -= self.dt
+            self.render(accumulator / self.dt)
+            self.overlay.end_frame()
+            self.frame_times.append((time.perf_counter() - frame_start) * 1000)
+            if len(self.frame_times) > 30:
+                self.frame_times.pop(0)
+        if self.record:
+            self.recording.save(self.record)
         pygame.quit()  # sai do jogo
 
+    def tick(self, inputs):
+        """ Avança a simulação em um passo fixo de self.dt ms
+        As entradas do passo são gravadas em self.recording
+        :param inputs: entradas do passo
+        :type inputs: inputs.InputSnapshot
+        """
+        dt = self.dt
+        self.recording.record(inputs)
+        # guarda as posições atuais, usadas na interpolação do desenho
+        self.layers.snapshot()
+        for element in self.elements.values():
+            snapshot(element)
+        if self.player.shield:
+            snapshot([self.player.shield])
+
+        # funções de todos os eventos do jogo.
+        self.player.update(dt, inputs)  # update do player
+        self.handle_events(inputs, dt)  # eventos
+        self.check_progress()
+        self.handle_collision(dt)  # colisões
+        if self.start:
+            if self.player.shoot(inputs, self.shoots):
+                self.input.acted(K_LCTRL, self.ticks)
+            if self.player.explode(inputs, self.explosions):
+                self.input.acted(K_SPACE, self.ticks)
+            self.spawn(dt)
+            # Update dos elementos
+            self.update_elements(dt)
+        self.garbage_collector()
+        voices.flush()  # toca os efeitos sonoros pedidos no passo
+        self.music.update(dt)
+        if not self.preloader.is_done():
+            self.update_preloader()
+        if self.player.isdead:
+            self.start = False
+            self.last_score = self.player.get_score()
+            self.player = Player([305, 536], 3)
+            self.elements['player'] = pygame.sprite.RenderPlain(
+                self.player)
+            self.discard(self.enemies)  # limpa a lista de inimigos vivos
+            self.release_boss()
+            self.enemy_shoots.clear()
+            self.discard(self.explosions)
+            self.power_ups.clear()
+            self.shoots.clear()
+            self.overlay.refresh()  # o overlay passa a medir o novo Player
+            self.menu()
+        self.ticks += 1
+
+    def step(self, inputs=()):
+        """ Avança a simulação em um passo, sem desenhar nem esperar pelo relógio
+        As teclas seguradas são acompanhadas pelos eventos recebidos aqui, e não pelo teclado real
+        :param inputs: eventos do pygame (KEYDOWN, KEYUP, QUIT...) recebidos neste passo
+        :type inputs: list
+        """
+        self.tick(self.input.feed(self.ticks, inputs))
+
+    def run(self, n_frames, render=False):
+        """ Roda n_frames passos de simulação o mais rápido possível, sem entrada do jogador
+        Retorna a quantidade de passos executados, que é menor se o jogo terminar antes
+        :param n_frames: quantidade de passos
+        :type n_frames: int
+        :param render: define se cada passo também é desenhado
+        :type render: boolean. Default False
+        """
+        for frame in range(n_frames):
+            if not self.running:
+                return frame
+            self.step()
+            if render:
+                self.render()
+        return n_frames
+
+    def render(self, alpha=1):
+        """ Desenha um quadro
+        :param alpha: fração do passo de simulação já decorrida, usada para interpolar as posições
+        :type alpha: float. Default 1
+        """
+        self.draw_elements(alpha)  # desenha os elementos
+        if not self.start and not self.incredits:
+            scoretext = self.hud["last_score"].render(
+                "Score = "+str(self.last_score), (255, 255, 255))
+            self.dirty.add(self.screen.blit(scoretext, (160, 19)))
+        if not self.preloader.is_done():
+            self.draw_loading()
+        if self.start:
+            self.update_interface()  # chama atualizações de interface
+        if self.show_frame_time:
+            self.draw_frame_time()
+        self.dirty.extend(self.overlay.draw(self.screen))
+        self.dirty.present()
+
 
 class Player(Spaceship):
     """ Classe Player - define tudo relacionado ao jogador
     Tem herança de Spaceship
     """
 
-    def __init__(self, position, lives=3, speed=.5, image=None, new_size=(27, 36)):
+    IMAGE = "nave1.png"
+    SIZE = (27, 36)
+
+    def __init__(self, position, lives=3, speed=.5, image=None, new_size=SIZE):
         """Player construtor
         :param position: a posição inicial do Player.
         :type position: list
@@ -551,7 +774,7 @@ class Player(Spaceship):
 
         # define a imagem padrão
         if not image:
-            image = "nave1.png"
+            image = self.IMAGE
 
         # chama ElementSprite.__init__() e define valores iniciais de objetos lógicos
         super().__init__(position, lives, speed, image, new_size)
@@ -562,28 +785,45 @@ class Player(Spaceship):
         self.score = 0
         self.bombs = 0
         self.size = new_size
+        # quadros de inclinação do Player: reto, para a direita e para a esquerda
+        self.tilt = AnimationClip(["nave1.png", "nave2.png", "nave3.png"], new_size)
         self.power_ups = [False, False, False, False]
         self.shield = None
         self.spd_counter = 0
         self.sht_counter = 0
         self.isdead = False
 
-    def update(self, dt):
+    @classmethod
+    def variants(cls, color):
+        """ Retorna as variantes que o Player desenha: as inclinações da nave, o tiro, o escudo e as bombas
+        :param color: cor da fase (o Player tem sempre as mesmas cores)
+        :type color: string
+        """
+        frames = [(f"nave{frame}.png", cls.SIZE) for frame in range(1, 4)]
+        return frames + [("tironave1.png", None)] + ShieldPowerUp.variants(color) + Explosion.variants('R')
+
+    def update(self, dt, inputs=None):
         """ Atualiza o Player
         :param dt: variação de tempo
         :type dt: int
+        :param inputs: entradas do passo. Default None (lê o teclado)
+        :type inputs: inputs.InputSnapshot
         """
 
         # movimento
         new_acc = [0, 0]
-        keys = pygame.key.get_pressed()
-        if keys[K_LEFT]:
+        if inputs is None:
+            pressed = pygame.key.get_pressed()
+            held = {key for key in HELD_KEYS if pressed[key]}
+        else:
+            held = inputs.held
+        if K_LEFT in held:
             new_acc[0] -= 1
-        if keys[K_RIGHT]:
+        if K_RIGHT in held:
             new_acc[0] += 1
-        if keys[K_UP]:
+        if K_UP in held:
             new_acc[1] -= 1
-        if keys[K_DOWN]:
+        if K_DOWN in held:
             new_acc[1] += 1
 
         # variação da imagem do sprite do Player quando ele se movimenta para esquerda e direita
@@ -591,11 +831,12 @@ class Player(Spaceship):
         if new_acc != self.acc:
             self.acc = new_acc
             if self.acc[0] == 0:
-                self.set_image('nave1.png', self.size)
+                self.tilt.set_frame(0)
             elif self.acc[0] == 1:
-                self.set_image('nave2.png', self.size)
+                self.tilt.set_frame(1)
             elif self.acc[0] == -1:
-                self.set_image('nave3.png', self.size)
+                self.tilt.set_frame(2)
+            self.image = self.tilt.image
 
         # velocidade do Player
         self.vel = (self.vel[0]+self.acc[0]*dt/100,
@@ -603,23 +844,24 @@ class Player(Spaceship):
         self.normalize_vel()
 
         # Contagem de tempo do power up speed
-        if self.spd_counter > 360:
+        if self.spd_counter > 5760:  # o power up dura 5760 ms
             self.power_ups[0] = False
             self.spd_counter = 0
 
         # acelerador~de velocidade do power up [0]
         if self.power_ups[0]:
             mtp = 1.3
-            self.spd_counter += 1
+            self.spd_counter += dt
         else:
             mtp = 1
 
         # posição
-        pos_x = self.rect.center[0] + self.vel[0]*dt*mtp
-        pos_y = self.rect.center[1] + self.vel[1]*dt*mtp
+        pos_x = self.pos[0] + self.vel[0]*dt*mtp
+        pos_y = self.pos[1] + self.vel[1]*dt*mtp
 
-        # Reduz a velocidade simulando fricção
-        self.vel = (self.vel[0]*9/10, self.vel[1]*9/10)
+        # Reduz a velocidade simulando fricção: 10% a cada 16 ms, qualquer que seja a duração do passo
+        friction = 0.9 ** (dt / 16)
+        self.vel = (self.vel[0]*friction, self.vel[1]*friction)
         if abs(self.vel[0]) < 0.01:
             self.vel = (0, self.vel[1])
         if abs(self.vel[1]) < 0.01:
@@ -634,67 +876,59 @@ class Player(Spaceship):
             pos_y = 0
         elif pos_y > 640:
             pos_y = 640
-        self.rect.center = (pos_x, pos_y)
+        self.move_to((pos_x, pos_y))
 
         # Contagem de tempo do power up que aumenta o número de tiros
-        if self.sht_counter > 360:
+        if self.sht_counter > 5760:
             self.power_ups[1] = False
             self.sht_counter = 0
 
         if self.power_ups[1]:
-            self.sht_counter += 1
+            self.sht_counter += dt
 
         # power up shield
         if self.shield:
-            self.shield[0].update(dt)
-
-    def shoot(self, event, shoots):
-        """ Função de atirar do player
-        :param event: tecla pressionada
-        :type event: KEYDOWN
-        :param shoots: lista de tiros do player
-        :type shoots: list
-        """
-        if event.type in (KEYDOWN,):
-            key = event.key
-            if key == K_LCTRL:  # define a tecla "ctrl" como de atirar
-                play_sound("PlayerShoot.ogg")  # efeito sonoro de tiro
-                if not self.power_ups[1]:  # tiro neutro
-                    laser = Laser((self.rect.center[0], self.rect.top))
-                    shoots.append([laser, pygame.sprite.RenderPlain(laser)])
-                else:  # tiros com power up
-                    laser1 = Laser((self.rect.center[0], self.rect.top))
-                    laser2 = Laser(
-                        (self.rect.center[0], self.rect.top), direction=(1, -1), angle=-45)
-                    laser3 = Laser(
-                        (self.rect.center[0], self.rect.top), direction=(-1, -1), angle=45)
-                    lst = [[laser1, pygame.sprite.RenderPlain(laser1)], [laser2, pygame.sprite.RenderPlain(
-                        laser2)], [laser3, pygame.sprite.RenderPlain(laser3)]]  # cria três lasers
-                    for laser in lst:
-                        shoots.append(laser)
-                self.shot_cooldown = 2  # tempo de cooldown para atirar novamente
-
-    def explode(self, event, explosions):
-        """ Power up de explosão do player
-        :param event: tecla pressionada
-        :type event: KEYDOWN
-        :param explosions: lista de explosões ativas
-        :type shoots: list
-        """
-        if event.type in (KEYDOWN,):
-            key = event.key
-            if key == K_SPACE:  # define a tecla "space" como de atirar
-                if self.bombs > 0:
-                    # criamos os sprites e os adicionamos na lista de explosões ativas
-                    explosion1 = Explosion(
-                        (320, self.rect.center[1]), type='1', color='R', hits=[self])
-                    explosion2 = Explosion(
-                        (self.rect.center[0], 320), type='2', color='R', hits=[self])
-                    explosions.append(
-                        [explosion1, pygame.sprite.RenderPlain(explosion1)])
-                    explosions.append(
-                        [explosion2, pygame.sprite.RenderPlain(explosion2)])
-                    self.bombs -= 1
+            self.shield.update(dt)
+
+    def shoot(self, inputs, shoots):
+        """ Função de atirar do player. Retorna se o Player atirou
+        :param inputs: entradas do passo
+        :type inputs: inputs.InputSnapshot
+        :param shoots: tiros do player
+        :type shoots: projectiles.ProjectileStore
+        """
+        if inputs.was_pressed(K_LCTRL):  # define a tecla "ctrl" como de atirar
+            play_sound("PlayerShoot.ogg")  # efeito sonoro de tiro
+            position = (self.rect.center[0], self.rect.top)
+            if not self.power_ups[1]:  # tiro neutro
+                shoots.spawn(position, (0, -.6), "tironave1.png")
+            else:  # três tiros com power up
+                shoots.spawn(position, (0, -.6), "tironave1.png")
+                shoots.spawn(position, (.6, -.6), "tironave1.png", angle=-45)
+                shoots.spawn(position, (-.6, -.6), "tironave1.png", angle=45)
+            self.shot_cooldown = 2  # tempo de cooldown para atirar novamente
+            return True
+        return False
+
+    def explode(self, inputs, explosions):
+        """ Power up de explosão do player. Retorna se o Player usou uma bomba
+        :param inputs: entradas do passo
+        :type inputs: inputs.InputSnapshot
+        :param explosions: registro das explosões ativas
+        :type explosions: registry.EntityRegistry
+        """
+        if inputs.was_pressed(K_SPACE):  # define a tecla "space" como de atirar
+            if self.bombs > 0:
+                # criamos os sprites e os adicionamos na lista de explosões ativas
+                explosion1 = acquire(Explosion,
+                    (320, self.rect.center[1]), type='1', color='R', hits=[self])
+                explosion2 = acquire(Explosion,
+                    (self.rect.center[0], 320), type='2', color='R', hits=[self])
+                explosions.add(explosion1)
+                explosions.add(explosion2)
+                self.bombs -= 1
+                return True
+        return False
 
     def normalize_vel(self):
         """ Função usada para lidar com a movimentação, tornando-a mais fluida
@@ -749,7 +983,7 @@ class Player(Spaceship):
         elif power_up == 4 and not self.power_ups[3]:  # shield
             shield = ShieldPowerUp(
                 (self.rect.center[0], self.rect.center[1]), player=self)
-            self.shield = [shield, pygame.sprite.RenderPlain(shield)]
+            self.shield = shield
 
         self.power_ups[power_up - 1] = True  # Array começa em 0
 
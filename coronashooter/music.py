@@ -0,0 +1,83 @@
+import time
+import pygame
+from resources import manager, music_file
+
+FADE_TIME = 1000  # duração, em ms, da transição entre duas músicas (metade saindo, metade entrando)
+
+
+class MusicController:
+    """ Toca as músicas do jogo sem travar o quadro
+    As músicas são tocadas em streaming por pygame.mixer.music, a partir do arquivo comprimido que o Preloader já
+    leu: abrir uma música leva menos de 1 ms e só o trecho tocando fica decodificado na memória (uma música
+    decodificada inteira ocuparia cerca de 21 MB, boa parte do orçamento do ResourceManager). Como há um único
+    stream, a transição não sobrepõe as músicas: a anterior sai com fadeout() e a nova entra, com fade, no
+    primeiro update() depois que a anterior terminou de sair
+    """
+
+    def __init__(self, fade_time=FADE_TIME, enabled=True):
+        """ MusicController construtor
+        :param fade_time: duração da transição, em ms
+        :type fade_time: int
+        :param enabled: define se as músicas são tocadas (o jogo sem janela não toca música)
+        :type enabled: boolean. Default True
+        """
+        self.fade_time = fade_time
+        self.enabled = enabled
+        self.current = None  # música tocando (ou entrando)
+        self.target = None  # música pedida, esperando a anterior sair
+        self.transitions = []  # (música, ms até começar a tocar, ms até o fim da transição) de cada transição
+        self._leaving = False  # a música atual está saindo
+        self._fade = None  # tempo, em ms, decorrido na entrada da música atual
+        self._requested = None  # instante (perf_counter) do pedido da transição atual
+        self._started = None  # ms entre o pedido e o início da música
+
+    def play(self, name):
+        """ Pede a troca para uma música. A função retorna imediatamente; a música começa a tocar no primeiro
+        update() depois que a anterior saiu
+        :param name: nome do arquivo da música, na pasta /songs
+        :type name: string
+        """
+        if not self.enabled or not pygame.mixer.get_init() or name == self.target:
+            return
+        if name == self.current and not self._leaving:
+            # volta para a música atual: a música pedida antes, esperando para entrar, não deve mais entrar
+            self.target = None
+            return
+        self.target = name
+        self._requested = time.perf_counter()
+        if pygame.mixer.music.get_busy() and not self._leaving:
+            pygame.mixer.music.fadeout(self.fade_time // 2)
+            self._leaving = True
+
+    def update(self, dt):
+        """ Inicia a música pedida assim que a anterior saiu e acompanha a entrada
+        :param dt: tempo decorrido, em ms
+        :type dt: float
+        """
+        if self.target is not None and not pygame.mixer.music.get_busy():
+            self._start(self.target)
+        if self._fade is None:
+            return
+        self._fade += dt
+        if self._fade >= self.fade_time // 2:
+            self._fade = None
+            self.transitions.append((self.current, self._started, (time.perf_counter() - self._requested) * 1000))
+
+    def _start(self, name):
+        """ Começa a tocar uma música, com fade
+        """
+        # o arquivo comprimido da música tocando fica no ResourceManager
+        manager.acquire(name)
+        if self.current is not None:
+            manager.release(self.current)
+        pygame.mixer.music.load(music_file(name))
+        pygame.mixer.music.play(-1, fade_ms=self.fade_time // 2)
+        self.current, self.target, self._leaving = name, None, False
+        self._fade = 0
+        self._started = (time.perf_counter() - self._requested) * 1000
+
+    def report(self):
+        """ Retorna o tempo das transições feitas, uma por linha
+        """
+        return "\n".join(f"música {name}: tocando após {started:.1f} ms, transição completa em {total:.1f} ms"
+                         for name, started, total in self.transitions)
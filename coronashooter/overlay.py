@@ -0,0 +1,151 @@
+import csv
+import time
+import pygame
+from profiler import PhaseProfiler
+from resources import get_font
+
+# fases medidas pelo overlay: (nome exibido, caminho do método a partir do Game), na ordem do quadro
+OVERLAY_PHASES = (("player.update", "player.update"),
+                  ("handle_events", "handle_events"),
+                  ("handle_collision", "handle_collision"),
+                  ("update_elements", "update_elements"),
+                  ("draw_elements", "draw_elements"),
+                  ("garbage_collector", "garbage_collector"),
+                  ("display.flip", "dirty.present"))
+PHASE_COLORS = ((80, 160, 255), (255, 220, 80), (255, 90, 90), (120, 220, 120),
+                (200, 120, 255), (255, 160, 60), (200, 200, 200))
+COUNTED = ("enemies", "shoots", "enemy_shoots", "explosions", "power_ups")  # contêineres do Game contados
+FRAME_BUDGET = 16  # orçamento de um quadro, em ms
+HISTORY = 120  # quadros exibidos no gráfico
+MAX_FRAMES = 3600  # quadros guardados para a exportação em CSV
+
+
+class ProfilerOverlay:
+    """ Overlay com o tempo de cada fase do quadro e a quantidade de entidades do jogo
+    O gráfico mostra os últimos HISTORY quadros, cada um como uma coluna empilhada com uma cor por fase; a
+    linha horizontal marca o orçamento de FRAME_BUDGET ms. Quando desligado, o overlay não mede nada
+    """
+
+    def __init__(self, game, scale=2, height=96):
+        """ ProfilerOverlay construtor
+        :param game: jogo medido
+        :type game: main.Game
+        :param scale: largura, em pixels, da coluna de cada quadro
+        :type scale: int
+        :param height: altura do gráfico, em pixels (corresponde a duas vezes o orçamento)
+        :type height: int
+        """
+        self.game = game
+        self.enabled = False
+        self.profiler = PhaseProfiler(OVERLAY_PHASES, MAX_FRAMES)
+        self.counts = {name: [] for name in COUNTED}
+        self.scale = scale
+        self.graph = pygame.Surface((HISTORY * scale, height))
+        self.graph.set_alpha(200)
+        self.font = get_font('Pixels.ttf', 20)
+        self.legend = None
+        self.frames = 0
+
+    def toggle(self):
+        """ Liga ou desliga o overlay
+        """
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.profiler.attach(self.game)
+            self.graph.fill((0, 0, 0))
+        else:
+            self.profiler.detach()
+
+    def refresh(self):
+        """ Volta a medir as fases depois que o Game troca algum dos objetos medidos (o Player)
+        """
+        if self.enabled:
+            self.profiler.attach(self.game)
+
+    def end_frame(self):
+        """ Fecha o quadro: guarda os tempos e as contagens e acrescenta a coluna do quadro ao gráfico
+        """
+        if not self.enabled:
+            return
+        current = dict(self.profiler.current)
+        self.profiler.end_frame()
+        for name in COUNTED:
+            counts = self.counts[name]
+            counts.append(len(getattr(self.game, name)))
+            if len(counts) > MAX_FRAMES:
+                del counts[0]
+        # rola o gráfico e desenha a nova coluna, de baixo para cima
+        width, height = self.graph.get_size()
+        self.graph.scroll(-self.scale, 0)
+        self.graph.fill((0, 0, 0), (width - self.scale, 0, self.scale, height))
+        ms_to_px = height / (2 * FRAME_BUDGET)
+        bottom = height
+        for phase, color in zip(self.profiler.phases, PHASE_COLORS):
+            size = current[phase] * ms_to_px
+            if size >= .5:
+                self.graph.fill(color, (width - self.scale, round(bottom - size), self.scale, round(size)))
+                bottom -= size
+        self.graph.fill((255, 255, 255), (width - self.scale, height // 2, self.scale, 1))
+        self.frames += 1
+        if self.frames % 15 == 1:
+            self.legend = None  # a legenda é redesenhada a cada 15 quadros
+
+    def _render_legend(self):
+        """ Desenha a legenda: média recente de cada fase e contagem de entidades
+        """
+        lines = []
+        for phase, color in zip(self.profiler.phases, PHASE_COLORS):
+            recent = list(self.profiler.samples[phase])[-HISTORY:]
+            mean = sum(recent) / len(recent) if recent else 0
+            lines.append((f"{phase}: {mean:.2f} ms", color))
+        lines.append((" ".join(f"{name}={counts[-1] if counts else 0}"
+                               for name, counts in self.counts.items()), (255, 255, 255)))
+        inputs = self.game.input.stats()
+        lines.append((f"input: {inputs['max_events_per_tick']} eventos/passo (máx), "
+                      f"latência {inputs['max_latency_ticks']} passos (máx)", (255, 255, 255)))
+        if self.game.collider.enabled:
+            masks = self.game.collider.stats()
+            lines.append((f"máscaras: {masks['mask_rejected']} de {masks['mask_tested']} colisões de rect rejeitadas",
+                          (255, 255, 255)))
+        surfaces = [self.font.render(text, 1, color) for text, color in lines]
+        legend = pygame.Surface((max(surface.get_width() for surface in surfaces),
+                                 sum(surface.get_height() for surface in surfaces)))
+        y = 0
+        for surface in surfaces:
+            legend.blit(surface, (0, y))
+            y += surface.get_height()
+        return legend
+
+    def draw(self, screen):
+        """ Desenha o overlay na tela e retorna as regiões alteradas
+        :param screen: tela do jogo
+        :type screen: pygame.Surface
+        """
+        if not self.enabled:
+            return []
+        if self.legend is None:
+            self.legend = self._render_legend()
+        x, y = 5, 5
+        rects = [screen.blit(self.graph, (x, y))]
+        rects.append(screen.blit(self.legend, (x, y + self.graph.get_height() + 2)))
+        return rects
+
+    def export_csv(self, path=None):
+        """ Grava em CSV o tempo de cada fase e as contagens de entidades de cada quadro guardado
+        Retorna o caminho do arquivo
+        :param path: caminho do arquivo. Default None (profile_<data e hora>.csv)
+        :type path: string
+        """
+        if path is None:
+            path = time.strftime("profile_%Y%m%d_%H%M%S.csv")
+        phases = self.profiler.phases
+        times = [list(self.profiler.samples[phase]) for phase in phases]
+        counts = [self.counts[name] for name in COUNTED]
+        frames = min(len(column) for column in times + counts)
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(("frame",) + tuple(f"{phase}_ms" for phase in phases) + COUNTED)
+            for frame in range(-frames, 0):
+                writer.writerow([frames + frame] + [f"{column[frame]:.4f}" for column in times] +
+                                [column[frame] for column in counts])
+        return path
@@ -0,0 +1,97 @@
+class Pool:
+    """ Lista livre de objetos de uma classe de entidade
+    Em vez de construir um objeto novo a cada spawn, acquire() reaproveita um objeto morto, reiniciando-o com o
+    próprio construtor. Os objetos voltam ao pool quando são mortos (ver ElementSprite.kill), mas só ficam
+    disponíveis depois de passar um quadro inteiro fora do jogo, para que referências antigas (o alvo de um
+    Shield, por exemplo) percebam a morte antes da reutilização. Cada entrega incrementa obj.generation, que
+    distingue as reutilizações de um mesmo objeto em referências que duram mais que isso (ver Explosion.hits)
+    """
+
+    def __init__(self, kind):
+        """ Pool construtor
+        :param kind: classe dos objetos do pool
+        :type kind: type
+        """
+        self.kind = kind
+        self.free = []  # objetos prontos para reutilização
+        self._released = []  # objetos mortos neste quadro
+        self._cooling = []  # objetos mortos no quadro anterior
+        self.created = 0  # objetos construídos pelo pool
+        self.reused = 0  # aquisições atendidas pela lista livre
+        self.active = 0  # objetos em jogo
+        self.high_water = 0  # maior quantidade de objetos em jogo ao mesmo tempo
+
+    def acquire(self, *args, **kwargs):
+        """ Retorna um objeto pronto para uso, reaproveitado ou novo, construído com os argumentos dados
+        """
+        if self.free:
+            obj = self.free.pop()
+            obj.__init__(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.kind(*args, **kwargs)
+            self.created += 1
+        obj.pool = self
+        obj.generation += 1
+        self.active += 1
+        self.high_water = max(self.high_water, self.active)
+        return obj
+
+    def release(self, obj):
+        """ Devolve um objeto morto ao pool
+        :param obj: objeto adquirido deste pool
+        :type obj: ElementSprite
+        """
+        self._released.append(obj)
+        self.active -= 1
+
+    def recycle(self):
+        """ Avança um quadro: os objetos mortos no quadro anterior passam para a lista livre
+        """
+        self.free.extend(self._cooling)
+        self._cooling = self._released
+        self._released = []
+
+    def stats(self):
+        """ Retorna os contadores do pool
+        """
+        return {"created": self.created, "reused": self.reused, "active": self.active,
+                "high_water": self.high_water, "free": len(self.free)}
+
+
+_pools = {}
+
+
+def get_pool(kind):
+    """ Retorna o pool de uma classe, criando-o na primeira vez
+    :param kind: classe dos objetos
+    :type kind: type
+    """
+    pool = _pools.get(kind)
+    if pool is None:
+        pool = _pools[kind] = Pool(kind)
+    return pool
+
+
+def acquire(kind, *args, **kwargs):
+    """ Atalho para get_pool(kind).acquire(*args, **kwargs)
+    """
+    return get_pool(kind).acquire(*args, **kwargs)
+
+
+def recycle():
+    """ Avança um quadro em todos os pools
+    """
+    for pool in _pools.values():
+        pool.recycle()
+
+
+def report():
+    """ Retorna um resumo dos pools: objetos construídos, reaproveitados e o pico de objetos em jogo
+    """
+    lines = []
+    for kind, pool in _pools.items():
+        stats = pool.stats()
+        lines.append(f"{kind.__name__}: {stats['created']} construídos, {stats['reused']} reaproveitados, "
+                     f"pico de {stats['high_water']} em jogo")
+    return "\n".join(lines)
@@ -0,0 +1,191 @@
+import pygame
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from resources import surface_cache, manager, add_sound, add_font, add_music
+
+
+class Preloader:
+    """ Carrega em segundo plano todos os recursos listados no manifesto (assets.json)
+    A decodificação de imagens, sons e músicas acontece em um pool de threads enquanto o menu já está na tela.
+    A instalação nos caches, que precisa do display (convert_alpha), é feita na thread principal a cada chamada
+    de poll(). As fontes são criadas na própria thread principal, em start(): o SDL_ttf não pode criar fontes
+    em uma thread enquanto a thread principal desenha texto
+    """
+
+    def __init__(self, manifest='assets.json', workers=4):
+        """ Preloader construtor
+        :param manifest: caminho do manifesto de recursos
+        :type manifest: string
+        :param workers: número de threads de decodificação
+        :type workers: int
+        """
+        with open(manifest) as file:
+            manifest = json.load(file)
+        # imagens empacotadas em um atlas (ver atlas.py) são carregadas junto com ele
+        atlases, packed = [], set()
+        for name in manifest.get("atlases", []):
+            path = os.path.join('images', name)
+            if os.path.exists(path):
+                with open(path) as file:
+                    index = json.load(file)
+                atlases.append((name, index))
+                packed.update(index["regions"])
+        # lista de tarefas (tipo, arquivo, argumento extra)
+        self.jobs = [("font", name, size) for name, size in manifest.get("fonts", [])]
+        self.jobs += [("sound", name, None) for name in manifest.get("sounds", [])]
+        self.jobs += [("atlas", name, index) for name, index in atlases]
+        self.jobs += [("image", name, None) for name in manifest.get("images", [])
+                      if name not in packed]
+        self.jobs += [("music", name, None) for name in manifest.get("music", [])]
+        self.workers = workers
+        self.total = len(self.jobs)
+        self.loaded = 0
+        self.timings = {}  # tempo de carregamento de cada recurso, em ms
+        self.errors = {}  # recursos que não puderam ser carregados
+        self.elapsed = 0  # tempo total, em ms, gasto carregando (somando os recarregamentos de request())
+        self._executor = None
+        self._pending = []
+        self._start = None
+
+    def start(self):
+        """ Carrega as fontes e envia as demais tarefas ao pool de threads
+        """
+        self._start = time.perf_counter()
+        for job in self.jobs:
+            if job[0] == "font":
+                self._finish(job, lambda: self._load(*job))
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._pending = [(job, self._executor.submit(self._load, *job))
+                         for job in self.jobs if job[0] != "font"]
+
+    @staticmethod
+    def _load(kind, name, arg):
+        """ Decodifica um recurso (executado nas threads do pool, exceto as fontes)
+        """
+        start = time.perf_counter()
+        if kind == "image":
+            asset = pygame.image.load(os.path.join('images', name))
+        elif kind == "atlas":
+            asset = pygame.image.load(os.path.join('images', arg["image"]))
+        elif kind == "sound":
+            asset = pygame.mixer.Sound(os.path.join('songs', name))
+        elif kind == "font":
+            asset = pygame.font.Font(os.path.join('fonts', name), arg)
+        else:
+            # músicas são tocadas em streaming pelo MusicController: aqui basta ler o arquivo comprimido
+            with open(os.path.join('songs', name), 'rb') as file:
+                asset = file.read()
+        return asset, (time.perf_counter() - start) * 1000
+
+    def _install(self, job, asset):
+        """ Coloca o recurso carregado no cache correspondente
+        """
+        kind, name, arg = job
+        if kind == "image":
+            if name not in surface_cache:
+                surface_cache.add(name, asset)
+        elif kind == "atlas":
+            if arg["image"] not in surface_cache:
+                surface_cache.add_atlas(arg, asset)
+        elif kind == "sound":
+            if ("sound", name) not in manager:
+                add_sound(name, asset)
+        elif kind == "font":
+            if ("font", name, arg) not in manager:
+                add_font(name, arg, asset)
+        elif ("music", name) not in manager:
+            add_music(name, asset)
+
+    def _loaded(self, job):
+        """ Retorna se o recurso de uma tarefa está guardado no ResourceManager
+        """
+        kind, name, arg = job
+        if kind == "image":
+            return name in surface_cache
+        if kind == "atlas":
+            return arg["image"] in surface_cache
+        if kind == "font":
+            return ("font", name, arg) in manager
+        return (kind, name) in manager
+
+    def request(self, names):
+        """ Carrega de novo, em segundo plano, os recursos do manifesto que o ResourceManager descartou
+        O progresso e o fim do carregamento são acompanhados por poll(), wait() e is_done(), como no início
+        :param names: nomes dos arquivos
+        :type names: iterable
+        """
+        names = set(names) - {job[1] for job, future in self._pending}
+        jobs = [job for job in self.jobs if job[1] in names and job[0] != "font" and not self._loaded(job)]
+        if not jobs:
+            return
+        if self._executor is None:
+            self._start = time.perf_counter()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._pending += [(job, self._executor.submit(self._load, *job)) for job in jobs]
+        self.total += len(jobs)
+
+    def _finish(self, job, result):
+        """ Instala um recurso carregado, ou registra o erro do carregamento
+        :param job: tarefa (tipo, arquivo, argumento extra)
+        :type job: tuple
+        :param result: função que retorna o recurso e o tempo de carregamento, em ms
+        :type result: function
+        """
+        try:
+            asset, ms = result()
+        except (pygame.error, OSError) as error:
+            self.errors[job[1]] = str(error)
+        else:
+            self._install(job, asset)
+            self.timings[job[1]] = ms
+        self.loaded += 1
+
+    def poll(self):
+        """ Instala os recursos que já terminaram de carregar e retorna o progresso (de 0 a 1)
+        """
+        pending = []
+        for job, future in self._pending:
+            if not future.done():
+                pending.append((job, future))
+                continue
+            self._finish(job, future.result)
+        self._pending = pending
+        if not pending and self._executor:
+            self._executor.shutdown()
+            self._executor = None
+            self.elapsed += (time.perf_counter() - self._start) * 1000
+        return self.progress()
+
+    def wait(self):
+        """ Bloqueia até que todos os recursos estejam carregados
+        """
+        for job, future in self._pending:
+            future.exception()
+        self.poll()
+
+    def progress(self):
+        """ Retorna a fração dos recursos já carregados
+        """
+        if self.total == 0:
+            return 1
+        return self.loaded / self.total
+
+    def is_done(self):
+        """ Retorna se o carregamento terminou
+        """
+        return self.loaded == self.total
+
+    def report(self, n=10):
+        """ Retorna um resumo do carregamento com os recursos mais lentos
+        :param n: quantidade de recursos listados
+        :type n: int
+        """
+        lines = [f"{self.loaded}/{self.total} recursos em {self.elapsed:.1f} ms"]
+        slowest = sorted(self.timings.items(), key=lambda item: item[1], reverse=True)
+        for name, ms in slowest[:n]:
+            lines.append(f"  {name}: {ms:.2f} ms")
+        for name, error in self.errors.items():
+            lines.append(f"  {name}: erro ({error})")
+        return "\n".join(lines)
@@ -0,0 +1,96 @@
+import time
+from collections import deque
+from functools import wraps
+
+PHASES = ("update_elements", "handle_collision", "draw_elements", "garbage_collector", "spawn")  # fases do Game
+
+
+class PhaseProfiler:
+    """ Mede o tempo gasto em cada fase do jogo
+    attach() troca os métodos das fases de um objeto por versões cronometradas, sem alterar a classe; o tempo
+    de cada fase é somado ao longo do quadro e guardado em end_frame()
+    """
+
+    def __init__(self, phases=PHASES, max_frames=None):
+        """ PhaseProfiler construtor
+        :param phases: métodos medidos. Cada fase é o caminho do método a partir do objeto medido
+            ("spawn", "player.update") ou um par (nome da fase, caminho)
+        :type phases: tuple
+        :param max_frames: quantidade de quadros guardados. Default None (todos)
+        :type max_frames: int
+        """
+        self._paths = {}
+        for phase in phases:
+            name, path = phase if isinstance(phase, tuple) else (phase, phase)
+            self._paths[name] = path
+        self.phases = tuple(self._paths)
+        # tempo, em ms, de cada fase em cada quadro
+        self.samples = {phase: deque(maxlen=max_frames) for phase in self.phases}
+        self.current = dict.fromkeys(self.phases, 0)  # tempo acumulado no quadro atual
+        self._patched = []  # (objeto, nome do método) trocados por attach()
+
+    def attach(self, target):
+        """ Passa a medir as fases de um objeto. Pode ser chamado de novo quando algum dos objetos do caminho
+        de uma fase for substituído (um novo Player, por exemplo)
+        :param target: objeto com os métodos das fases (normalmente o Game)
+        :type target: object
+        """
+        self.detach()
+        for phase, path in self._paths.items():
+            *owners, name = path.split(".")
+            owner = target
+            for attribute in owners:
+                owner = getattr(owner, attribute)
+            setattr(owner, name, self._timed(phase, getattr(owner, name)))
+            self._patched.append((owner, name))
+
+    def detach(self):
+        """ Devolve aos objetos os métodos originais
+        """
+        for owner, name in self._patched:
+            owner.__dict__.pop(name, None)
+        self._patched = []
+
+    def is_attached(self):
+        """ Retorna se as fases estão sendo medidas
+        """
+        return bool(self._patched)
+
+    def _timed(self, phase, method):
+        current = self.current
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                current[phase] += (time.perf_counter() - start) * 1000
+        return timed
+
+    def end_frame(self):
+        """ Fecha o quadro atual, guardando o tempo de cada fase
+        """
+        for phase in self.phases:
+            self.samples[phase].append(self.current[phase])
+            self.current[phase] = 0
+
+    def reset(self):
+        """ Descarta as medições
+        """
+        for phase in self.phases:
+            self.samples[phase].clear()
+            self.current[phase] = 0
+
+    def summary(self):
+        """ Retorna, para cada fase, a média e o percentil 99 do tempo por quadro, em ms
+        """
+        result = {}
+        for phase, samples in self.samples.items():
+            if not samples:
+                result[phase] = {"mean_ms": 0, "p99_ms": 0}
+                continue
+            ordered = sorted(samples)
+            result[phase] = {"mean_ms": sum(ordered) / len(ordered),
+                             "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * .99))]}
+        return result
@@ -0,0 +1,212 @@
+import numpy as np
+import pygame
+from typing import NamedTuple
+from resources import surface_cache
+
+
+class ShotBounds(NamedTuple):
+    """ Rects dos tiros de um passo, ordenados pelo lado esquerdo (ver ProjectileStore.sweep)
+    """
+    left: np.ndarray
+    top: np.ndarray
+    right: np.ndarray
+    bottom: np.ndarray
+    order: np.ndarray  # índice, nos arrays do ProjectileStore, de cada tiro na ordem acima
+    max_width: int  # largura do maior tiro
+
+
+class ProjectileStore:
+    """ Armazena todos os tiros de uma categoria (do jogador ou dos inimigos) em arrays do NumPy
+    Em vez de um objeto Laser por tiro, cada tiro é uma posição nos arrays de posição, velocidade, tamanho e
+    imagem. Mover, eliminar os que saíram da tela e testar colisões são operações vetorizadas sobre todos
+    os tiros de uma vez
+    """
+
+    def __init__(self, capacity=256):
+        """ ProjectileStore construtor
+        :param capacity: capacidade inicial dos arrays (cresce quando necessário)
+        :type capacity: int
+        """
+        self.count = 0  # quantidade de posições ocupadas nos arrays
+        self.x = np.zeros(capacity)  # centro de cada tiro
+        self.y = np.zeros(capacity)
+        self.px = np.zeros(capacity)  # centro no passo de simulação anterior, para a interpolação
+        self.py = np.zeros(capacity)
+        self.vx = np.zeros(capacity)  # velocidade, em pixels por ms
+        self.vy = np.zeros(capacity)
+        self.w = np.zeros(capacity, dtype=np.int32)  # tamanho da imagem de cada tiro
+        self.h = np.zeros(capacity, dtype=np.int32)
+        self.sprite = np.zeros(capacity, dtype=np.int32)  # índice da imagem em self.images
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.images = []  # superfícies usadas pelos tiros, indexadas pelo id do sprite
+        self._sprite_ids = {}  # (imagem, ângulo) -> id do sprite
+        self.tested = 0  # pares (tiro, rect) testados por colliding() desde o último sweep()
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[:self.count]))
+
+    def _arrays(self):
+        return ("x", "y", "px", "py", "vx", "vy", "w", "h", "sprite", "alive")
+
+    def sprite_id(self, image, angle=None):
+        """ Retorna o id da imagem (já rotacionada, se for o caso), registrando-a na primeira vez
+        :param image: nome do arquivo da imagem
+        :type image: string
+        :param angle: ângulo de rotação. Default None
+        :type angle: float
+        """
+        key = (image, angle or 0)
+        sprite = self._sprite_ids.get(key)
+        if sprite is None:
+            if angle:
+                surface = surface_cache.get_rotated(image, None, angle)[0]
+            else:
+                surface = surface_cache.get(image)
+            sprite = len(self.images)
+            self.images.append(surface)
+            self._sprite_ids[key] = sprite
+        return sprite
+
+    def spawn(self, position, velocity, image, angle=None):
+        """ Cria um tiro
+        :param position: posição do centro do tiro
+        :type position: tuple
+        :param velocity: velocidade do tiro em ambos os eixos, em pixels por ms
+        :type velocity: tuple
+        :param image: nome do arquivo da imagem
+        :type image: string
+        :param angle: ângulo da imagem. Default None
+        :type angle: float
+        """
+        sprite = self.sprite_id(image, angle)
+        if self.count == len(self.x):
+            for name in self._arrays():
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate((array, np.zeros_like(array))))
+        i = self.count
+        self.x[i], self.y[i] = position
+        self.px[i], self.py[i] = position
+        self.vx[i], self.vy[i] = velocity
+        self.w[i], self.h[i] = self.images[sprite].get_size()
+        self.sprite[i] = sprite
+        self.alive[i] = True
+        self.count += 1
+
+    def update(self, dt, area):
+        """ Move todos os tiros e elimina os que saíram da tela
+        :param dt: variação do tempo
+        :type dt: int
+        :param area: área da tela
+        :type area: pygame.Rect
+        """
+        n = self.count
+        self.px[:n] = self.x[:n]
+        self.py[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        left, top, right, bottom = self.bounds()
+        # mesmos limites de ElementSprite.check_borders
+        self.alive[:n] &= (left <= area.right) & (top <= area.bottom) & (right >= 0) & (bottom >= -40)
+        self.compact()
+
+    def bounds(self, alpha=1):
+        """ Retorna os arrays com os lados (esquerda, topo, direita, base) do rect de cada tiro
+        :param alpha: fração do passo de simulação já decorrida; com alpha < 1 a posição é interpolada
+        entre o passo anterior e o atual
+        :type alpha: float. Default 1
+        """
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        if alpha != 1:
+            x = self.px[:n] + (x - self.px[:n]) * alpha
+            y = self.py[:n] + (y - self.py[:n]) * alpha
+        left = np.floor(x).astype(np.int32) - self.w[:n] // 2
+        top = np.floor(y).astype(np.int32) - self.h[:n] // 2
+        return left, top, left + self.w[:n], top + self.h[:n]
+
+    def compact(self):
+        """ Remove dos arrays os tiros mortos, mantendo a ordem dos vivos
+        """
+        n = self.count
+        keep = self.alive[:n]
+        alive = int(np.count_nonzero(keep))
+        if alive == n:
+            return
+        for name in self._arrays():
+            array = getattr(self, name)
+            array[:alive] = array[:n][keep]
+        self.alive[alive:n] = False
+        self.count = alive
+
+    def sweep(self):
+        """ Calcula, uma vez por passo, os rects de todos os tiros, ordenados pelo lado esquerdo
+        Com eles, colliding() testa contra cada rect só a faixa de tiros que pode alcançá-lo na horizontal,
+        em vez de todos os tiros. Tiros mortos depois do sweep() continuam na ordem, mas não colidem
+        """
+        left, top, right, bottom = self.bounds()
+        order = np.argsort(left, kind='stable')
+        self.tested = 0
+        return ShotBounds(left[order], top[order], right[order], bottom[order], order,
+                          int(self.w[:self.count].max(initial=0)))
+
+    def colliding(self, rect, bounds=None):
+        """ Retorna, em ordem, os índices dos tiros vivos que colidem com o rect
+        :param rect: rect testado
+        :type rect: pygame.Rect
+        :param bounds: rects do passo, como retornados por sweep(). Default None (calculados na hora, para
+        um único teste)
+        :type bounds: ShotBounds
+        """
+        if bounds is None:
+            left, top, right, bottom = self.bounds()
+            self.tested += self.count
+            hit = (left < rect.right) & (right > rect.left) & (top < rect.bottom) & (bottom > rect.top)
+            return np.flatnonzero(hit & self.alive[:self.count])
+        # só os tiros com o lado esquerdo entre rect.left - max_width e rect.right podem tocar o rect
+        start = np.searchsorted(bounds.left, rect.left - bounds.max_width, 'right')
+        end = np.searchsorted(bounds.left, rect.right, 'left')
+        self.tested += max(end - start, 0)
+        hit = ((bounds.right[start:end] > rect.left) & (bounds.top[start:end] < rect.bottom)
+               & (bounds.bottom[start:end] > rect.top))
+        indices = bounds.order[start:end][hit]
+        return np.sort(indices[self.alive[indices]])
+
+    def rect(self, index):
+        """ Retorna o rect de um tiro
+        :param index: índice do tiro
+        :type index: int
+        """
+        w, h = int(self.w[index]), int(self.h[index])
+        return pygame.Rect(int(np.floor(self.x[index])) - w // 2, int(np.floor(self.y[index])) - h // 2, w, h)
+
+    def image(self, index):
+        """ Retorna a superfície de um tiro
+        :param index: índice do tiro
+        :type index: int
+        """
+        return self.images[self.sprite[index]]
+
+    def kill(self, index):
+        """ Marca um tiro como morto; ele sai dos arrays na próxima compactação
+        :param index: índice do tiro
+        :type index: int
+        """
+        self.alive[index] = False
+
+    def clear(self):
+        """ Remove todos os tiros
+        """
+        self.alive[:self.count] = False
+        self.count = 0
+
+    def blit_sequence(self, alpha=1):
+        """ Retorna a sequência (superfície, posição) dos tiros vivos, pronta para Surface.blits
+        :param alpha: fração do passo de simulação já decorrida, usada para interpolar as posições
+        :type alpha: float. Default 1
+        """
+        left, top, right, bottom = self.bounds(alpha)
+        alive = self.alive[:self.count]
+        images = self.images
+        return [(images[sprite], position) for sprite, position in
+                zip(self.sprite[:self.count][alive].tolist(),
+                    zip(left[alive].tolist(), top[alive].tolist()))]
@@ -0,0 +1,88 @@
+class EntityRegistry:
+    """ Contêiner das entidades de uma categoria (inimigos, power ups, explosões)
+    As entidades ficam em uma lista densa. Cada uma recebe, ao entrar, um handle estável (entity.handle) que
+    aponta para sua posição na lista, de modo que a remoção troca a entidade pela última da lista e custa O(1).
+    As remoções pedidas durante o quadro com destroy() só acontecem em flush(), no fim do quadro; até lá a
+    iteração já pula as entidades destruídas, sem nunca pular as vizinhas
+    """
+
+    def __init__(self):
+        """ EntityRegistry construtor
+        """
+        self.items = []  # entidades, sem ordem garantida
+        self._index = {}  # handle -> posição em self.items
+        self._doomed = {}  # handle -> entidade, destruídas e ainda não removidas
+        self._next_handle = 0
+
+    def __len__(self):
+        return len(self.items) - len(self._doomed)
+
+    def __iter__(self):
+        doomed = self._doomed
+        # percorre a lista por índice: entidades adicionadas durante a iteração também são visitadas
+        for entity in self.items:
+            if entity.handle not in doomed:
+                yield entity
+
+    def __getitem__(self, index):
+        # indexa só as entidades vivas, como __len__ e __iter__ (random.choice, por exemplo, usa os dois)
+        if not self._doomed:
+            return self.items[index]
+        return list(self)[index]
+
+    def __contains__(self, entity):
+        # entidades destruídas neste quadro já não fazem parte do registro
+        handle = getattr(entity, "handle", None)
+        index = self._index.get(handle)
+        return index is not None and self.items[index] is entity and handle not in self._doomed
+
+    def add(self, entity):
+        """ Registra uma entidade e retorna seu handle
+        :param entity: entidade
+        :type entity: ElementSprite
+        """
+        handle = self._next_handle
+        self._next_handle += 1
+        entity.handle = handle
+        self._index[handle] = len(self.items)
+        self.items.append(entity)
+        return handle
+
+    def get(self, handle):
+        """ Retorna a entidade de um handle, ou None se ela já foi destruída
+        :param handle: handle retornado por add()
+        :type handle: int
+        """
+        index = self._index.get(handle)
+        if index is None or handle in self._doomed:
+            return None
+        return self.items[index]
+
+    def destroy(self, entity):
+        """ Agenda a remoção de uma entidade para o fim do quadro. Entidades que não estão no registro (o que
+        inclui as já destruídas) são ignoradas
+        :param entity: entidade
+        :type entity: ElementSprite
+        """
+        if entity in self:
+            self._doomed[entity.handle] = entity
+
+    def flush(self):
+        """ Remove as entidades destruídas durante o quadro, trocando cada uma pela última da lista
+        """
+        items = self.items
+        index = self._index
+        for handle in self._doomed:
+            position = index.pop(handle)
+            last = items.pop()
+            if last.handle != handle:
+                items[position] = last
+                index[last.handle] = position
+        self._doomed.clear()
+
+    def clear(self):
+        """ Remove todas as entidades imediatamente
+        """
+        self.items.clear()
+        self._index.clear()
+        self._doomed.clear()
@@ -0,0 +1,145 @@
+import pygame
+
+SNAP_DISTANCE = 100  # deslocamentos maiores que este, em um passo, são teleportes e não são interpolados
+
+
+def interpolate(sprite, alpha):
+    """ Retorna a posição de desenho de um sprite entre o passo de simulação anterior e o atual
+    :param sprite: sprite com os atributos rect e prev_pos
+    :type sprite: elements.ElementSprite
+    :param alpha: fração do passo já decorrida
+    :type alpha: float
+    """
+    x, y = sprite.rect.topleft
+    prev = sprite.prev_pos
+    if prev is None or abs(x - prev[0]) > SNAP_DISTANCE or abs(y - prev[1]) > SNAP_DISTANCE:
+        return x, y
+    return round(prev[0] + (x - prev[0]) * alpha), round(prev[1] + (y - prev[1]) * alpha)
+
+
+def snapshot(sprites):
+    """ Guarda a posição atual dos sprites, antes de um passo de simulação
+    :param sprites: sprites
+    :type sprites: iterable
+    """
+    for sprite in sprites:
+        sprite.prev_pos = sprite.rect.topleft
+
+
+class RenderLayers:
+    """ Camadas de renderização do jogo
+    Cada camada é o contêiner de uma categoria de entidades (explosões, inimigos, tiros...), desenhado
+    inteiro com uma única chamada de Surface.blits, na ordem em que as camadas foram definidas.
+    Uma camada pode ser qualquer iterável de sprites ou um objeto com o método blit_sequence()
+    """
+
+    def __init__(self, *layers):
+        """ RenderLayers construtor
+        :param layers: pares (nome, contêiner de sprites), do fundo para a frente
+        :type layers: tuple
+        """
+        self.layers = list(layers)
+
+    def snapshot(self):
+        """ Guarda a posição de todos os sprites das camadas, antes de um passo de simulação
+        """
+        for name, layer in self.layers:
+            if not hasattr(layer, "blit_sequence"):
+                snapshot(layer)
+
+    def draw(self, screen, collect=False, alpha=1):
+        """ Desenha todas as camadas na tela e, se pedido, retorna as regiões alteradas
+        :param screen: tela em que serão desenhadas
+        :type screen: pygame.Surface
+        :param collect: define se as regiões desenhadas devem ser retornadas
+        :type collect: boolean. Default False
+        :param alpha: fração do passo de simulação já decorrida, usada para interpolar as posições
+        :type alpha: float. Default 1
+        """
+        rects = []
+        for name, layer in self.layers:
+            if layer:
+                if hasattr(layer, "blit_sequence"):
+                    # contêineres como ProjectileStore já montam a própria sequência
+                    sequence = layer.blit_sequence(alpha)
+                elif alpha == 1:
+                    sequence = [(sprite.image, sprite.rect) for sprite in layer]
+                else:
+                    sequence = [(sprite.image, interpolate(sprite, alpha)) for sprite in layer]
+                drawn = screen.blits(sequence, collect)
+                if collect:
+                    rects += drawn
+        return rects
+
+    def count(self):
+        """ Retorna a quantidade de sprites de cada camada
+        """
+        return {name: len(layer) for name, layer in self.layers}
+
+
+class DirtyRects:
+    """ Modo de renderização por regiões alteradas (dirty rectangles)
+    Em vez de redesenhar o fundo inteiro e chamar pygame.display.flip(), apaga apenas as regiões
+    ocupadas no quadro anterior e atualiza só elas e as do quadro atual com pygame.display.update(rects).
+    Quando o fundo se move, não há como aproveitar o quadro anterior e a tela inteira é atualizada
+    """
+
+    def __init__(self, enabled=False):
+        """ DirtyRects construtor
+        :param enabled: define se o modo começa ativo
+        :type enabled: boolean. Default False
+        """
+        self.enabled = enabled
+        self.previous = []  # regiões desenhadas no quadro anterior
+        self.current = []  # regiões desenhadas no quadro atual
+        self.full = True  # define se o quadro atual precisa de atualização completa
+        self._background = None
+
+    def toggle(self):
+        """ Liga ou desliga o modo
+        """
+        self.enabled = not self.enabled
+        self.full = True
+
+    def begin(self, screen, background):
+        """ Prepara o quadro: apaga as regiões do quadro anterior ou, se o fundo mudou, redesenha-o inteiro
+        :param screen: tela do jogo
+        :type screen: pygame.Surface
+        :param background: fundo do jogo
+        :type background: background.Background
+        """
+        state = (background, background.offset)
+        if not self.enabled or self.full or state != self._background:
+            self.full = True
+            background.draw(screen)
+        else:
+            for rect in self.previous:
+                background.draw_area(screen, rect)
+        self._background = state
+
+    def add(self, rect):
+        """ Registra uma região desenhada no quadro atual
+        :param rect: região desenhada
+        :type rect: pygame.Rect
+        """
+        if self.enabled:
+            self.current.append(rect)
+
+    def extend(self, rects):
+        """ Registra várias regiões desenhadas no quadro atual
+        :param rects: regiões desenhadas
+        :type rects: list
+        """
+        if self.enabled:
+            self.current += rects
+
+    def present(self):
+        """ Envia o quadro para o display
+        """
+        if self.full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous + self.current)
+        self.previous = self.current
+        self.current = []
+        self.full = not self.enabled
@@ -0,0 +1,147 @@
+import time
+import struct
+import argparse
+from inputs import InputSnapshot, HELD_KEYS, PRESSED_KEYS
+
+# Gravação e reprodução das entradas de uma sessão.
+# A cada passo de simulação, o estado das entradas cabe em 16 bits: as teclas seguradas e as teclas
+# apertadas naquele passo. Junto com a semente do gerador aleatório da sessão, isso basta para repetir
+# a sessão exatamente. Uso (a partir da pasta coronashooter):
+#   python replay.py sessao.rec
+
+QUIT_BIT = 1 << (len(HELD_KEYS) + len(PRESSED_KEYS))
+
+MAGIC = b"TRPY"
+VERSION = 4  # muda quando a simulação muda: gravações de versões anteriores não se repetem mais
+HEADER = struct.Struct("<4sBQdI")  # assinatura, versão, semente, passos por segundo, quantidade de trechos
+RUN = struct.Struct("<HH")  # trecho de passos repetidos: quantidade, estado das entradas
+MAX_RUN = 0xFFFF
+
+
+def encode(inputs):
+    """ Codifica as entradas de um passo em um inteiro de 16 bits
+    :param inputs: entradas do passo
+    :type inputs: inputs.InputSnapshot
+    """
+    state = 0
+    for bit, key in enumerate(HELD_KEYS):
+        if key in inputs.held:
+            state |= 1 << bit
+    for bit, key in enumerate(PRESSED_KEYS, len(HELD_KEYS)):
+        if key in inputs.pressed:
+            state |= 1 << bit
+    if inputs.quit:
+        state |= QUIT_BIT
+    return state
+
+
+def decode(state, tick):
+    """ Decodifica o estado de um passo
+    :param state: estado codificado por encode()
+    :type state: int
+    :param tick: passo das entradas
+    :type tick: int
+    """
+    held = frozenset(key for bit, key in enumerate(HELD_KEYS) if state & (1 << bit))
+    pressed = frozenset(key for bit, key in enumerate(PRESSED_KEYS, len(HELD_KEYS)) if state & (1 << bit))
+    return InputSnapshot(tick, held, pressed, quit=bool(state & QUIT_BIT))
+
+
+class InputRecording:
+    """ Gravação das entradas de uma sessão, passo a passo
+    No arquivo, passos consecutivos com o mesmo estado são guardados como um único trecho (run-length)
+    """
+
+    def __init__(self, seed, tick_rate):
+        """ InputRecording construtor
+        :param seed: semente do gerador aleatório da sessão
+        :type seed: int
+        :param tick_rate: passos de simulação por segundo da sessão
+        :type tick_rate: float
+        """
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.states = []  # estado das entradas em cada passo
+
+    def __len__(self):
+        return len(self.states)
+
+    def record(self, inputs):
+        """ Grava as entradas de um passo
+        :param inputs: entradas do passo
+        :type inputs: inputs.InputSnapshot
+        """
+        self.states.append(encode(inputs))
+
+    def inputs(self):
+        """ Gera as entradas de cada passo gravado
+        """
+        for tick, state in enumerate(self.states):
+            yield decode(state, tick)
+
+    def save(self, path):
+        """ Salva a gravação em um arquivo binário
+        :param path: caminho do arquivo
+        :type path: string
+        """
+        runs = []
+        for state in self.states:
+            if runs and runs[-1][1] == state and runs[-1][0] < MAX_RUN:
+                runs[-1][0] += 1
+            else:
+                runs.append([1, state])
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.seed, self.tick_rate, len(runs)))
+            for count, state in runs:
+                file.write(RUN.pack(count, state))
+
+    @classmethod
+    def load(cls, path):
+        """ Carrega uma gravação salva por save()
+        :param path: caminho do arquivo
+        :type path: string
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, version, seed, tick_rate, n_runs = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} não é uma gravação de entradas válida")
+        recording = cls(seed, tick_rate)
+        for count, state in RUN.iter_unpack(data[HEADER.size:HEADER.size + n_runs * RUN.size]):
+            recording.states += [state] * count
+        return recording
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduz uma sessão gravada do TroPHY.exe")
+    parser.add_argument("recording")
+    parser.add_argument("--slowest", type=int, default=5, help="quantidade de passos mais lentos listados")
+    args = parser.parse_args(argv)
+
+    from main import Game
+    recording = InputRecording.load(args.recording)
+    game = Game(headless=True, seed=recording.seed, tick_rate=recording.tick_rate)
+    step_times = []
+    for inputs in recording.inputs():
+        if not game.running:
+            break
+        start = time.perf_counter()
+        game.tick(inputs)
+        step_times.append((time.perf_counter() - start) * 1000)
+    total = sum(step_times)
+    # depois de um game over o Player já foi trocado por um novo, e o placar da partida fica em last_score
+    score = game.player.get_score() if game.start else game.last_score
+    print(f"{len(step_times)} passos reproduzidos em {total:.0f} ms "
+          f"({len(step_times) * game.dt / max(total, 1e-9):.1f}x o tempo real), placar {score}")
+    slowest = sorted(range(len(step_times)), key=step_times.__getitem__, reverse=True)
+    for tick in slowest[:args.slowest]:
+        print(f"  passo {tick}: {step_times[tick]:.2f} ms")
+    from audio import voices
+    print(voices.report())
+    print(game.music.report())
+    from resources import manager
+    print(manager.dump())
+
+
+if __name__ == '__main__':
+    main()
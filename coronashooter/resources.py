@@ -0,0 +1,515 @@
+import pygame
+import os
+import io
+import json
+import weakref
+from collections import OrderedDict, defaultdict
+
+ROTATION_STEP = 15  # intervalo, em graus, entre as variantes rotacionadas pré-calculadas
+MEMORY_BUDGET = 64 * 1024 * 1024  # memória, em bytes, que os recursos carregados podem ocupar
+
+
+class ResourceManager:
+    """ Dono de todos os recursos carregados: superfícies, efeitos sonoros, fontes e músicas
+    Cada recurso é guardado com o seu tamanho em bytes, na ordem do uso mais recente. Quando a soma passa do
+    orçamento, os recursos usados há mais tempo são descartados. Recursos de um arquivo com referências (acquire)
+    nunca são descartados: o jogo fixa assim tudo o que a cena atual pode desenhar, e os arquivos descartados só
+    são carregados de novo pelo Preloader, em segundo plano.
+    Um recurso descartado que ainda é usado fora do ResourceManager (a imagem de um sprite guardado em um pool,
+    por exemplo) não libera memória: ele continua contado em self.used até ser de fato liberado, e volta a ser
+    guardado, sem ser carregado de novo, se for pedido antes disso
+    """
+
+    def __init__(self, budget=MEMORY_BUDGET):
+        """ ResourceManager construtor
+        :param budget: memória, em bytes, que os recursos podem ocupar
+        :type budget: int
+        """
+        self.budget = budget
+        self._assets = OrderedDict()  # chave -> (recurso, bytes), do uso menos recente para o mais recente
+        self._parts = {}  # chave -> [(objeto, bytes)] dos recursos cuja memória está em vários objetos
+        self._held = {}  # chave -> (weakref, bytes, finalizers) dos descartados ainda usados fora daqui
+        self._refs = defaultdict(int)  # arquivo -> quantidade de referências
+        self.used = 0  # bytes ocupados pelos recursos guardados e pelos descartados ainda em uso
+        self.held = 0  # parte de self.used ocupada pelos recursos descartados ainda em uso
+        self.peak = 0  # maior valor de self.used
+        self.evictions = 0  # recursos descartados para respeitar o orçamento
+
+    def __contains__(self, key):
+        return key in self._assets or (key in self._held and self._held[key][0]() is not None)
+
+    def get(self, key):
+        """ Retorna o recurso de uma chave, ou None se ele não está guardado
+        A chave é uma tupla (tipo, arquivo, ...), como ("sound", "PlayerShoot.ogg")
+        :param key: chave do recurso
+        :type key: tuple
+        """
+        entry = self._assets.get(key)
+        if entry is None:
+            return self._revive(key)
+        self._assets.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, asset, size, parts=None):
+        """ Guarda um recurso e descarta os usados há mais tempo, se o orçamento for ultrapassado
+        :param key: chave do recurso
+        :type key: tuple
+        :param asset: recurso
+        :type asset: object
+        :param size: memória ocupada pelo recurso, em bytes
+        :type size: int
+        :param parts: objetos que guardam a memória do recurso e os bytes de cada um, quando não é o próprio
+        recurso (as superfícies de uma tabela de rotações, por exemplo). Default None
+        :type parts: list
+        """
+        self.discard(key)
+        self._assets[key] = (asset, size)
+        if parts is not None:
+            self._parts[key] = parts
+        self.used += size
+        self.evict()
+        self.peak = max(self.peak, self.used)
+        return asset
+
+    def discard(self, key):
+        """ Descarta um recurso, se ele estiver guardado. A memória só deixa de ser contada quando o recurso
+        (ou cada uma de suas partes) deixa de ser usado
+        :param key: chave do recurso
+        :type key: tuple
+        """
+        entry = self._assets.pop(key, None)
+        if entry is None:
+            return
+        asset, size = entry
+        parts = self._parts.pop(key, None)
+        finalizers = []
+        for part, part_size in parts if parts is not None else [(asset, size)]:
+            if not part_size:
+                continue
+            try:
+                finalizer = weakref.finalize(part, self._freed, key, part_size, finalizers)
+            except TypeError:  # objetos sem weakref (bytes, listas) só são usados aqui: a memória é liberada já
+                self.used -= part_size
+                continue
+            finalizer.atexit = False
+            finalizers.append(finalizer)
+            self.held += part_size
+        if finalizers and parts is None:
+            self._held[key] = (weakref.ref(asset), size, finalizers)
+
+    def _freed(self, key, size, finalizers):
+        """ Desconta a memória de um recurso descartado quando ele é de fato liberado
+        """
+        self.used -= size
+        self.held -= size
+        held = self._held.get(key)
+        if held is not None and held[2] is finalizers:  # a chave pode já ter sido guardada e descartada de novo
+            del self._held[key]
+
+    def _revive(self, key):
+        """ Volta a guardar um recurso descartado que ainda está em uso, sem carregá-lo de novo
+        """
+        held = self._held.pop(key, None)
+        if held is None:
+            return None
+        ref, size, finalizers = held
+        asset = ref()
+        if asset is None:
+            return None
+        for finalizer in finalizers:
+            finalizer.detach()
+        self.used -= size
+        self.held -= size
+        return self.put(key, asset, size)
+
+    def keys(self, kind):
+        """ Retorna as chaves guardadas de um tipo de recurso
+        :param kind: tipo do recurso ("surface", "sound"...)
+        :type kind: string
+        """
+        return [key for key in self._assets if key[0] == kind]
+
+    def acquire(self, name):
+        """ Acrescenta uma referência a um arquivo: seus recursos não são descartados até o release()
+        :param name: nome do arquivo
+        :type name: string
+        """
+        self._refs[name] += 1
+
+    def release(self, name):
+        """ Retira uma referência de um arquivo
+        :param name: nome do arquivo
+        :type name: string
+        """
+        if self._refs[name] <= 1:
+            del self._refs[name]
+        else:
+            self._refs[name] -= 1
+
+    def evict(self):
+        """ Descarta os recursos sem referências usados há mais tempo até que o orçamento seja respeitado
+        Entradas sem memória própria (variantes que compartilham a superfície original) também são descartadas,
+        já que podem ser o que ainda prende a superfície
+        """
+        refs = self._refs
+        for key in list(self._assets):
+            if self.used <= self.budget:
+                break
+            if key[1] not in refs:
+                self.discard(key)
+                self.evictions += 1
+
+    def clear(self):
+        """ Descarta todos os recursos
+        """
+        for key in list(self._assets):
+            self.discard(key)
+
+    def stats(self):
+        """ Retorna a memória ocupada, em bytes, no total e por arquivo
+        """
+        files = defaultdict(int)
+        for key, (asset, size) in self._assets.items():
+            files[key[1]] += size
+        return {"used": self.used, "held": self.held, "peak": self.peak, "budget": self.budget,
+                "evictions": self.evictions, "assets": len(self._assets), "files": dict(files)}
+
+    def dump(self):
+        """ Retorna a memória ocupada por arquivo, do maior para o menor, em linhas de texto
+        """
+        stats = self.stats()
+        lines = [f"recursos: {stats['used'] / 1024:.0f} KB de {self.budget / 1024:.0f} KB "
+                 f"(pico {stats['peak'] / 1024:.0f} KB), {stats['assets']} guardados, "
+                 f"{self.evictions} descartados ({stats['held'] / 1024:.0f} KB ainda em uso)"]
+        for name, size in sorted(stats["files"].items(), key=lambda item: -item[1]):
+            pinned = f" ({self._refs[name]} ref.)" if name in self._refs else ""
+            lines.append(f"  {name}: {size / 1024:.1f} KB{pinned}")
+        return "\n".join(lines)
+
+
+def surface_bytes(surface):
+    """ Retorna a memória ocupada pelos pixels de uma superfície. Subsuperfícies compartilham os pixels da
+    superfície mãe e não ocupam memória própria
+    :param surface: superfície
+    :type surface: pygame.Surface
+    """
+    if surface.get_parent() is not None:
+        return 0
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+
+def mask_bytes(mask):
+    """ Retorna a memória ocupada por uma máscara de colisão (um bit por pixel)
+    :param mask: máscara
+    :type mask: pygame.mask.Mask
+    """
+    width, height = mask.get_size()
+    return (width + 7) // 8 * height
+
+
+def sound_bytes(sound):
+    """ Retorna a memória ocupada pelas amostras de um efeito sonoro
+    :param sound: efeito sonoro
+    :type sound: pygame.mixer.Sound
+    """
+    frequency, size, channels = pygame.mixer.get_init()
+    return int(sound.get_length() * frequency) * channels * abs(size) // 8
+
+
+manager = ResourceManager()  # gerenciador único dos recursos do jogo
+
+
+class SurfaceCache:
+    """ Cache de imagens compartilhado por todo o processo
+    Cada superfície é guardada já convertida, escalada e rotacionada, indexada por (arquivo, tamanho, ângulo),
+    de modo que criar um novo sprite não precise acessar o disco nem decodificar o PNG novamente. As superfícies
+    ficam no ResourceManager, que pode descartá-las para respeitar o orçamento de memória.
+    Com enable_masks(), cada variante ganha também a sua máscara de colisão, criada junto com a superfície
+    """
+
+    def __init__(self, folder='images', resources=None):
+        """ SurfaceCache construtor
+        :param folder: pasta onde estão as imagens
+        :type folder: string
+        :param resources: gerenciador onde as superfícies são guardadas. Default None (o gerenciador do jogo)
+        :type resources: ResourceManager
+        """
+        self.folder = folder
+        self.resources = resources or manager
+        self.hits = 0  # pedidos atendidos pelo cache
+        self.misses = 0  # pedidos que precisaram carregar ou transformar a imagem
+        self.loads = 0  # imagens lidas do disco pelo próprio cache, fora do Preloader
+        self.masks = None  # superfície -> máscara de colisão, quando as máscaras estão ligadas
+
+    def enable_masks(self):
+        """ Passa a criar a máscara de colisão de cada variante, junto com a superfície, e cria as máscaras das
+        superfícies já guardadas
+        As máscaras ficam associadas às próprias superfícies e somem junto com elas
+        """
+        if self.masks is not None:
+            return
+        self.masks = weakref.WeakKeyDictionary()
+        for key in self.resources.keys("surface"):
+            self._mask(self.resources.get(key))
+        for key in self.resources.keys("rotations"):
+            for surface, offset in self.resources.get(key):
+                self._mask(surface)
+
+    def _mask(self, surface):
+        """ Cria a máscara de uma superfície, se as máscaras estiverem ligadas, e retorna a memória ocupada
+        """
+        if self.masks is None or surface in self.masks:
+            return 0
+        mask = self.masks[surface] = pygame.mask.from_surface(surface)
+        return mask_bytes(mask)
+
+    def get_mask(self, surface):
+        """ Retorna a máscara de colisão de uma superfície do cache, ou None se ela não tiver máscara
+        As máscaras nunca são criadas aqui: só junto com a superfície (ou em enable_masks())
+        :param surface: superfície
+        :type surface: pygame.Surface
+        """
+        if self.masks is None:
+            return None
+        return self.masks.get(surface)
+
+    @staticmethod
+    def make_key(image, size=None, angle=None):
+        """ Normaliza a chave do cache
+        :param image: nome do arquivo da imagem
+        :type image: string
+        :param size: tamanho desejado. Default None (tamanho original)
+        :type size: tuple
+        :param angle: ângulo de rotação. Default None (sem rotação)
+        :type angle: float
+        """
+        return (image, tuple(size) if size else None, angle or 0)
+
+    def get(self, image, size=None, angle=None):
+        """ Retorna a superfície pedida, carregando-a apenas na primeira vez
+        :param image: nome do arquivo da imagem
+        :type image: string
+        :param size: tamanho desejado. Default None (tamanho original)
+        :type size: tuple
+        :param angle: ângulo de rotação. Default None (sem rotação)
+        :type angle: float
+        """
+        key = self.make_key(image, size, angle)
+        surface = self.resources.get(("surface",) + key)
+        if surface is None:
+            self.misses += 1
+            surface = self._build(*key)
+        else:
+            self.hits += 1
+        return surface
+
+    def rotation_table(self, image, size=None):
+        """ Retorna a tabela de variantes rotacionadas de um sprite, construindo-a inteira na primeira vez
+        Cada entrada é um par (superfície, deslocamento), onde o deslocamento é a posição do canto
+        superior esquerdo do rect rotacionado em relação ao centro do sprite
+        :param image: nome do arquivo da imagem
+        :type image: string
+        :param size: tamanho desejado. Default None (tamanho original)
+        :type size: tuple
+        """
+        key = ("rotations", image, tuple(size) if size else None)
+        table = self.resources.get(key)
+        if table is None:
+            table = []
+            parts = []  # as superfícies rotacionadas podem continuar em uso (nos tiros) depois da tabela
+            base = self._lookup(image, key[2], 0)
+            for angle in range(0, 360, ROTATION_STEP):
+                # as variantes só ficam na tabela; a versão sem rotação é a superfície já guardada
+                surface = pygame.transform.rotate(base, angle) if angle else base
+                if angle:
+                    parts.append((surface, surface_bytes(surface) + self._mask(surface)))
+                width, height = surface.get_size()
+                table.append((surface, (-(width // 2), -(height // 2))))
+            self.resources.put(key, table, sum(size for surface, size in parts), parts)
+        return table
+
+    def get_rotated(self, image, size=None, angle=0):
+        """ Retorna a variante rotacionada mais próxima do ângulo pedido e o deslocamento do seu rect
+        :param image: nome do arquivo da imagem
+        :type image: string
+        :param size: tamanho desejado. Default None (tamanho original)
+        :type size: tuple
+        :param angle: ângulo de rotação
+        :type angle: float
+        """
+        if ("rotations", image, tuple(size) if size else None) in self.resources:
+            self.hits += 1
+        else:
+            self.misses += 1
+        table = self.rotation_table(image, size)
+        return table[round((angle % 360) / ROTATION_STEP) % len(table)]
+
+    def add(self, image, surface):
+        """ Guarda uma imagem já carregada (pelo Preloader, por exemplo) como versão original do arquivo
+        :param image: nome do arquivo da imagem
+        :type image: string
+        :param surface: superfície carregada
+        :type surface: pygame.Surface
+        """
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        self.resources.put(("surface", image, None, 0), surface, surface_bytes(surface) + self._mask(surface))
+
+    def add_atlas(self, index, atlas):
+        """ Registra as regiões de um atlas de textura (gerado por atlas.py) como imagens do cache
+        Cada região é uma subsuperfície do atlas, sem cópia dos pixels. O atlas e as regiões ficam guardados com
+        uma referência permanente, já que as regiões não liberariam sua memória e não podem ser carregadas de novo
+        sem o atlas
+        :param index: índice do atlas, com o retângulo de cada região
+        :type index: dict
+        :param atlas: superfície do atlas
+        :type atlas: pygame.Surface
+        """
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        self.resources.acquire(index["image"])
+        size = surface_bytes(atlas)
+        for name, rect in index["regions"].items():
+            self.resources.acquire(name)
+            region = atlas.subsurface(rect)
+            size += self._mask(region)  # as máscaras das regiões são contadas junto com o atlas
+            self.resources.put(("surface", name, None, 0), region, 0)
+        self.resources.put(("surface", index["image"], None, 0), atlas, size)
+
+    def load_atlas(self, path):
+        """ Carrega um atlas de textura a partir do seu índice
+        :param path: nome do arquivo de índice do atlas, na pasta de imagens
+        :type path: string
+        """
+        with open(os.path.join(self.folder, path)) as file:
+            index = json.load(file)
+        self.add_atlas(index, pygame.image.load(
+            os.path.join(self.folder, index["image"])))
+
+    def __contains__(self, image):
+        return ("surface", image, None, 0) in self.resources
+
+    def _build(self, image, size, angle):
+        """ Cria a superfície de uma chave ausente, reaproveitando as etapas anteriores já guardadas
+        """
+        shared = False  # superfícies compartilhadas com outra chave já estão contadas no orçamento
+        if angle:
+            # rotaciona a versão já escalada
+            surface = pygame.transform.rotate(
+                self._lookup(image, size, 0), angle)
+        elif size:
+            surface = self._lookup(image, None, 0)
+            # imagens usadas no tamanho original compartilham a mesma superfície
+            if surface.get_size() != size:
+                surface = pygame.transform.scale(surface, size)
+            else:
+                shared = True
+        else:
+            # no jogo, os arquivos de cada cena são fixados e carregados pelo Preloader antes de serem usados;
+            # esta leitura fica para as ferramentas (benchmark.py, atlas.py) e para imagens fora do manifesto
+            self.loads += 1
+            surface = pygame.image.load(os.path.join(self.folder, image))
+            # .convert_alpha() só é possível depois de criado o display
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+        if shared:
+            return self.resources.put(("surface", image, size, angle), surface, 0)
+        return self.resources.put(("surface", image, size, angle), surface,
+                                  surface_bytes(surface) + self._mask(surface))
+
+    def _lookup(self, image, size, angle):
+        """ Busca uma etapa intermediária sem alterar os contadores
+        """
+        surface = self.resources.get(("surface", image, size, angle))
+        if surface is None:
+            surface = self._build(image, size, angle)
+        return surface
+
+    def clear(self):
+        """ Esvazia o cache e zera os contadores
+        """
+        for key in self.resources.keys("surface") + self.resources.keys("rotations"):
+            self.resources.discard(key)
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    def stats(self):
+        """ Retorna os contadores do cache
+        """
+        return {"surfaces": len(self.resources.keys("surface")),
+                "rotation_tables": len(self.resources.keys("rotations")),
+                "hits": self.hits, "misses": self.misses, "loads": self.loads}
+
+
+surface_cache = SurfaceCache()  # cache único usado por todos os sprites
+
+
+def get_sound(path):
+    """Retorna o efeito sonoro pedido, presente na pasta /songs, carregando-o apenas na primeira vez
+    param path: nome do arquivo do efeito sonoro
+    type path: string
+    """
+    sound = manager.get(("sound", path))
+    if sound == None:
+        # Corrige path para qualquer OS
+        correctpath = os.path.join('songs', path)
+        sound = add_sound(path, pygame.mixer.Sound(correctpath))
+    return sound
+
+
+def add_sound(path, sound):
+    """Guarda um efeito sonoro já carregado (pelo Preloader, por exemplo) e o retorna
+    param path: nome do arquivo do efeito sonoro
+    type path: string
+    param sound: efeito sonoro carregado
+    type sound: pygame.mixer.Sound
+    """
+    return manager.put(("sound", path), sound, sound_bytes(sound))
+
+
+def get_font(path, size):
+    """Retorna a fonte pedida, presente na pasta /fonts, carregando-a apenas na primeira vez
+    param path: nome do arquivo da fonte
+    type path: string
+    param size: tamanho da fonte
+    type size: int
+    """
+    font = manager.get(("font", path, size))
+    if font == None:
+        font = add_font(path, size, pygame.font.Font(os.path.join('fonts', path), size))
+    return font
+
+
+def add_font(path, size, font):
+    """Guarda uma fonte já carregada e a retorna. A memória da fonte é estimada pelo tamanho do arquivo
+    param path: nome do arquivo da fonte
+    type path: string
+    param size: tamanho da fonte
+    type size: int
+    param font: fonte carregada
+    type font: pygame.font.Font
+    """
+    return manager.put(("font", path, size), font, os.path.getsize(os.path.join('fonts', path)))
+
+
+def add_music(path, data):
+    """Guarda o conteúdo já lido de um arquivo de música
+    param path: nome do arquivo da música
+    type path: string
+    param data: conteúdo do arquivo
+    type data: bytes
+    """
+    manager.put(("music", path), data, len(data))
+
+
+def music_file(path):
+    """Retorna a música a ser carregada por pygame.mixer.music: o conteúdo já lido, se houver, ou o caminho do arquivo
+    param path: nome do arquivo da música
+    type path: string
+    """
+    data = manager.get(("music", path))
+    if data == None:
+        return os.path.join('songs', path)
+    return io.BytesIO(data)
@@ -0,0 +1,93 @@
+class SpatialHash:
+    """ Grade uniforme para a fase ampla (broadphase) das colisões
+    Cada sprite é registrado em todas as células que seu rect, expandido por uma margem, ocupa. Assim,
+    um objeto pequeno (menor que a margem) só pode colidir com os sprites registrados na célula do seu
+    centro, e testá-lo custa uma única busca na grade. Os pares encontrados depois passam pelo teste
+    exato de colliderect
+    """
+
+    def __init__(self, cell_size=64, margin=16):
+        """ SpatialHash construtor
+        :param cell_size: lado de cada célula, em pixels
+        :type cell_size: int
+        :param margin: expansão, em pixels, de cada lado dos rects registrados
+        :type margin: int
+        """
+        self.cell_size = cell_size
+        self.margin = margin
+        self.cells = {}
+
+    def clear(self):
+        """ Esvazia a grade
+        """
+        self.cells.clear()
+
+    def _keys(self, rect, margin=0):
+        """ Gera as chaves das células ocupadas por um rect expandido pela margem
+        """
+        size = self.cell_size
+        for x in range((rect.left - margin) // size, (rect.right + margin - 1) // size + 1):
+            for y in range((rect.top - margin) // size, (rect.bottom + margin - 1) // size + 1):
+                yield (x, y)
+
+    def insert(self, sprite):
+        """ Registra um sprite nas células que ele ocupa
+        :param sprite: sprite com atributo rect
+        :type sprite: pygame.sprite.Sprite
+        """
+        for key in self._keys(sprite.rect, self.margin):
+            cell = self.cells.get(key)
+            if cell is None:
+                self.cells[key] = [sprite]
+            else:
+                cell.append(sprite)
+
+    def build(self, sprites):
+        """ Reconstrói a grade com os sprites dados
+        :param sprites: sprites a registrar
+        :type sprites: list
+        """
+        self.cells.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def query(self, rect):
+        """ Retorna, sem repetições e em ordem determinística, os sprites registrados que podem tocar o rect
+        :param rect: região consultada
+        :type rect: pygame.Rect
+        """
+        found = {}
+        for key in self._keys(rect):
+            cell = self.cells.get(key)
+            if cell:
+                for sprite in cell:
+                    found[sprite] = None
+        return list(found)
+
+    def candidates(self, sprites):
+        """ Percorre os sprites dados e retorna, para cada sprite registrado na grade, a lista dos que
+        podem tocá-lo, na ordem em que aparecem
+        :param sprites: sprites a testar contra os registrados
+        :type sprites: list
+        """
+        cells = self.cells
+        size = self.cell_size
+        small = 2 * self.margin
+        result = {}
+        for sprite in sprites:
+            rect = sprite.rect
+            if rect.width <= small and rect.height <= small:
+                # caso mais comum (tiros): basta a célula do centro
+                center = rect.center
+                found = cells.get((center[0] // size, center[1] // size))
+                if not found:
+                    continue
+            else:
+                found = self.query(rect)
+            for other in found:
+                lst = result.get(other)
+                if lst is None:
+                    result[other] = [sprite]
+                else:
+                    lst.append(sprite)
+        return result
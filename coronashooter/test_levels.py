@@ -0,0 +1,41 @@
+import random
+from elements import Spider, Shooter, PowerUp
+from levels import load_levels, compile_level, SpawnTimeline, SpawnEntry
+
+
+def test_compile_level_sorts_the_whole_level():
+    levels = load_levels()
+    timeline = compile_level(levels, 1, "red", random.Random(3))
+    times = [entry.time for entry in timeline.entries]
+    assert times == sorted(times)
+    assert timeline.duration == levels["duration"]
+    assert all(time < levels["duration"] for time in times)
+    enemies = [entry for entry in timeline.entries if entry.kind is not PowerUp]
+    power_ups = [entry for entry in timeline.entries if entry.kind is PowerUp]
+    # a fase 1 só tem aranhas e atiradores, com o intervalo do arquivo
+    definition = levels["levels"][1]
+    assert {entry.kind for entry in enemies} == {Spider, Shooter}
+    assert all(entry.color == "red" for entry in enemies)
+    assert [entry.time for entry in enemies][:2] == [definition["first_enemy"],
+                                                     definition["first_enemy"] + definition["enemy_interval"]]
+    assert all(1 <= entry.power <= 4 for entry in power_ups)
+    assert len(power_ups) == (levels["duration"] - 1) // levels["power_up_interval"]
+
+
+def test_compile_level_is_deterministic():
+    levels = load_levels()
+    first = compile_level(levels, 3, "blue", random.Random(7))
+    second = compile_level(levels, 3, "blue", random.Random(7))
+    assert first.entries == second.entries
+
+
+def test_advance_returns_due_entries_and_loops():
+    entries = [SpawnEntry(time, Spider, 0, 0) for time in (10, 20, 20, 50)]
+    timeline = SpawnTimeline(entries, 60)
+    assert timeline.advance(5) == []
+    assert timeline.advance(15) == entries[:3]
+    assert timeline.advance(10) == []
+    # passa do fim: o restante da volta e o início da próxima
+    assert timeline.advance(50) == entries[3:] + entries[:3]
+    assert timeline.loops == 1
+    assert timeline.time == 20
@@ -0,0 +1,46 @@
+from pool import Pool
+
+
+class Thing:
+    """ Objeto falso de um pool
+    """
+    generation = 0
+
+    def __init__(self, value=0):
+        self.value = value
+
+
+def test_released_objects_wait_a_full_frame():
+    pool = Pool(Thing)
+    thing = pool.acquire(1)
+    pool.release(thing)
+    assert pool.acquire(2) is not thing  # morto neste quadro
+    pool.recycle()
+    assert pool.acquire(3) is not thing  # morto no quadro anterior: ainda esfriando
+    pool.recycle()
+    reused = pool.acquire(4)
+    assert reused is thing
+    assert reused.value == 4  # reiniciado pelo construtor
+    assert reused.pool is pool
+    assert pool.stats() == {"created": 3, "reused": 1, "active": 3, "high_water": 3, "free": 0}
+
+
+def test_generation_changes_on_every_reuse():
+    pool = Pool(Thing)
+    thing = pool.acquire()
+    generation = thing.generation
+    pool.release(thing)
+    pool.recycle()
+    pool.recycle()
+    assert pool.acquire() is thing
+    assert thing.generation == generation + 1
+
+
+def test_high_water_tracks_active_objects():
+    pool = Pool(Thing)
+    things = [pool.acquire() for _ in range(3)]
+    for thing in things:
+        pool.release(thing)
+    pool.acquire()
+    assert pool.active == 1
+    assert pool.high_water == 3
@@ -0,0 +1,66 @@
+import random
+import pygame
+import pytest
+from projectiles import ProjectileStore
+
+AREA = pygame.Rect(0, 0, 640, 640)
+
+
+@pytest.fixture
+def store(display):
+    return ProjectileStore(capacity=4)
+
+
+def test_update_moves_and_drops_shots_off_screen(store):
+    store.spawn((100, 100), (0, -.5), "tironave1.png")
+    store.spawn((200, 10), (0, -1), "tironave1.png")
+    store.spawn((300, 100), (.5, 0), "tironave1.png")
+    store.update(100, AREA)
+    # o segundo tiro saiu pelo topo; os outros mantêm a ordem
+    assert len(store) == store.count == 2
+    assert store.x[:2].tolist() == [100, 350]
+    assert store.y[:2].tolist() == [50, 100]
+    assert store.px[:2].tolist() == [100, 300]
+
+
+def test_kill_removes_shot_on_next_update(store):
+    for x in (100, 200, 300):
+        store.spawn((x, 100), (0, 0), "tironave1.png")
+    store.kill(1)
+    assert len(store) == 2
+    assert store.count == 3
+    store.update(16, AREA)
+    assert store.count == 2
+    assert store.x[:2].tolist() == [100, 300]
+
+
+def test_arrays_grow_past_capacity(store):
+    for x in range(10):
+        store.spawn((x * 10, 100), (0, 0), "tironave1.png")
+    assert len(store) == 10
+    assert store.x[:10].tolist() == [x * 10 for x in range(10)]
+
+
+def test_sweep_finds_same_shots_as_brute_force(store):
+    rng = random.Random(1)
+    for _ in range(500):
+        store.spawn((rng.randint(0, 640), rng.randint(0, 640)), (0, 0), "tironave1.png")
+    store.kill(7)
+    rects = [pygame.Rect(rng.randint(0, 600), rng.randint(0, 600), rng.randint(10, 90), rng.randint(10, 90))
+             for _ in range(50)]
+    bounds = store.sweep()
+    swept = [store.colliding(rect, bounds).tolist() for rect in rects]
+    tested = store.tested
+    brute = [store.colliding(rect).tolist() for rect in rects]
+    assert swept == brute
+    assert any(swept)
+    assert all(7 not in hits for hits in swept)
+    assert tested < 50 * 500  # o sweep testa só a faixa de tiros próxima de cada rect
+    for hits, rect in zip(brute, rects):
+        assert all(store.rect(i).colliderect(rect) for i in hits)
+
+
+def test_colliding_without_shots(store):
+    bounds = store.sweep()
+    assert store.colliding(pygame.Rect(0, 0, 640, 640), bounds).tolist() == []
+    assert store.colliding(pygame.Rect(0, 0, 640, 640)).tolist() == []
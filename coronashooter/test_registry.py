@@ -0,0 +1,93 @@
+from registry import EntityRegistry
+
+
+class Entity:
+    """ Entidade falsa: o registro só precisa guardar o atributo handle
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+
+def names(registry):
+    return [entity.name for entity in registry]
+
+
+def make(count):
+    registry = EntityRegistry()
+    entities = [Entity(name) for name in "abcdefgh"[:count]]
+    for entity in entities:
+        registry.add(entity)
+    return registry, entities
+
+
+def test_destroy_is_deferred_until_flush():
+    registry, (a, b, c) = make(3)
+    registry.destroy(b)
+    # até o flush(), a entidade continua na lista, mas já não faz parte do registro
+    assert registry.items == [a, b, c]
+    assert names(registry) == ["a", "c"]
+    assert len(registry) == 2
+    assert b not in registry
+    assert registry.get(b.handle) is None
+    assert registry[1] is c
+    registry.flush()
+    assert registry.items == [a, c]
+    assert registry.get(b.handle) is None
+
+
+def test_flush_swaps_last_entity_into_removed_position():
+    registry, (a, b, c, d, e) = make(5)
+    registry.destroy(a)
+    registry.destroy(c)
+    registry.flush()
+    assert registry.items == [e, b, d]
+    for entity in (b, d, e):
+        assert entity in registry
+        assert registry.get(entity.handle) is entity
+    assert registry.get(a.handle) is None
+    assert registry.get(c.handle) is None
+
+
+def test_flush_removes_last_entities():
+    registry, (a, b, c, d) = make(4)
+    registry.destroy(c)
+    registry.destroy(d)
+    registry.destroy(a)
+    registry.flush()
+    assert registry.items == [b]
+    assert registry.get(b.handle) is b
+
+
+def test_destroy_twice_and_destroy_outsider_are_ignored():
+    registry, (a, b) = make(2)
+    registry.destroy(a)
+    registry.destroy(a)
+    registry.destroy(Entity("x"))
+    registry.flush()
+    assert registry.items == [b]
+    registry.destroy(a)
+    registry.flush()
+    assert registry.items == [b]
+
+
+def test_iteration_visits_entities_added_during_it():
+    registry, (a, b) = make(2)
+    visited = []
+    for entity in registry:
+        visited.append(entity.name)
+        if entity is a:
+            registry.destroy(b)
+            registry.add(Entity("c"))
+    assert visited == ["a", "c"]
+
+
+def test_handles_are_not_reused():
+    registry, (a,) = make(1)
+    registry.destroy(a)
+    registry.flush()
+    b = Entity("b")
+    registry.add(b)
+    assert b.handle != a.handle
+    assert registry.get(a.handle) is None
+    assert a not in registry
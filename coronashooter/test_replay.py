@@ -0,0 +1,40 @@
+import pytest
+from pygame.locals import K_LEFT, K_UP, K_LCTRL, K_SPACE
+from inputs import InputSnapshot
+import replay
+from replay import InputRecording, encode, decode
+
+
+def test_encode_decode_round_trip():
+    snapshots = [InputSnapshot(0),
+                 InputSnapshot(1, held=frozenset({K_LEFT, K_UP})),
+                 InputSnapshot(2, pressed=frozenset({K_LCTRL, K_SPACE})),
+                 InputSnapshot(3, held=frozenset({K_UP}), pressed=frozenset({K_SPACE}), quit=True)]
+    for snapshot in snapshots:
+        state = encode(snapshot)
+        assert 0 <= state <= 0xFFFF
+        assert decode(state, snapshot.tick) == snapshot
+
+
+def test_save_load_round_trip(tmp_path):
+    recording = InputRecording(seed=1234, tick_rate=125.0)
+    for tick in range(70000):  # trechos mais longos que MAX_RUN são divididos
+        held = frozenset({K_LEFT}) if tick % 1000 < 500 else frozenset()
+        recording.record(InputSnapshot(tick, held=held))
+    recording.record(InputSnapshot(70000, quit=True))
+    path = tmp_path / "sessao.rec"
+    recording.save(path)
+    loaded = InputRecording.load(path)
+    assert (loaded.seed, loaded.tick_rate) == (1234, 125.0)
+    assert loaded.states == recording.states
+    assert list(loaded.inputs())[-1] == InputSnapshot(70000, quit=True)
+
+
+def test_load_rejects_other_versions(tmp_path):
+    path = tmp_path / "antiga.rec"
+    path.write_bytes(replay.HEADER.pack(replay.MAGIC, replay.VERSION - 1, 0, 125.0, 0))
+    with pytest.raises(ValueError):
+        InputRecording.load(path)
+    path.write_bytes(replay.HEADER.pack(b"XXXX", replay.VERSION, 0, 125.0, 0))
+    with pytest.raises(ValueError):
+        InputRecording.load(path)
@@ -0,0 +1,123 @@
+import gc
+from resources import ResourceManager
+
+
+class Asset:
+    """ Recurso falso: só precisa aceitar weakref
+    """
+
+
+def test_evicts_least_recently_used_over_budget():
+    manager = ResourceManager(budget=300)
+    manager.put(("surface", "a.png"), Asset(), 100)
+    manager.put(("surface", "b.png"), Asset(), 100)
+    manager.put(("surface", "c.png"), Asset(), 100)
+    manager.get(("surface", "a.png"))  # a passa a ser o usado mais recentemente
+    manager.put(("surface", "d.png"), Asset(), 100)
+    gc.collect()
+    assert manager.keys("surface") == [("surface", "c.png"), ("surface", "a.png"), ("surface", "d.png")]
+    assert manager.evictions == 1
+    assert manager.used == 300
+    assert manager.held == 0
+    assert manager.peak == 300  # o pico é medido depois do descarte
+
+
+def test_pinned_files_are_never_evicted():
+    manager = ResourceManager(budget=100)
+    manager.acquire("a.png")
+    manager.put(("surface", "a.png"), Asset(), 100)
+    manager.put(("surface", "a.png", 15), Asset(), 100)
+    manager.put(("surface", "b.png"), Asset(), 100)
+    gc.collect()
+    assert manager.keys("surface") == [("surface", "a.png"), ("surface", "a.png", 15)]
+    assert manager.used == 200  # acima do orçamento: só há recursos fixados
+    manager.release("a.png")
+    manager.put(("surface", "c.png"), Asset(), 50)
+    gc.collect()
+    assert manager.keys("surface") == [("surface", "c.png")]
+    assert manager.used == 50
+
+
+def test_evicted_asset_in_use_stays_counted_until_freed():
+    manager = ResourceManager(budget=250)
+    asset = Asset()
+    manager.put(("surface", "a.png"), asset, 100)
+    manager.put(("surface", "b.png"), Asset(), 100)
+    manager.put(("surface", "c.png"), Asset(), 100)
+    # descartar a não libera memória (o recurso ainda é usado), então b também é descartado
+    assert manager.keys("surface") == [("surface", "c.png")]
+    assert manager.evictions == 2
+    assert ("surface", "a.png") in manager
+    assert ("surface", "b.png") not in manager
+    assert manager.used == 200
+    assert manager.held == 100
+    del asset
+    gc.collect()
+    assert ("surface", "a.png") not in manager
+    assert manager.used == 100
+    assert manager.held == 0
+    assert manager.get(("surface", "a.png")) is None
+
+
+def test_revive_after_eviction_counts_asset_once():
+    manager = ResourceManager(budget=100)
+    asset = Asset()
+    manager.put(("surface", "a.png"), asset, 100)
+    manager.put(("surface", "b.png"), Asset(), 100)
+    gc.collect()
+    assert manager.get(("surface", "a.png")) is asset  # volta a ser guardado sem ser carregado de novo
+    gc.collect()
+    # b, sem uso fora do ResourceManager, foi descartado e liberado junto com a; só a volta a ser guardado
+    assert manager.keys("surface") == [("surface", "a.png")]
+    assert manager.used == 100
+    assert manager.held == 0
+    # o finalizador antigo foi desligado: liberar o recurso depois de descartá-lo de novo desconta uma vez só
+    manager.discard(("surface", "a.png"))
+    assert manager.used == 100
+    assert manager.held == 100
+    del asset
+    gc.collect()
+    assert manager.used == 0
+    assert manager.held == 0
+
+
+def test_stale_finalizer_does_not_drop_new_entry():
+    manager = ResourceManager(budget=1000)
+    old = Asset()
+    manager.put(("surface", "a.png"), old, 100)
+    manager.discard(("surface", "a.png"))
+    new = Asset()
+    manager.put(("surface", "a.png"), new, 100)
+    manager.discard(("surface", "a.png"))
+    del old
+    gc.collect()
+    # a liberação do recurso antigo desconta só a sua memória e não esquece o novo, ainda em uso
+    assert manager.used == 100
+    assert manager.held == 100
+    assert manager.get(("surface", "a.png")) is new
+    assert manager.held == 0
+
+
+def test_parts_are_freed_separately():
+    manager = ResourceManager(budget=1000)
+    first, second = Asset(), Asset()
+    manager.put(("rotations", "a.png"), [first, second], 150, parts=[(first, 100), (second, 50)])
+    manager.discard(("rotations", "a.png"))
+    assert manager.used == 150
+    del first
+    gc.collect()
+    assert manager.used == 50
+    assert manager.held == 50
+    del second
+    gc.collect()
+    assert manager.used == 0
+    assert manager.held == 0
+
+
+def test_objects_without_weakref_are_freed_on_discard():
+    manager = ResourceManager(budget=1000)
+    manager.put(("music", "song.ogg"), b"ogg", 100)
+    manager.discard(("music", "song.ogg"))
+    assert manager.used == 0
+    assert manager.held == 0
+    assert ("music", "song.ogg") not in manager
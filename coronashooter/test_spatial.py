@@ -0,0 +1,38 @@
+import random
+import pygame
+from spatial import SpatialHash
+
+
+class Box:
+    """ Sprite falso: a grade só usa o rect
+    """
+
+    def __init__(self, rect):
+        self.rect = rect
+
+
+def boxes(rng, count, min_size, max_size):
+    return [Box(pygame.Rect(rng.randint(-50, 640), rng.randint(-50, 640),
+                            rng.randint(min_size, max_size), rng.randint(min_size, max_size)))
+            for _ in range(count)]
+
+
+def test_candidates_include_every_overlap():
+    rng = random.Random(5)
+    enemies = boxes(rng, 60, 20, 130)
+    shots = boxes(rng, 400, 3, 40)  # tiros pequenos e alguns maiores que a margem
+    grid = SpatialHash()
+    grid.build(enemies)
+    candidates = grid.candidates(shots)
+    for enemy in enemies:
+        expected = [shot for shot in shots if shot.rect.colliderect(enemy.rect)]
+        found = [shot for shot in candidates.get(enemy, []) if shot.rect.colliderect(enemy.rect)]
+        assert found == expected
+
+
+def test_query_has_no_duplicates():
+    grid = SpatialHash(cell_size=32)
+    big = Box(pygame.Rect(0, 0, 200, 200))
+    grid.build([big])
+    assert grid.query(pygame.Rect(10, 10, 150, 150)) == [big]
+    assert grid.query(pygame.Rect(400, 400, 10, 10)) == []